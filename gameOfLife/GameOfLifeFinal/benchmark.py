@@ -0,0 +1,399 @@
+"""
+Benchmark suite of the Game of Life.
+
+Times the stepping engines across board sizes, random densities and the classic patterns, the
+construction of new boards and, optionally, the offscreen rendering modes. Every timed repetition
+starts again from the seed board, so the workload measured does not depend on the machine speed.
+Rates are taken from the fastest repetition, the least disturbed by the rest of the machine. The
+results are written as JSON, and can be compared against a stored baseline to flag regressions.
+
+Example:
+    python GameOfLifeFinal/benchmark.py --output baseline.json
+    python GameOfLifeFinal/benchmark.py --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from GameOfLifeFinal.model.board import Board
+from GameOfLifeFinal.model.engines import DEFAULT_ENGINE, ENGINES
+from GameOfLifeFinal.model.patterns import load_patterns, pattern_cells, place_pattern
+
+# Version of the JSON report
+REPORT_VERSION = 2
+# Default number of generations stepped from the seed board by every timed repetition
+DEFAULT_GENERATIONS = 8
+# Default sides of the square boards
+DEFAULT_SIZES = [64, 256, 1024, 4096, 8192]
+# Default fractions of live cells of the random boards
+DEFAULT_DENSITIES = [0.1, 0.3, 0.5]
+# Largest side drawn with the cell by cell rendering mode
+MAX_ITEM_RENDER_SIZE = 256
+# Side of the viewport used by the rendering benchmarks, in pixels
+RENDER_VIEWPORT = 1024
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments.
+
+    Args:
+        argv (list): The arguments, None for the ones of the process.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life engines and rendering.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=[DEFAULT_ENGINE],
+                        help=f"the engines to benchmark (default {DEFAULT_ENGINE})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="the sides of the square boards (default %(default)s)")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES,
+                        help="the fractions of live cells of the random boards (default %(default)s)")
+    parser.add_argument("--no-patterns", action="store_true",
+                        help="skip the boards with the classic patterns")
+    parser.add_argument("--render", action="store_true",
+                        help="also benchmark the rendering modes offscreen (requires PyQt)")
+    parser.add_argument("--generations", type=int, default=DEFAULT_GENERATIONS,
+                        help="the generations stepped from the seed board by every timed repetition "
+                             "(default %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="the minimum time spent measuring each case, in seconds (default 0.5)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the random boards (default 0)")
+    parser.add_argument("--output", "-o",
+                        help="the JSON file of the results (default the standard output)")
+    parser.add_argument("--baseline",
+                        help="a JSON file of previous results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="the slowdown flagged as a regression, as a fraction (default 0.1)")
+    args = parser.parse_args(argv)
+    if args.generations < 1:
+        parser.error("--generations must be positive")
+    return args
+
+
+def random_state(size, density, seed):
+    """
+    Creates a random square state matrix.
+
+    Args:
+        size (int): The side of the board.
+        density (float): The fraction of live cells.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        numpy.ndarray: The state matrix.
+    """
+    # Bytes instead of floats keep the memory of the largest boards low
+    noise = np.random.default_rng(seed).integers(0, 256, (size, size), dtype=np.uint8)
+    return (noise < round(density * 256)).astype(np.uint8)
+
+
+def pattern_state(size, pattern):
+    """
+    Creates a square state matrix with a pattern at its center.
+
+    Args:
+        size (int): The side of the board.
+        pattern (list): The [y, x] coordinates of the live cells.
+
+    Returns:
+        numpy.ndarray: The state matrix.
+    """
+    cells = pattern_cells(pattern)
+    state = np.zeros((size, size), dtype=np.uint8)
+    extent = cells.max(axis=0) + 1 if len(cells) else np.zeros(2, dtype=np.int64)
+    place_pattern(state, cells, (size - int(extent[1])) // 2, (size - int(extent[0])) // 2)
+    return state
+
+
+def measure(operation, min_time, min_operations=3, setup=None):
+    """
+    Repeats an operation until enough time has been spent measuring it.
+
+    Args:
+        operation (callable): The operation to repeat.
+        min_time (float): The minimum total time, in seconds.
+        min_operations (int): The minimum number of repetitions.
+        setup (callable): Called before every repetition, untimed, to start from the same state.
+
+    Returns:
+        tuple: The number of repetitions, the total time and the time of the fastest repetition, in seconds.
+    """
+    setup = setup or (lambda: None)
+    # One untimed run to warm up caches, pools and lazily built buffers
+    setup()
+    operation()
+    count, elapsed, best = 0, 0.0, float("inf")
+    while count < min_operations or elapsed < min_time:
+        setup()
+        start = time.perf_counter()
+        operation()
+        seconds = time.perf_counter() - start
+        elapsed += seconds
+        best = min(best, seconds)
+        count += 1
+    return count, elapsed, best
+
+
+def peak_memory(operation, setup=None):
+    """
+    Returns the peak memory allocated by one run of an operation, in bytes.
+
+    The memory is traced in a separate run, after the untimed setup if any, so that tracing does
+    not slow down the timed runs.
+    """
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(name, group, unit, units, measured, cells, memory, **details):
+    """
+    Returns the record of a benchmark case, with its rate in units per second.
+
+    Args:
+        name (str): The name of the case.
+        group (str): The group of the case.
+        unit (str): The unit of work counted.
+        units (int): The units of work done by every repetition.
+        measured (tuple): The repetitions, total time and fastest time returned by measure.
+        cells (int): The number of cells of the board.
+        memory (int): The peak memory allocated by one repetition, in bytes.
+        details: Other fields of the record.
+
+    Returns:
+        dict: The record.
+    """
+    count, elapsed, best = measured
+    rate = units / best
+    record = {"name": name, "group": group, "unit": unit, "count": count * units, "seconds": round(elapsed, 6),
+              "best_seconds": round(best, 9), "rate": rate, "cells_per_second": rate * cells,
+              "peak_memory_bytes": memory}
+    record.update(details)
+    return record
+
+
+def boards(args):
+    """
+    Yields the boards to step.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Yields:
+        tuple: The name and the state matrix of each board.
+    """
+    patterns = {} if args.no_patterns else load_patterns()
+    for size in args.sizes:
+        for density in args.densities:
+            yield f"random-{density}/{size}", random_state(size, density, args.seed)
+        for name, pattern in patterns.items():
+            yield f"{name}/{size}", pattern_state(size, pattern)
+
+
+def benchmark_steps(args):
+    """
+    Benchmarks the engines stepping every board.
+
+    Every repetition steps a fixed number of generations from the seed board, one at a time.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        list: The records of the cases.
+    """
+    results = []
+    for board_name, state in boards(args):
+        for engine in args.engines:
+            game_board = Board(state.copy(), engine=engine)
+
+            def reset():
+                game_board.set_board(state.copy(), generation=0)
+
+            def run():
+                for _ in range(args.generations):
+                    game_board.update()
+
+            try:
+                measured = measure(run, args.min_time, setup=reset)
+                memory = peak_memory(run, reset)
+            finally:
+                game_board.engine.close()
+            results.append(result(f"step/{engine}/{board_name}", "step", "generations", args.generations, measured,
+                                  state.size, memory, engine=engine, board=board_name.split("/")[0],
+                                  size=state.shape[0]))
+    return results
+
+
+def benchmark_construction(args):
+    """
+    Benchmarks the creation of new boards done by the resize and clear actions of the main window.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        list: The records of the cases.
+    """
+    results = []
+    for size in args.sizes:
+        game_board = Board(np.zeros((1, 1), dtype=np.uint8))
+        operations = {
+            # MainWindow.resize_grid
+            "resize_grid": lambda: game_board.set_board(np.zeros((size, size), dtype=np.uint8)),
+            # MainWindow.clear_board
+            "clear_board": lambda: game_board.set_board(np.zeros_like(game_board.state)),
+        }
+        for name, operation in operations.items():
+            measured = measure(operation, args.min_time)
+            results.append(result(f"construction/{name}/{size}", "construction", "boards", 1, measured,
+                                  size * size, peak_memory(operation), size=size))
+    return results
+
+
+def benchmark_rendering(args):
+    """
+    Benchmarks the rendering modes drawing the whole of a random board offscreen.
+
+    Every frame draws the first generation of the board over its seed, already drawn: the time
+    spent resetting the board, drawing the seed and stepping is not measured.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        list: The records of the cases.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QRectF
+    from PyQt5.QtWidgets import QApplication, QGraphicsScene
+    from GameOfLifeFinal.view.renderers import ItemRenderer, RENDERERS
+
+    app = QApplication.instance() or QApplication([])
+    results = []
+    for size in args.sizes:
+        state = random_state(size, 0.3, args.seed)
+        game_board = Board(state.copy())
+        # Zoom out by powers of two until the board fits in the viewport
+        cell_size = 1.0
+        while size * cell_size > RENDER_VIEWPORT:
+            cell_size /= 2
+        for mode, renderer_class in RENDERERS.items():
+            if renderer_class is ItemRenderer:
+                if size > MAX_ITEM_RENDER_SIZE:
+                    continue
+                cell_size_for_mode = max(cell_size, RENDER_VIEWPORT // size)
+            else:
+                cell_size_for_mode = cell_size
+            scene = QGraphicsScene()
+            renderer = renderer_class(scene, cell_size_for_mode)
+            renderer.set_viewport(QRectF(0, 0, RENDER_VIEWPORT, RENDER_VIEWPORT))
+
+            def frame():
+                renderer.render(game_board)
+                app.processEvents()
+
+            def reset():
+                game_board.set_board(state.copy(), generation=0)
+                frame()
+                game_board.update()
+
+            measured = measure(frame, args.min_time, setup=reset)
+            results.append(result(f"render/{mode}/{size}", "render", "frames", 1, measured, size * size,
+                                  peak_memory(lambda: renderer.render(game_board), reset), mode=mode, size=size,
+                                  cell_size=cell_size_for_mode))
+            scene.clear()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (list): The records of the current run.
+        baseline (list): The records of the baseline run.
+        threshold (float): The slowdown flagged as a regression, as a fraction.
+
+    Returns:
+        list: The comparison of each case found in both runs (name, baseline rate, rate, ratio, regression).
+    """
+    baseline_rates = {record["name"]: record["rate"] for record in baseline}
+    comparison = []
+    for record in results:
+        if record["name"] in baseline_rates:
+            ratio = record["rate"] / baseline_rates[record["name"]]
+            comparison.append((record["name"], baseline_rates[record["name"]], record["rate"], ratio,
+                               ratio < 1 - threshold))
+    return comparison
+
+
+def main(argv=None):
+    """
+    Runs the command line interface.
+
+    Args:
+        argv (list): The arguments, None for the ones of the process.
+
+    Returns:
+        int: The exit status, 1 if a regression was found.
+    """
+    args = parse_args(argv)
+    results = benchmark_steps(args) + benchmark_construction(args)
+    if args.render:
+        results += benchmark_rendering(args)
+
+    report = {
+        "version": REPORT_VERSION,
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {"engines": args.engines, "sizes": args.sizes, "densities": args.densities,
+                   "patterns": not args.no_patterns, "render": args.render, "generations": args.generations,
+                   "min_time": args.min_time, "seed": args.seed},
+        "results": results,
+        # Kilobytes on Linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    # The rates of other workloads are not comparable
+    if baseline.get("version") != REPORT_VERSION or baseline["config"].get("generations") != args.generations:
+        print(f"{args.baseline} was measured with another report version or number of generations",
+              file=sys.stderr)
+        return 1
+    comparison = compare(results, baseline["results"], args.threshold)
+    # The comparison goes to the standard error, to keep the results machine readable
+    for name, baseline_rate, rate, ratio, regression in comparison:
+        print(f"{'REGRESSION' if regression else 'ok':<10} {name}: {baseline_rate:.4g} -> {rate:.4g}/s ({ratio:.2f}x)",
+              file=sys.stderr)
+    regressions = sum(1 for *_, regression in comparison if regression)
+    print(f"{regressions} regressions in {len(comparison)} compared cases", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Headless batch runner of the Game of Life.
+
+Runs a pattern, or a board saved in a snapshot file, for a number of generations on a board of a
+chosen size and engine, without importing Qt, and writes the population statistics as CSV and the
+timings and ages as a summary. The board reached can be saved to a snapshot file. Boards larger
+than the memory run out of core, from a tile file of which only a cache of tiles is in memory.
+
+Example:
+    python GameOfLifeFinal/headless.py "Glider Gun (w:37 h:12)" --size 200 --generations 1000 --every 100
+    python GameOfLifeFinal/headless.py --load board.golsnap --generations 1000 --save board.golsnap
+    python GameOfLifeFinal/headless.py Acorn --size 100000 --out-of-core board.goltile -n 100
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+from GameOfLifeFinal.model.board import Board
+from GameOfLifeFinal.model.engine import AGE_MAX, DEFAULT_TOPOLOGY, TOPOLOGIES
+from GameOfLifeFinal.model.engines import DEFAULT_ENGINE, ENGINES
+from GameOfLifeFinal.model.hashlife import HashLifeEngine
+from GameOfLifeFinal.model.outofcore import DEFAULT_CACHE_TILES, DEFAULT_TILE_SIZE, OutOfCoreBoard
+from GameOfLifeFinal.model.pattern_files import PATTERN_FORMATS, PatternLibrary, read_pattern_cells
+from GameOfLifeFinal.model.patterns import PATTERNS_FILE, load_patterns, pattern_cells, place_pattern
+from GameOfLifeFinal.model.snapshot import load_snapshot, save_snapshot
+from GameOfLifeFinal.model.stats import AGE_BUCKETS
+from GameOfLifeFinal.model.timing import timings
+from GameOfLifeFinal.model.unbounded import UnboundedEngine
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments.
+
+    Args:
+        argv (list): The arguments, None for the ones of the process.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Run the Game of Life without the user interface.")
+    parser.add_argument("pattern", nargs="?",
+                        help="the name of a pattern in the library, a pattern file (RLE, Life 1.06 or plaintext), "
+                             "or a JSON file with the [y, x] live cells")
+    parser.add_argument("--load", metavar="SNAPSHOT",
+                        help="start from the board saved in a snapshot file instead of a pattern")
+    parser.add_argument("--save", metavar="SNAPSHOT",
+                        help="save the board after the last generation to a snapshot file")
+    parser.add_argument("--compress", action="store_true",
+                        help="compress the saved snapshot (smaller, but loaded at once instead of memory-mapped)")
+    parser.add_argument("--out-of-core", metavar="TILES",
+                        help="run the board out of core in this tile file, created from the pattern or snapshot, "
+                             "or resumed from the file alone")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE,
+                        help=f"the side of the tiles of a new tile file (default {DEFAULT_TILE_SIZE})")
+    parser.add_argument("--cache-tiles", type=int, default=DEFAULT_CACHE_TILES,
+                        help=f"the number of tiles kept in memory out of core (default {DEFAULT_CACHE_TILES})")
+    parser.add_argument("--library", default=PATTERNS_FILE,
+                        help="the JSON file of the pattern library (default the patterns shipped with the game)")
+    parser.add_argument("--size", type=int, nargs="+", default=[100], metavar=("WIDTH", "HEIGHT"),
+                        help="the size of the board, HEIGHT defaults to WIDTH (default 100)")
+    parser.add_argument("--at", type=int, nargs=2, metavar=("X", "Y"),
+                        help="the coordinates of the pattern on the board (default centered)")
+    parser.add_argument("--generations", "-n", type=int, default=100,
+                        help="the number of generations to run (default 100)")
+    parser.add_argument("--engine", choices=list(ENGINES), default=DEFAULT_ENGINE,
+                        help=f"the engine computing the generations (default {DEFAULT_ENGINE})")
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), default=DEFAULT_TOPOLOGY,
+                        help="the edges of the board: dead cells outside, wrapped around as a torus or a Klein "
+                             f"bottle, or mirrored (default {DEFAULT_TOPOLOGY})")
+    parser.add_argument("--every", type=int, default=1,
+                        help="write the statistics every this many generations (default 1)")
+    parser.add_argument("--on-cycle", choices=["run", "stop", "skip"], default="run",
+                        help="when the board enters a still life or an oscillator, keep computing every "
+                             "generation, stop, or skip whole periods arithmetically (default run, without detection)")
+    parser.add_argument("--output", "-o",
+                        help="the CSV file of the statistics (default the standard output)")
+    parser.add_argument("--timings",
+                        help="record the duration of each update and write the samples to this CSV file")
+    parser.add_argument("--profile",
+                        help="profile the run with cProfile and dump the statistics to this file")
+    args = parser.parse_args(argv)
+    if args.pattern is not None and args.load is not None:
+        parser.error("either a pattern or --load is required, not both")
+    if args.pattern is None and args.load is None and args.out_of_core is None:
+        parser.error("either a pattern, --load or --out-of-core is required")
+    if args.out_of_core is not None and args.on_cycle != "run":
+        parser.error("--on-cycle is not supported out of core")
+    if args.topology not in ENGINES[args.engine].topologies:
+        parser.error(f"the {args.engine} engine does not support the {args.topology} topology")
+    if args.out_of_core is not None and args.topology != DEFAULT_TOPOLOGY:
+        parser.error("--topology is not supported out of core")
+    if args.engine in (UnboundedEngine.name, HashLifeEngine.name) and args.on_cycle != "run":
+        parser.error(f"--on-cycle is not supported by the {args.engine} engine, whose board is only a window")
+    if args.tile_size < 1 or args.cache_tiles < 9:
+        parser.error("--tile-size must be positive and --cache-tiles at least 9")
+    if len(args.size) > 2:
+        parser.error("--size takes a width and an optional height")
+    if args.generations < 0 or args.every < 1 or min(args.size) < 1:
+        parser.error("the size and --every must be positive and --generations not negative")
+    return args
+
+
+def load_pattern(source, library=PATTERNS_FILE):
+    """
+    Loads a pattern by name from a library, or from its own file.
+
+    Names are looked for in the JSON library, then in the pattern files of the library directory.
+
+    Args:
+        source (str): The name of the pattern in the library, or the path of a pattern file or of
+            a JSON file with its cells.
+        library (str): The JSON file of the pattern library.
+
+    Returns:
+        numpy.ndarray: The (n, 2) array of [y, x] coordinates of the live cells.
+
+    Raises:
+        ValueError: If the pattern is neither a file nor a pattern of the library, or not a valid pattern file.
+    """
+    if os.path.isfile(source):
+        if os.path.splitext(source)[1].lower() in PATTERN_FORMATS:
+            return read_pattern_cells(source)
+        return pattern_cells(load_patterns(source))
+    patterns = load_patterns(library)
+    if source in patterns:
+        return pattern_cells(patterns[source])
+    pattern_library = PatternLibrary()
+    if source not in pattern_library:
+        raise ValueError(f"Pattern {source!r} not found in {library} nor {pattern_library.directory}")
+    return pattern_library[source].cells()
+
+
+def run(game_board, generations, every, writer, on_cycle="run"):
+    """
+    Runs the board for a number of generations, writing its statistics.
+
+    Args:
+        game_board (Board): The board to run.
+        generations (int): The number of generations to run.
+        every (int): The number of generations between two rows of statistics.
+        writer (csv.writer): The writer of the statistics rows.
+        on_cycle (str): What to do when the board enters a cycle: "run" every generation (without
+            detecting cycles), "stop" the run at the first repeated generation, or "skip" whole
+            periods. The cycles are looked for at every generation.
+
+    Returns:
+        tuple: The number of generations computed and the time spent computing them, in seconds.
+    """
+    writer.writerow(["generation", "alive", "births", "deaths", "x0", "y0", "x1", "y1", "seconds"])
+    writer.writerow(stats_row(game_board.stats, 0.0))
+    game_board.detect_cycles(on_cycle != "run")
+    first_generation = game_board.generation
+    elapsed = 0.0
+    generation = 0
+    while generation < generations:
+        if on_cycle == "stop" and game_board.cycle is not None:
+            break
+        # Engines able to jump ahead compute the generations between two rows at once, unless looking for cycles
+        count = min(every, generations - generation)
+        start = time.perf_counter()
+        if on_cycle == "stop":
+            # Stop at the first repeated generation
+            for _ in range(count):
+                game_board.update()
+                if game_board.cycle is not None:
+                    break
+            count = game_board.generation - first_generation - generation
+        else:
+            game_board.fast_forward(count)
+        elapsed += time.perf_counter() - start
+        generation += count
+        # Births and deaths are the net ones since the previous row (their totals out of core)
+        writer.writerow(stats_row(game_board.stats, elapsed))
+    return generation, elapsed
+
+
+def load_board(args):
+    """
+    Builds the board to run from the command line arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        Board: The board saved in the snapshot file, or with the pattern placed on it, an
+        OutOfCoreBoard with --out-of-core.
+
+    Raises:
+        OSError: If the pattern or snapshot file cannot be read.
+        ValueError: If the pattern or snapshot cannot be loaded.
+    """
+    if args.out_of_core and args.pattern is None and args.load is None:
+        return OutOfCoreBoard(args.out_of_core, args.cache_tiles)
+    if args.load:
+        snapshot = load_snapshot(args.load)
+        if args.out_of_core:
+            return OutOfCoreBoard.from_snapshot(args.out_of_core, snapshot, args.tile_size, args.cache_tiles)
+        return Board(snapshot.state, snapshot.age, engine=args.engine, generation=snapshot.generation,
+                     topology=args.topology)
+
+    cells = load_pattern(args.pattern, args.library)
+    # Place the pattern, centered unless coordinates are given
+    width, height = args.size[0], args.size[-1]
+    if args.at is not None:
+        x, y = args.at
+    else:
+        pattern_height, pattern_width = cells.max(axis=0) + 1 if len(cells) else (0, 0)
+        x, y = (width - pattern_width) // 2, (height - pattern_height) // 2
+    if args.out_of_core:
+        game_board = OutOfCoreBoard.create(args.out_of_core, width, height, args.tile_size, args.cache_tiles)
+        game_board.place(cells, x, y)
+        return game_board
+    state = np.zeros((height, width), dtype=np.uint8)
+    place_pattern(state, cells, x, y)
+    return Board(state, engine=args.engine, topology=args.topology)
+
+
+def stats_row(stats, elapsed):
+    """
+    Builds a row of statistics.
+
+    Args:
+        stats (BoardStats): The statistics of the generation.
+        elapsed (float): The time spent computing the generations so far, in seconds.
+
+    Returns:
+        list: The generation, alive cells, births, deaths, bounding box (empty without alive cells) and time.
+    """
+    bounding_box = stats.bounding_box if stats.bounding_box is not None else ("", "", "", "")
+    return [stats.generation, stats.population, stats.births, stats.deaths, *bounding_box, round(elapsed, 6)]
+
+
+def main(argv=None):
+    """
+    Runs the command line interface.
+
+    Args:
+        argv (list): The arguments, None for the ones of the process.
+
+    Returns:
+        int: The exit status.
+    """
+    args = parse_args(argv)
+    try:
+        game_board = load_board(args)
+    except (OSError, ValueError) as error:
+        source = "snapshot" if args.load else "pattern" if args.pattern is not None else "tile file"
+        print(f"Cannot load {source}: {error}", file=sys.stderr)
+        return 1
+    if args.timings:
+        timings.enabled = True
+    if args.profile:
+        timings.profile(-(-args.generations // args.every), args.profile)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        generations, elapsed = run(game_board, args.generations, args.every, csv.writer(output), args.on_cycle)
+        # Read before closing the engine, which may own the matrices
+        age_histogram = game_board.stats.age_histogram
+        if args.save:
+            save_snapshot(args.save, game_board.state, game_board.age, game_board.generation, args.compress)
+    finally:
+        if args.output:
+            output.close()
+        game_board.close()
+    if args.timings:
+        timings.export_csv(args.timings)
+
+    # Timings on the standard error, to keep the statistics machine readable
+    rate = generations / elapsed if elapsed > 0 else float("inf")
+    width, height = game_board.width, game_board.height
+    engine = "out of core" if isinstance(game_board, OutOfCoreBoard) else args.engine
+    print(f"Engine: {engine} - Topology: {game_board.topology} - Board: {width}x{height} - "
+          f"Generations: {generations} - Time: {elapsed:.3f} s - Generations/s: {rate:.1f} - "
+          f"Cells/s: {rate * width * height:.3g}",
+          file=sys.stderr)
+    if game_board.cycle is not None:
+        print(game_board.cycle, file=sys.stderr)
+    if isinstance(game_board, OutOfCoreBoard):
+        print(game_board.report(), file=sys.stderr)
+    elif isinstance(game_board.engine, (UnboundedEngine, HashLifeEngine)):
+        # The statistics only cover the board, the plane may hold cells outside of it
+        print(game_board.engine.report(), file=sys.stderr)
+    buckets = [f"{first}-{last}" if last > first else f"{first}"
+               for first, last in zip(AGE_BUCKETS.tolist(), (AGE_BUCKETS[1:] - 1).tolist() + [int(AGE_MAX)])]
+    print("Ages: " + ", ".join(f"{bucket}: {count}" for bucket, count in zip(buckets, age_histogram.tolist()) if count),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
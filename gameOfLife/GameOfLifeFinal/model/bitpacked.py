@@ -0,0 +1,248 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_MAX, DEFAULT_TOPOLOGY, STATE_DTYPE, TOPOLOGIES, Engine, next_age
+
+# Packed words hold 64 cells, the cell x of a row is the bit x % 64 of the word x // 64
+WORD_DTYPE = np.dtype("<u8")
+WORD_BITS = 64
+
+_ONE = np.uint64(1)
+_LAST_BIT = np.uint64(WORD_BITS - 1)
+
+
+class BitPackedEngine(Engine):
+    """
+    This class represents the bit-packed engine.
+
+    Each row of the board is packed in 64 bit words, one bit per cell, and the next generation
+    is computed for 64 cells at a time with bitwise full adders over the shifted rows,
+    vectorized by NumPy across the whole board. The cells past the edges of the board are only
+    added on the first and last columns and rows of the shifted words.
+    """
+
+    name = "bitpacked"
+    topologies = TOPOLOGIES
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the board on its packed representation.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        width = state.shape[1]
+        new_state = unpack(step_packed(pack(state), width, self.topology), width)
+        return new_state, next_age(new_state, age)
+
+    def advance(self, state, age, generations):
+        """
+        Computes the board after a number of generations without unpacking the intermediate ones.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+
+        Ages are tracked through packed binary counters, one bit plane per bit of the number of
+        generations: each alive cell counts the generations it has been alive in a row, so the cells
+        alive in every generation get older by the number of generations and the others get the
+        length of their last run.
+        """
+        width = state.shape[1]
+        words = pack(state)
+        runs = [np.zeros_like(words) for _ in range(max(int(generations).bit_length(), 1))]
+        carry, next_carry = np.empty_like(words), np.empty_like(words)
+        for _ in range(generations):
+            words = step_packed(words, width, self.topology)
+            # Adds one to the counters of the alive cells and resets those of the dead cells
+            np.copyto(carry, words)
+            for bits in runs:
+                np.bitwise_and(bits, carry, out=next_carry)
+                bits ^= carry
+                bits &= words
+                carry, next_carry = next_carry, carry
+        new_state = unpack(words, width)
+        run = np.zeros(state.shape, dtype=np.int64)
+        for bit, bits in enumerate(runs):
+            run |= unpack(bits, width).astype(np.int64) << bit
+        older = np.minimum(age.astype(np.int64) + generations, AGE_MAX)
+        new_age = np.where(run == generations, older, np.minimum(run, AGE_MAX)).astype(age.dtype)
+        return new_state, new_age
+
+
+def pack(state):
+    """
+    Packs a state matrix in 64 bit words.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+
+    Returns:
+        numpy.ndarray: A matrix of shape (height, ceil(width / 64)) of packed words.
+    """
+    height, width = state.shape
+    words_per_row = -(-width // WORD_BITS)
+    packed = np.zeros((height, words_per_row * 8), dtype=np.uint8)
+    packed[:, :-(-width // 8)] = np.packbits(state.astype(bool), axis=1, bitorder="little")
+    return packed.view(WORD_DTYPE)
+
+
+def unpack(words, width):
+    """
+    Unpacks 64 bit words in a state matrix.
+
+    Args:
+        words (numpy.ndarray): The matrix of packed words.
+        width (int): The width of the board.
+
+    Returns:
+        numpy.ndarray: The matrix of cell states (0 for dead, 1 for alive).
+    """
+    packed = np.ascontiguousarray(words, dtype=WORD_DTYPE).view(np.uint8)
+    return np.unpackbits(packed, axis=1, count=width, bitorder="little").astype(STATE_DTYPE, copy=False)
+
+
+def read_cell(words, x, y):
+    """
+    Reads the state of a single cell from packed words.
+
+    Args:
+        words (numpy.ndarray): The matrix of packed words.
+        x (int): The x-coordinate of the cell.
+        y (int): The y-coordinate of the cell.
+
+    Returns:
+        int: The state of the cell (0 for dead, 1 for alive).
+    """
+    return int(words[y, x // WORD_BITS] >> np.uint64(x % WORD_BITS)) & 1
+
+
+def write_cell(words, x, y, state):
+    """
+    Writes the state of a single cell in packed words.
+
+    Args:
+        words (numpy.ndarray): The matrix of packed words.
+        x (int): The x-coordinate of the cell.
+        y (int): The y-coordinate of the cell.
+        state (int): The new state of the cell (0 for dead, 1 for alive).
+    """
+    bit = _ONE << np.uint64(x % WORD_BITS)
+    if state:
+        words[y, x // WORD_BITS] |= bit
+    else:
+        words[y, x // WORD_BITS] &= ~bit
+
+
+def step_packed(words, width, topology=DEFAULT_TOPOLOGY):
+    """
+    Computes the next generation of a packed board.
+
+    Args:
+        words (numpy.ndarray): The matrix of packed words.
+        width (int): The width of the board.
+        topology (str): The topology of the edges of the board (default dead cells outside).
+
+    Returns:
+        numpy.ndarray: The matrix of packed words of the next generation.
+
+    For every row the horizontal sums of the left, center and right neighbors are computed as
+    two bit numbers (sum bit and carry bit). The sums of the row above, the row itself (without the
+    center cell) and the row below are then added with full adders, giving the neighbor count
+    modulo 8 as three bit planes. Cells outside the board follow the topology, see halo_block.
+    """
+    west = _shift_west(words)
+    east = _shift_east(words)
+    if topology != "dead":
+        # Cells past the left and right edges: the opposite column, or the edge column itself when mirrored
+        last_word, last_bit = (width - 1) // WORD_BITS, np.uint64((width - 1) % WORD_BITS)
+        first_column = words[:, 0] & _ONE
+        last_column = (words[:, last_word] >> last_bit) & _ONE
+        wraps = topology in ("torus", "klein")
+        west[:, 0] |= last_column if wraps else first_column
+        east[:, last_word] |= (first_column if wraps else last_column) << last_bit
+
+    # Sum of the three horizontal neighbors of every row (sum bit and carry bit)
+    sum3 = west ^ words ^ east
+    carry3 = (west & words) | (east & (west ^ words))
+    # Sum of the two horizontal neighbors, used for the row of the cell itself
+    sum2 = west ^ east
+    carry2 = west & east
+
+    # Rows above and below, the rows outside the board are dead
+    sum_up = _shift_down(sum3)
+    carry_up = _shift_down(carry3)
+    sum_down = _shift_up(sum3)
+    carry_down = _shift_up(carry3)
+    if topology != "dead":
+        # Rows past the top and bottom edges: the edge row itself when mirrored, else the opposite row,
+        # flipped left to right in a Klein bottle
+        above, below = (0, -1) if topology == "mirror" else (-1, 0)
+        for up, down, sums in ((sum_up, sum_down, sum3), (carry_up, carry_down, carry3)):
+            up[0], down[-1] = sums[above], sums[below]
+            if topology == "klein":
+                up[0], down[-1] = _flip_row(up[0], width), _flip_row(down[-1], width)
+
+    # Weight 1: full adder of the three sum bits
+    bit0 = sum_up ^ sum2 ^ sum_down
+    carry_ones = (sum_up & sum2) | (sum_down & (sum_up ^ sum2))
+    # Weight 2: the three carry bits plus the carry of the ones
+    twos = carry_up ^ carry2 ^ carry_down
+    carry_twos = (carry_up & carry2) | (carry_down & (carry_up ^ carry2))
+    bit1 = twos ^ carry_ones
+    # Weight 4 (a count of 8 overflows to 0 and correctly kills the cell)
+    bit2 = carry_twos ^ (twos & carry_ones)
+
+    # Birth with 3 neighbors, survival with 2 or 3 neighbors
+    new_words = bit1 & ~bit2 & (bit0 | words)
+    # Keep the padding bits after the last column dead
+    new_words[:, -1] &= _last_word_mask(width)
+    return new_words
+
+
+def _shift_west(words):
+    """Returns the words where each bit holds the cell on its left (x - 1)."""
+    shifted = words << _ONE
+    shifted[:, 1:] |= words[:, :-1] >> _LAST_BIT
+    return shifted
+
+
+def _shift_east(words):
+    """Returns the words where each bit holds the cell on its right (x + 1)."""
+    shifted = words >> _ONE
+    shifted[:, :-1] |= words[:, 1:] << _LAST_BIT
+    return shifted
+
+
+def _shift_down(words):
+    """Returns the words where each row holds the row above it (y - 1)."""
+    shifted = np.zeros_like(words)
+    shifted[1:] = words[:-1]
+    return shifted
+
+
+def _shift_up(words):
+    """Returns the words where each row holds the row below it (y + 1)."""
+    shifted = np.zeros_like(words)
+    shifted[:-1] = words[1:]
+    return shifted
+
+
+def _flip_row(row, width):
+    """Returns the packed row with its cells in reverse order."""
+    return pack(unpack(row[None], width)[:, ::-1])[0]
+
+
+def _last_word_mask(width):
+    """Returns the mask of the bits of the last word of a row that are inside the board."""
+    used_bits = width % WORD_BITS
+    if used_bits == 0:
+        return np.uint64(0xFFFFFFFFFFFFFFFF)
+    return np.uint64((1 << used_bits) - 1)
@@ -1,52 +1,240 @@
+import contextlib
+import time
+
 import numpy as np
 
+from GameOfLifeFinal.model.cell import Cell
+from GameOfLifeFinal.model.change import BoardChange
+from GameOfLifeFinal.model.cycle import DEFAULT_HISTORY, CycleDetector
+from GameOfLifeFinal.model.engine import AGE_DTYPE, AGE_MAX, DEFAULT_TOPOLOGY, STATE_DTYPE, count_live_neighbors
+from GameOfLifeFinal.model.engines import DEFAULT_ENGINE, create_engine
 from GameOfLifeFinal.model.observer import Observable
+from GameOfLifeFinal.model.population import PopulationLog
+from GameOfLifeFinal.model.stats import BoardStats
+from GameOfLifeFinal.model.timeline import DEFAULT_BUDGET, Timeline
+from GameOfLifeFinal.model.timing import timings
 
 
 class Board(Observable):
     """
     This class represents the Game of Life board.
 
+    The board is stored as two contiguous matrices, one with the state and one with the age of each cell.
+
+    Every edit or update is notified to the observers as a BoardChange listing the cells born, died
+    and aged. The changes made inside a batch, or by a multi-generation advance, are merged into a
+    single notification. The changes are only computed when some observer is notified of them.
+
+    The population statistics of the current generation are computed right after each update or
+    advance, and every update or advance is recorded in the population log of the board.
+
+    When cycle detection is enabled, the board also detects when its state repeats itself (still
+    lifes and oscillators), after which whole periods can be skipped without computing them.
+
+    When the history is recorded, the generations computed are kept in a memory bounded timeline,
+    and the board can be rewound to any generation still in it.
+
+    The edges of the board follow its topology: the cells outside are dead, or the board wraps
+    around as a torus or a Klein bottle, or is mirrored at its edges (see TOPOLOGIES).
+
     Args:
-        init_board (numpy.ndarray): An initial NumPy matrix representing the initial state of the board.
+        init_state (numpy.ndarray): An initial NumPy matrix with the state of each cell (0 for dead, 1 for alive).
+        init_age (numpy.ndarray): An initial NumPy matrix with the age of each cell (default all zeros).
+        engine (str or Engine): The engine used to compute the next generations (default "numpy").
+        generation (int): The generation of the initial state (default 0).
+        topology (str): The topology of the edges of the board (default "dead").
 
     Attributes:
-        _board (numpy.ndarray): The matrix representing the current state of the board.
+        population_log (PopulationLog): The population history of the board.
+        _state (numpy.ndarray): The uint8 matrix with the current state of each cell.
+        _age (numpy.ndarray): The uint16 matrix with the current age of each cell.
+        _engine (Engine): The engine used to compute the next generations, following the topology of the board.
+        _generation (int): The number of generations computed since the initial state.
+        _change (BoardChange): The last change notified, None if not computed.
+        _stats (BoardStats): The statistics of the current generation, None if not computed since the last edit.
+        _cycles (CycleDetector): The detector of repeated states, None if cycle detection is disabled.
+        _timeline (Timeline): The history of the generations, None if not recorded.
+        _batch (tuple): The state, age and generation of the board when the current batch began, None outside batches.
 
-    Signals(observer.py):
-        valueChanged: Signal emitted when the state of the board changes.
+    Notifications(observer.py):
+        The registered observers are called with a BoardChange when the state of the board changes.
 
     """
 
-    def __init__(self, init_board):
+    def __init__(self, init_state, init_age=None, engine=DEFAULT_ENGINE, generation=0, topology=DEFAULT_TOPOLOGY):
         """
         Initializes a new instance of Board.
+
+        Raises:
+            ValueError: If the engine does not support the topology.
+        """
+        super().__init__(self)
+        self._state, self._age = self._as_matrices(init_state, init_age)
+        self._engine = self._create_engine(engine, topology)
+        self._generation = generation
+        self._change = None
+        self._stats = None
+        self._cycles = None
+        self._timeline = None
+        self._batch = None
+        self._batch_replaced = False
+        self.population_log = PopulationLog()
+
+    @property
+    def engine(self):
+        """Returns the engine used to compute the next generations."""
+        return self._engine
+
+    @engine.setter
+    def engine(self, new_engine):
+        """
+        Sets the engine used to compute the next generations, by name or instance.
+
+        Raises:
+            ValueError: If the engine does not support the topology of the board, which keeps its engine.
+        """
+        engine = self._create_engine(new_engine, self.topology)
+        # The matrices may be buffers owned by the previous engine
+        self._state, self._age = self._state.copy(), self._age.copy()
+        self._engine.close()
+        self._engine = engine
+
+    @property
+    def topology(self):
+        """Returns the topology of the edges of the board."""
+        return self._engine.topology
+
+    @topology.setter
+    def topology(self, topology):
+        """
+        Sets the topology of the edges of the board, from the next generation on.
+
+        Raises:
+            ValueError: If the engine does not support the topology, which is then left unchanged.
+        """
+        self._engine.set_topology(topology)
+        self.invalidate()
+
+    def close(self):
+        """
+        Releases the resources held by the engine (such as worker processes), if any.
+        """
+        self._engine.close()
+
+    @property
+    def state(self):
+        """Returns the matrix with the state of each cell."""
+        return self._state
+
+    @property
+    def age(self):
+        """Returns the matrix with the age of each cell."""
+        return self._age
+
+    @property
+    def generation(self):
+        """Returns the number of generations computed since the initial state."""
+        return self._generation
+
+    @property
+    def stats(self):
+        """
+        Returns the population statistics of the current generation.
+
+        After an update or advance they were computed with the step, after an edit they are
+        computed on first use (with no births nor deaths).
+        """
+        if self._stats is None:
+            self._stats = BoardStats.compute(self._state, self._age, self._generation)
+        return self._stats
+
+    @property
+    def cycle(self):
+        """Returns the cycle the board entered, None if not detected or cycle detection is disabled."""
+        return self._cycles.cycle if self._cycles is not None else None
+
+    def detect_cycles(self, enabled=True, history=DEFAULT_HISTORY):
+        """
+        Enables or disables the detection of cycles.
+
+        Args:
+            enabled (bool): Whether cycles are detected.
+            history (int): The number of most recent generations compared with each new one,
+                bounding the longest period detected.
+        """
+        self._cycles = CycleDetector(self._state, self._generation, history) if enabled else None
+
+    @property
+    def timeline(self):
+        """Returns the history of the generations, None if not recorded."""
+        return self._timeline
+
+    def record_history(self, enabled=True, budget=DEFAULT_BUDGET):
+        """
+        Enables or disables the history of the generations, needed to rewind the board.
+
+        Args:
+            enabled (bool): Whether the history is recorded.
+            budget (int): The memory used by the history, in bytes, beyond which the oldest generations are dropped.
+        """
+        self._timeline = Timeline(budget) if enabled else None
+
+    def rewind(self, generation):
+        """
+        Sets the board back (or forward) to a generation of the history and signals the update.
+
+        The population log is rewound with the board, and computing a generation from there
+        drops the later history and records.
+
+        Args:
+            generation (int): The generation.
+
+        Raises:
+            ValueError: If the history is not recorded or does not hold the generation.
         """
-        super().__init__(init_board)
-        self._board = init_board
+        if self._timeline is None:
+            raise ValueError("The history of the board is not recorded")
+        state, age = self._timeline.restore(generation)
+        self.population_log.rewind(generation)
+        with self.batch():
+            self._generation = generation
+            self.set_board(state, age)
+            # The board matches the history again
+            self._timeline.seek(generation)
+
+    @property
+    def changed(self):
+        """
+        Returns the mask of the cells whose state or age changed in the last update or edit.
+
+        After an update these are the cells alive before or after it (births, deaths and cells that
+        got older). None means that the whole board changed, e.g. after set_board, or that the
+        change was not computed because no observer was notified of it.
+        """
+        return self._change.changed if self._change is not None else None
 
     @property
     def width(self):
         """Returns the width of the board."""
-        return self._board.shape[1]
+        return self._state.shape[1]
 
     @property
     def height(self):
         """Returns the height of the board."""
-        return self._board.shape[0]
+        return self._state.shape[0]
 
     def get_cell(self, x, y):
         """
-        Gets the state of a specific cell on the board.
+        Gets a specific cell on the board.
 
         Args:
             x (int): The x-coordinate of the cell.
             y (int): The y-coordinate of the cell.
 
         Returns:
-            int: The state of the cell (0 for dead, 1 for alive).
+            Cell: A view over the state and age of the cell.
         """
-        return self._board[y, x]
+        return Cell(self, x, y)
 
     def toggle_cell(self, x, y):
         """
@@ -56,52 +244,188 @@ class Board(Observable):
             x (int): The x-coordinate of the cell.
             y (int): The y-coordinate of the cell.
         """
-        self._board[y, x].toggle()
-        self._board[y, x].age = 1
-        self.value = self._board
+        self._state[y, x] ^= 1
+        self._age[y, x] = 1
+        self.invalidate(x, y)
+        kind = "born" if self._state[y, x] else "died"
+        self._notify(lambda: BoardChange(self, cells={kind: (np.array([y]), np.array([x]))}))
+
+    def invalidate(self, x=None, y=None):
+        """
+        Notifies the engine, the statistics, the cycle detection and the history that cells were edited
+        directly in the state or age matrices.
+
+        Args:
+            x (int): The x-coordinate of the edited cell, None for the whole board.
+            y (int): The y-coordinate of the edited cell, None for the whole board.
+        """
+        self._stats = None
+        if self._cycles is not None:
+            self._cycles.reset(self._state, self._generation)
+        if self._timeline is not None:
+            self._timeline.invalidate()
+        self._engine.invalidate(x, y)
 
-    def set_board(self, new_board):
+    def set_board(self, new_state, new_age=None, generation=None):
         """
         Sets a new board with a specific state and signals the update.
 
         Args:
-            new_board (numpy.ndarray): The new board to set.
+            new_state (numpy.ndarray): The new matrix of cell states.
+            new_age (numpy.ndarray): The new matrix of cell ages (default all zeros).
+            generation (int): The generation of the new board, None to keep the current one.
+
+        Setting the generation starts a new population log and history.
+        """
+        self._state, self._age = self._as_matrices(new_state, new_age)
+        if generation is not None:
+            self._generation = generation
+            self.population_log.clear()
+            if self._timeline is not None:
+                self._timeline.clear()
+        self.invalidate()
+        self._batch_replaced = True
+        self._notify(lambda: BoardChange.replaced(self))
+
+    @contextlib.contextmanager
+    def batch(self):
         """
-        self._board = new_board
-        self.value = new_board
+        Merges the changes made in the context into a single notification.
+
+        The notification is sent when the outermost batch ends, with the net difference between
+        the board before and after the batch, e.g.:
+
+            with board.batch():
+                board.toggle_cell(0, 0)
+                board.advance(10)
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = (self._state.copy(), self._age.copy(), self._generation)
+        self._batch_replaced = False
+        try:
+            yield
+        finally:
+            old_state, old_age, old_generation = self._batch
+            self._batch = None
+            generations = self._generation - old_generation
+            if self._batch_replaced or old_state.shape != self._state.shape:
+                self._notify(lambda: BoardChange.replaced(self, generations))
+            else:
+                self._notify(lambda: BoardChange.between(self, old_state, generations, old_age))
 
     def update(self):
         """
         Updates the state of the board following the rules of the Game of Life.
 
-        This method iterates through each cell on the board, applies the rules of the
-        Game of Life, and updates the state accordingly. It also takes care of updating
-        the age of cells and signals the update.
-        """
-        # new auxiliary board on which safely perform updates
-        new_board_states = np.array([[cell.state for cell in row] for row in self._board])
-        for y in range(self._board.shape[0]):
-            for x in range(self._board.shape[1]):
-                cell = self._board[y, x]
-                live_neighbors = self.count_live_neighbors(x, y, self._board)
-
-                # Apply the rules of Conway's Game of Life
-                if cell.state == 1 and (live_neighbors < 2 or live_neighbors > 3):
-                    new_board_states[y][x] = 0
-                elif cell.state == 0 and live_neighbors == 3:
-                    new_board_states[y][x] = 1
-
-        # Update board states and cells age
-        for y in range(self._board.shape[0]):
-            for x in range(self._board.shape[1]):
-                self._board[y, x].state = new_board_states[y, x]
-                # If the state is 1 increment cell age
-                if self._board[y, x].state:
-                    self._board[y, x].age += 1
-                else:
-                    self._board[y, x].age = 0
-
-        self.value = self._board
+        The engine computes the new state and age matrices of the board and the statistics of the
+        new generation are computed, then the update is signaled.
+        """
+        with timings.measure("update"):
+            # Engines may update the age matrix in place, while the history needs the old one
+            old_state = self._state
+            old_age = self._age.copy() if self._timeline is not None else self._age
+            start = time.perf_counter()
+            self._state, self._age = self._engine.step(self._state, self._age)
+            step_time = time.perf_counter() - start
+            self._generation += 1
+            self._record_generation(old_state, old_age, step_time)
+        self._notify(lambda: BoardChange.between(self, old_state, 1))
+
+    def advance(self, generations):
+        """
+        Advances the board by a number of generations and signals the update once.
+
+        Args:
+            generations (int): The number of generations to compute.
+
+        Engines able to jump ahead (such as the HashLife engine) compute the final generation
+        directly, the other engines step through each generation.
+        """
+        with timings.measure("update"):
+            # Engines may reuse the buffers of the current generation for the later ones
+            old_state = self._state.copy()
+            old_age = self._age.copy() if self._timeline is not None else None
+            start = time.perf_counter()
+            self._state, self._age = self._engine.advance(self._state, self._age, generations)
+            step_time = time.perf_counter() - start
+            self._generation += generations
+            self._record_generation(old_state, old_age, step_time, generations)
+        self._notify(lambda: BoardChange.between(self, old_state, generations))
+
+    def fast_forward(self, generations):
+        """
+        Advances the board by a number of generations, skipping whole periods of the detected cycle.
+
+        Until a cycle is detected the generations are computed one at a time, so that it is detected
+        with its exact period. Then the state after whole periods is the current one, and the cells
+        alive through a whole period (those at least period generations old) get older by the
+        generations skipped, so only the remaining generations are computed. Without cycle
+        detection all the generations are computed as by advance. The update is signaled once.
+
+        Args:
+            generations (int): The number of generations to advance.
+        """
+        if self._cycles is None:
+            self.advance(generations)
+            return
+        with self.batch():
+            while generations and self.cycle is None:
+                self.update()
+                generations -= 1
+            skipped = generations - generations % self.cycle.period if generations else 0
+            if skipped:
+                old_age = self._age
+                older = np.minimum(self._age.astype(np.int64) + skipped, AGE_MAX)
+                self._age = np.where(self._age >= self.cycle.period, older, self._age).astype(AGE_DTYPE)
+                self._generation += skipped
+                self._cycles.skip(skipped)
+                self._engine.invalidate()
+                # Whole periods have no net births nor deaths
+                self._record_generation(self._state, old_age, 0.0, skipped)
+            if generations > skipped:
+                self.advance(generations - skipped)
+
+    def _record_generation(self, old_state, old_age, step_time, generations=1):
+        """
+        Computes the statistics of the current generation, looks for a cycle and records the
+        generation in the history and the population log.
+
+        Args:
+            old_state (numpy.ndarray): The state matrix before the update.
+            old_age (numpy.ndarray): The age matrix before the update.
+            step_time (float): The time spent computing the update, in seconds.
+            generations (int): The number of generations computed by the update.
+        """
+        flipped = None
+        if self._cycles is not None or self._timeline is not None:
+            # The cells born or died, shared by the statistics, the cycle detection and the history
+            flipped = np.flatnonzero(self._state != old_state)
+        if self._cycles is not None:
+            self._cycles.record(flipped, self._generation)
+        if self._timeline is not None:
+            self._timeline.record(old_state, old_age, self._state, self._age, self._generation, generations, flipped)
+        self._stats = BoardStats.compute(self._state, self._age, self._generation, old_state, flipped)
+        self.population_log.append(self._generation, self._stats.population, self._stats.births,
+                                   self._stats.deaths, step_time)
+
+    def _tracking_changes(self):
+        """Returns whether the next change is notified on its own, and so has to be computed."""
+        return self._batch is None and self.notifying
+
+    def _notify(self, make_change):
+        """
+        Notifies the observers of a change, unless it is merged into the current batch.
+
+        Args:
+            make_change (callable): Builds the BoardChange, only called when it is notified.
+        """
+        if not self._tracking_changes():
+            self._change = None
+            return
+        self._change = make_change()
+        self.value = self._change
 
     def count_live_neighbors(self, x, y, board):
         """
@@ -110,26 +434,60 @@ class Board(Observable):
         Args:
             x (int): The x-coordinate of the cell.
             y (int): The y-coordinate of the cell.
-            board (numpy.ndarray): The board on which to perform the count.
+            board (numpy.ndarray): The state matrix on which to perform the count.
 
         Returns:
             int: The number of live neighbors.
 
         This method counts the number of live neighbors around a specific cell
-        on the board. It considers the eight adjacent cells and increments the count
-        for each live neighbor.
+        on the board. It considers the eight adjacent cells, past the edges following the
+        topology of the board, and counts the live ones.
         """
-        live_neighbors = 0
+        return count_live_neighbors(board, x, y, self.topology)
 
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue  # Skip the current cell
-                new_x, new_y = x + dx, y + dy
+    @staticmethod
+    def _create_engine(engine, topology):
+        """
+        Creates an engine following a topology.
+
+        Args:
+            engine (str or Engine): The name of the engine or an engine instance.
+            topology (str): The topology of the edges of the board.
 
-                # Check for boundaries
-                if 0 <= new_x < self._board.shape[1] and 0 <= new_y < self._board.shape[0]:
-                    if board[new_y][new_x].state == 1:
-                        live_neighbors += 1
+        Returns:
+            Engine: The engine instance.
 
-        return live_neighbors
+        Raises:
+            ValueError: If the engine is unknown or does not support the topology.
+        """
+        engine = create_engine(engine)
+        try:
+            engine.set_topology(topology)
+        except ValueError:
+            engine.close()
+            raise
+        return engine
+
+    @staticmethod
+    def _as_matrices(state, age):
+        """
+        Converts a state matrix and an optional age matrix to the storage format of the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states.
+            age (numpy.ndarray): The matrix of cell ages, or None for all zeros.
+
+        Returns:
+            tuple: The contiguous state and age matrices.
+
+        Raises:
+            ValueError: If the age matrix does not have the same shape as the state matrix.
+        """
+        state = np.ascontiguousarray(state, dtype=STATE_DTYPE)
+        if age is None:
+            age = np.zeros(state.shape, dtype=AGE_DTYPE)
+        else:
+            age = np.ascontiguousarray(age, dtype=AGE_DTYPE)
+            if age.shape != state.shape:
+                raise ValueError(f"Age shape {age.shape} does not match state shape {state.shape}")
+        return state, age
@@ -1,57 +1,57 @@
-from PyQt5.QtCore import QObject
-
-
-class Cell(QObject):
+class Cell:
     """
     This class represents a cell in Conway's Game of Life.
 
+    A cell does not hold any data itself, it is a lightweight view created on demand
+    over the state and age matrices of the board.
+
     Args:
+        board (Board): The board the cell belongs to.
         x (int): The x-coordinate of the cell.
         y (int): The y-coordinate of the cell.
-        init_state (int): The initial state of the cell (0 for dead, 1 for alive).
-        init_age (int): The initial age of the cell.
 
     Attributes:
+        _board (Board): The board the cell belongs to.
         _x (int): The x-coordinate of the cell.
         _y (int): The y-coordinate of the cell.
-        _state (int): The current state of the cell (0 for dead, 1 for alive).
-        _age (int): The current age of the cell.
 
     """
 
-    def __init__(self, x, y, init_state, init_age):
+    __slots__ = ("_board", "_x", "_y")
+
+    def __init__(self, board, x, y):
         """
         Initializes a new instance of Cell.
         """
-        super().__init__()
+        self._board = board
         self._x = x
         self._y = y
-        self._state = init_state
-        self._age = init_age
 
     @property
     def state(self):
         """Returns the current state of the cell (0 for dead, 1 for alive)."""
-        return self._state
+        return int(self._board.state[self._y, self._x])
 
     @state.setter
     def state(self, new_state):
         """Sets the state of the cell."""
-        self._state = new_state
+        self._board.state[self._y, self._x] = new_state
+        self._board.invalidate(self._x, self._y)
 
     @property
     def age(self):
         """Returns the current age of the cell."""
-        return self._age
+        return int(self._board.age[self._y, self._x])
 
     @age.setter
     def age(self, new_age):
         """Sets the age of the cell."""
-        self._age = new_age
+        self._board.age[self._y, self._x] = new_age
+        self._board.invalidate(self._x, self._y)
 
     def toggle(self):
         """Toggles the state of the cell (dead to alive, alive to dead)."""
-        self._state = 1 - self._state
+        self.state = 1 - self.state
 
     def __str__(self):
         """
@@ -59,6 +59,4 @@ class Cell(QObject):
 
         The string includes the coordinates, state, and age of the cell.
         """
-        return f"({self._x}, {self._y}) - {'Alive' if self._state == 1 else 'Dead' } - Age: {self._age}"
-
-
+        return f"({self._x}, {self._y}) - {'Alive' if self.state == 1 else 'Dead' } - Age: {self.age}"
@@ -0,0 +1,173 @@
+import numpy as np
+
+# Kinds of cell changes
+KINDS = ("born", "died", "aged")
+
+
+class BoardChange:
+    """
+    This class represents a change of the board, notified to the observers of the board.
+
+    The changed cells of each kind are available both as boolean masks and as coordinate arrays,
+    whichever the change was built from, the other one being computed on first use: a consumer
+    of the coordinates of a single edited cell does not pay for a mask of the whole board.
+
+    A change merging several edits or generations holds the net difference between the board
+    before the first one and after the last one.
+
+    Args:
+        board (Board): The changed board.
+        generations (int): The number of generations computed by the change (0 for edits).
+        masks (dict): The boolean mask of the cells of each kind.
+        cells (dict): The (ys, xs) coordinate arrays of the cells of each kind.
+
+    Attributes:
+        board (Board): The changed board.
+        generation (int): The generation of the board after the change.
+        generations (int): The number of generations computed by the change (0 for edits).
+        stats (BoardStats): The population statistics of the board after the change.
+        full (bool): Whether the whole board was replaced, in which case no cells are listed.
+
+    Kinds of changed cells:
+        born: The cells dead before and alive after the change.
+        died: The cells alive before and dead after the change.
+        aged: The cells alive before and after the change, whose age changed (it grows by one at
+            every generation, until it saturates).
+
+    """
+
+    __slots__ = ("board", "generation", "generations", "stats", "full", "_masks", "_cells", "_counts", "_changed")
+
+    def __init__(self, board, generations=0, masks=None, cells=None):
+        """
+        Initializes a new instance of BoardChange.
+        """
+        self.board = board
+        self.generation = board.generation
+        self.generations = generations
+        self.stats = board.stats
+        self.full = masks is None and cells is None
+        self._masks = dict(masks or {})
+        self._cells = dict(cells or {})
+        self._counts = {}
+        self._changed = None
+
+    @classmethod
+    def between(cls, board, old_state, generations=0, old_age=None):
+        """
+        Builds the change from a previous state of the board to its current state.
+
+        Args:
+            board (Board): The changed board.
+            old_state (numpy.ndarray): The state matrix before the change.
+            generations (int): The number of generations computed by the change.
+            old_age (numpy.ndarray): The age matrix before the change, None if the ages of all the
+                cells alive before and after changed (as after a generation).
+
+        Returns:
+            BoardChange: The change, with masks of the changed cells.
+        """
+        new_state = board.state
+        # States are 0 or 1, so the comparisons give births and deaths and the product the survivors
+        survivors = (old_state & new_state).view(bool)
+        if old_age is not None:
+            survivors = survivors & (old_age != board.age)
+        masks = {"born": new_state > old_state, "died": old_state > new_state, "aged": survivors}
+        return cls(board, generations, masks=masks)
+
+    @classmethod
+    def replaced(cls, board, generations=0):
+        """Builds the change of a board replaced as a whole."""
+        return cls(board, generations)
+
+    @property
+    def state(self):
+        """Returns the state matrix of the board after the change."""
+        return self.board.state
+
+    @property
+    def age(self):
+        """Returns the age matrix of the board after the change."""
+        return self.board.age
+
+    @property
+    def changed(self):
+        """Returns the mask of all the changed cells, None if the whole board was replaced."""
+        if self.full:
+            return None
+        if self._changed is None:
+            self._changed = self.mask("born") | self.mask("died") | self.mask("aged")
+        return self._changed
+
+    @property
+    def births(self):
+        """Returns the number of cells born."""
+        return self.count("born")
+
+    @property
+    def deaths(self):
+        """Returns the number of cells that died."""
+        return self.count("died")
+
+    def mask(self, kind):
+        """
+        Returns the boolean mask of the changed cells of a kind.
+
+        Args:
+            kind (str): "born", "died" or "aged".
+
+        Returns:
+            numpy.ndarray: The mask, None if the whole board was replaced.
+        """
+        if self.full:
+            return None
+        if kind not in self._masks:
+            mask = np.zeros(self.board.state.shape, dtype=bool)
+            mask[self.cells(kind)] = True
+            self._masks[kind] = mask
+        return self._masks[kind]
+
+    def cells(self, kind):
+        """
+        Returns the coordinates of the changed cells of a kind.
+
+        Args:
+            kind (str): "born", "died" or "aged".
+
+        Returns:
+            tuple: The arrays of the y and x coordinates, None if the whole board was replaced.
+        """
+        if self.full:
+            return None
+        if kind not in self._cells:
+            if kind in self._masks:
+                self._cells[kind] = np.nonzero(self._masks[kind])
+            else:
+                self._cells[kind] = (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+        return self._cells[kind]
+
+    def count(self, kind):
+        """
+        Returns the number of changed cells of a kind.
+
+        Args:
+            kind (str): "born", "died" or "aged".
+
+        Returns:
+            int: The number of cells, None if the whole board was replaced.
+        """
+        if self.full:
+            return None
+        if kind not in self._counts:
+            if kind in self._cells or kind not in self._masks:
+                self._counts[kind] = len(self.cells(kind)[0])
+            else:
+                self._counts[kind] = int(np.count_nonzero(self._masks[kind]))
+        return self._counts[kind]
+
+    def __str__(self):
+        """Returns a string representation of the change with its summary counts."""
+        if self.full:
+            return f"Generation {self.generation} - Board replaced"
+        return (f"Generation {self.generation} - Births: {self.births} - Deaths: {self.deaths} - "
+                f"Aged: {self.count('aged')}")
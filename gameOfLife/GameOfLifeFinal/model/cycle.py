@@ -0,0 +1,142 @@
+import collections
+
+import numpy as np
+
+# Number of most recent generations whose hashes are kept, bounding the longest period detected
+DEFAULT_HISTORY = 1024
+
+
+class Cycle:
+    """
+    This class represents a cycle of the board: a state repeating itself every period generations.
+
+    A still life is a cycle of period 1.
+
+    Args:
+        period (int): The number of generations after which the state repeats.
+        start (int): The generation where the repeated state was first seen.
+
+    Attributes:
+        period (int): The number of generations after which the state repeats.
+        start (int): The generation where the repeated state was first seen.
+
+    """
+
+    def __init__(self, period, start):
+        """
+        Initializes a new instance of Cycle.
+        """
+        self.period = period
+        self.start = start
+
+    def __str__(self):
+        """Returns a string representation of the cycle."""
+        if self.period == 1:
+            return f"Still life since generation {self.start}"
+        return f"Cycle of period {self.period} since generation {self.start}"
+
+
+class CycleDetector:
+    """
+    This class detects when the state of the board repeats itself.
+
+    The state is hashed Zobrist-style, as the XOR of a random 64-bit key of each alive cell, so
+    the hash of the next generation is updated by XOR-ing the keys of the cells that were born
+    or died only. The keys are derived from the index of the cell with the SplitMix64 mixer
+    instead of being stored in a table the size of the board.
+
+    The hashes of the most recent generations are kept with their generation: when a hash comes
+    back, the state repeats with a period of the difference of the generations (or a multiple of
+    it when generations were computed several at a time). A false detection would need two
+    different states with the same 64-bit hash.
+
+    Args:
+        state (numpy.ndarray): The state matrix of the board.
+        generation (int): The generation of the board.
+        history (int): The number of most recent hashes kept.
+        seed (int): The seed of the cell keys.
+
+    Attributes:
+        history (int): The number of most recent hashes kept.
+        hash (int): The hash of the current state.
+        cycle (Cycle): The detected cycle, None if the state did not repeat yet.
+        _generations (dict): The generation of each recent hash.
+        _recent (collections.deque): The recent (hash, generation) pairs, oldest first.
+
+    """
+
+    def __init__(self, state, generation, history=DEFAULT_HISTORY, seed=0):
+        """
+        Initializes a new instance of CycleDetector.
+        """
+        self.history = history
+        self._seed = np.uint64(seed)
+        self.reset(state, generation)
+
+    def reset(self, state, generation):
+        """
+        Forgets the recent hashes and hashes a new state from scratch (after an edit of the board).
+
+        Args:
+            state (numpy.ndarray): The state matrix of the board.
+            generation (int): The generation of the board.
+        """
+        self.hash = self._xor_keys(np.flatnonzero(state))
+        self.cycle = None
+        self._generations = {}
+        self._recent = collections.deque()
+        self._remember(generation)
+
+    def record(self, flipped, generation):
+        """
+        Updates the hash with the cells born or died in a new generation and looks for a cycle.
+
+        Args:
+            flipped (numpy.ndarray): The flat indices of the cells born or died.
+            generation (int): The new generation of the board.
+
+        Returns:
+            Cycle: The detected cycle, None if the state did not repeat yet.
+        """
+        self.hash ^= self._xor_keys(flipped)
+        if self.cycle is None and self.hash in self._generations:
+            start = self._generations[self.hash]
+            self.cycle = Cycle(generation - start, start)
+        self._remember(generation)
+        return self.cycle
+
+    def skip(self, generations):
+        """
+        Moves the recent hashes forward by whole periods skipped without computing them.
+
+        Args:
+            generations (int): The number of generations skipped, a multiple of the period.
+        """
+        self._recent = collections.deque((key, generation + generations) for key, generation in self._recent)
+        self._generations = dict(self._recent)
+
+    def _remember(self, generation):
+        """Keeps the current hash with its generation, forgetting the oldest one beyond the history."""
+        self._generations[self.hash] = generation
+        self._recent.append((self.hash, generation))
+        if len(self._recent) > self.history:
+            key, oldest = self._recent.popleft()
+            if self._generations.get(key) == oldest:
+                del self._generations[key]
+
+    def _xor_keys(self, indices):
+        """
+        Combines the keys of some cells.
+
+        Args:
+            indices (numpy.ndarray): The flat indices of the cells.
+
+        Returns:
+            int: The XOR of the keys of the cells.
+        """
+        # SplitMix64 of the index, the multiplications wrapping around modulo 2**64
+        z = indices.astype(np.uint64) + self._seed + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        return int(np.bitwise_xor.reduce(z)) if len(z) else 0
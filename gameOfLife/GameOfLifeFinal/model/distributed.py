@@ -0,0 +1,621 @@
+import json
+import multiprocessing
+import socket
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, STATE_DTYPE, Engine, next_age, next_region
+from GameOfLifeFinal.model.stats import AGE_BUCKETS, BoardStats
+
+# Message kinds exchanged over the sockets
+HELLO, SETUP, PEER, STEP, STATS, GATHER, PREVIEW, DATA, HALO, STOP = range(10)
+
+# Every message is: kind, length of the JSON header, length of the binary payload
+_FRAME = struct.Struct("!BII")
+
+# Directions of the neighbors of a node, the node connects to the south and east ones
+_OPPOSITE = {"north": "south", "south": "north", "west": "east", "east": "west"}
+
+
+class Coordinator:
+    """
+    This class represents the coordinator of a board split across several nodes.
+
+    The board is split in a grid of rectangular domains, one for each node. Nodes talk only over TCP:
+    every generation each node exchanges its border rows and columns, bit-packed, directly with its
+    neighbor nodes, while the coordinator only distributes the commands and gathers the population
+    statistics, downsampled previews and timings, and the whole board only when asked. On a single
+    machine the nodes are local worker processes, otherwise they are started on other machines with run_node.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states of the whole board.
+        age (numpy.ndarray): The matrix of cell ages of the whole board (default all zeros).
+        grid (tuple): The number of rows and columns of domains (default (2, 2)).
+        spawn (bool): Whether to start the nodes as local processes (default True).
+        host (str): The address the coordinator listens on for the nodes (default localhost).
+        port (int): The port the coordinator listens on (default any free port).
+
+    Attributes:
+        _nodes (list): The control socket and the domain (y0, y1, x0, x1) of every node.
+        _processes (list): The local node processes.
+        _stats (list): The timings reported by every node since the start.
+        _population (int): The number of live cells after the last step.
+        _summary (dict): The births, deaths, bounding box and age histogram of the whole board after the last step.
+
+    """
+
+    def __init__(self, state, age=None, grid=(2, 2), spawn=True, host="127.0.0.1", port=0):
+        """
+        Initializes a new instance of Coordinator.
+        """
+        height, width = state.shape
+        rows, columns = min(grid[0], height), min(grid[1], width)
+        self.shape = state.shape
+        self.grid = (rows, columns)
+        self._processes = []
+        self._nodes = []
+        self._population = int(np.count_nonzero(state))
+        self._stats = [_empty_stats() for _ in range(rows * columns)]
+        self._summary = None
+        if age is None:
+            age = np.zeros(state.shape, dtype=AGE_DTYPE)
+
+        listener = socket.create_server((host, port))
+        try:
+            if spawn:
+                address = listener.getsockname()
+                for _ in range(rows * columns):
+                    process = multiprocessing.Process(target=run_node, args=address, daemon=True)
+                    process.start()
+                    self._processes.append(process)
+            self._connect(listener, rows * columns)
+        finally:
+            listener.close()
+        self._scatter(np.asarray(state, dtype=STATE_DTYPE), np.asarray(age, dtype=AGE_DTYPE))
+
+    @property
+    def population(self):
+        """Returns the number of live cells after the last step."""
+        return self._population
+
+    def step(self, generations=1):
+        """
+        Advances every node by a number of generations.
+
+        Args:
+            generations (int): The number of generations to compute.
+
+        Returns:
+            int: The number of live cells of the whole board.
+        """
+        for sock, _ in self._nodes:
+            _send(sock, STEP, {"generations": generations})
+        self._population = 0
+        summary = {"births": 0, "deaths": 0, "bounding_box": None,
+                   "age_histogram": np.zeros(len(AGE_BUCKETS), dtype=np.int64)}
+        for index, (sock, _) in enumerate(self._nodes):
+            _, report, _ = _recv(sock)
+            self._population += report.pop("population")
+            summary["births"] += report.pop("births")
+            summary["deaths"] += report.pop("deaths")
+            summary["age_histogram"] += report.pop("age_histogram")
+            bounds = report.pop("bounding_box")
+            if bounds is not None and summary["bounding_box"] is not None:
+                other = summary["bounding_box"]
+                bounds = (min(bounds[0], other[0]), min(bounds[1], other[1]),
+                          max(bounds[2], other[2]), max(bounds[3], other[3]))
+            if bounds is not None:
+                summary["bounding_box"] = tuple(bounds)
+            for key, value in report.items():
+                if key == "max_latency":
+                    self._stats[index][key] = max(self._stats[index][key], value)
+                else:
+                    self._stats[index][key] += value
+        self._summary = summary
+        return self._population
+
+    def board_stats(self, generation):
+        """
+        Returns the population statistics of the whole board after the last step, without gathering it.
+
+        Args:
+            generation (int): The generation reached by the last step.
+
+        Returns:
+            BoardStats: The statistics, the births and deaths counted since the step before, None before the first step.
+        """
+        if self._summary is None:
+            return None
+        summary = self._summary
+        return BoardStats(generation, self._population, summary["births"], summary["deaths"],
+                          summary["bounding_box"], None, None, summary["age_histogram"])
+
+    def preview(self, factor):
+        """
+        Gathers a downsampled preview of the whole board.
+
+        Args:
+            factor (int): The side of the square blocks of cells summarized by one preview cell.
+
+        Returns:
+            numpy.ndarray: The number of live cells of every block.
+        """
+        height, width = self.shape
+        preview = np.zeros((-(-height // factor), -(-width // factor)), dtype=np.uint32)
+        for sock, _ in self._nodes:
+            _send(sock, PREVIEW, {"factor": factor})
+        for sock, (y0, y1, x0, x1) in self._nodes:
+            header, payload = _recv(sock)[1:]
+            blocks = np.frombuffer(payload, dtype=np.uint32).reshape(header["shape"])
+            # Blocks are aligned to the whole board, blocks on a domain border are shared by two nodes
+            preview[y0 // factor:y0 // factor + blocks.shape[0], x0 // factor:x0 // factor + blocks.shape[1]] += blocks
+        return preview
+
+    def gather(self):
+        """
+        Gathers the whole board from the nodes.
+
+        Returns:
+            tuple: The state matrix and the age matrix of the whole board.
+        """
+        state = np.zeros(self.shape, dtype=STATE_DTYPE)
+        age = np.zeros(self.shape, dtype=AGE_DTYPE)
+        for sock, _ in self._nodes:
+            _send(sock, GATHER)
+        for sock, (y0, y1, x0, x1) in self._nodes:
+            _, _, payload = _recv(sock)
+            state[y0:y1, x0:x1], age[y0:y1, x0:x1] = _decode_domain(payload, (y1 - y0, x1 - x0))
+        return state, age
+
+    def stats(self):
+        """
+        Returns the timings of every node since the start.
+
+        Returns:
+            list: For every node its domain, generations, throughput in cells per second,
+            mean and max communication latency per generation in seconds and bytes sent.
+        """
+        stats = []
+        for (_, (y0, y1, x0, x1)), node_stats in zip(self._nodes, self._stats):
+            generations = node_stats["generations"]
+            busy = node_stats["compute_time"] + node_stats["exchange_time"]
+            stats.append({
+                "domain": (y0, y1, x0, x1),
+                "generations": generations,
+                "cells_per_second": (y1 - y0) * (x1 - x0) * generations / busy if busy else 0.0,
+                "mean_latency": node_stats["exchange_time"] / generations if generations else 0.0,
+                "max_latency": node_stats["max_latency"],
+                "bytes_sent": node_stats["bytes_sent"],
+            })
+        return stats
+
+    def close(self):
+        """Stops the nodes and closes the connections."""
+        for sock, _ in self._nodes:
+            try:
+                _send(sock, STOP)
+            except OSError:
+                pass
+            sock.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._nodes = []
+        self._processes = []
+
+    def _connect(self, listener, count):
+        """
+        Accepts the connections of the nodes and tells every node where its neighbors listen.
+
+        Args:
+            listener (socket.socket): The listening socket of the coordinator.
+            count (int): The number of nodes to wait for.
+        """
+        rows, columns = self.grid
+        height, width = self.shape
+        hellos = []
+        for _ in range(count):
+            sock, _ = listener.accept()
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            _, hello, _ = _recv(sock)
+            hellos.append((sock, (hello["host"], hello["port"])))
+
+        for index, (sock, _) in enumerate(hellos):
+            row, column = divmod(index, columns)
+            domain = (height * row // rows, height * (row + 1) // rows,
+                      width * column // columns, width * (column + 1) // columns)
+            neighbors = {}
+            for direction, (other_row, other_column) in (("north", (row - 1, column)), ("south", (row + 1, column)),
+                                                         ("west", (row, column - 1)), ("east", (row, column + 1))):
+                if 0 <= other_row < rows and 0 <= other_column < columns:
+                    other = other_row * columns + other_column
+                    neighbors[direction] = [other, *hellos[other][1]]
+            self._nodes.append((sock, domain))
+            _send(sock, SETUP, {"id": index, "domain": domain, "neighbors": neighbors})
+        # Wait until every node is connected to its neighbors
+        for sock, _ in self._nodes:
+            _recv(sock)
+
+    def _scatter(self, state, age):
+        """Sends to every node the cells of its domain."""
+        for sock, (y0, y1, x0, x1) in self._nodes:
+            _send(sock, DATA, {}, _encode_domain(state[y0:y1, x0:x1], age[y0:y1, x0:x1]))
+        for sock, _ in self._nodes:
+            _recv(sock)
+
+
+class DistributedEngine(Engine):
+    """
+    This class represents the distributed engine.
+
+    The board is stepped by the nodes of a Coordinator and gathered back at the end of every call,
+    so the simulation computes the generations between two frames with a single advance.
+    The coordinator and its nodes are kept between steps and created again when the board is replaced.
+
+    The nodes can also run ahead of the board without gathering it, while the view only shows the
+    population statistics and a downsampled preview of the board reduced by the nodes. The next
+    advance then only computes the generations not run ahead yet before gathering the board.
+
+    Args:
+        grid (tuple): The number of rows and columns of domains (default (2, 2)).
+
+    """
+
+    name = "distributed"
+    batch_generations = True
+
+    def __init__(self, grid=(2, 2)):
+        """
+        Initializes a new instance of DistributedEngine.
+        """
+        self.grid = grid
+        self._coordinator = None
+        self._current = None
+        self._ahead = 0
+
+    @property
+    def coordinator(self):
+        """Returns the coordinator of the nodes, None before the first step."""
+        return self._coordinator
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the board on the nodes.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        return self.advance(state, age, 1)
+
+    def advance(self, state, age, generations):
+        """
+        Computes the board after a number of generations, gathering it only at the end.
+
+        The generations the nodes already ran ahead of the same board are not computed again.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        self._distribute(state, age)
+        if generations > self._ahead:
+            self._coordinator.step(generations - self._ahead)
+        self._ahead = 0
+        new_state, new_age = self._coordinator.gather()
+        self._current = new_state
+        return new_state, new_age
+
+    def run_ahead(self, state, age, generations, generation):
+        """
+        Advances the nodes by a number of generations without gathering the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states, as last returned or edited.
+            age (numpy.ndarray): The matrix of cell ages, as last returned or edited.
+            generations (int): The number of generations to compute.
+            generation (int): The generation reached by the nodes, for the statistics.
+
+        Returns:
+            BoardStats: The population statistics reduced by the nodes, without the matrices of the board.
+        """
+        self._distribute(state, age)
+        self._coordinator.step(generations)
+        self._ahead += generations
+        return self._coordinator.board_stats(generation)
+
+    def preview(self, factor):
+        """
+        Returns a downsampled preview of the board as computed by the nodes.
+
+        Args:
+            factor (int): The side of the square blocks of cells summarized by one preview cell.
+
+        Returns:
+            numpy.ndarray: The number of live cells of every block.
+        """
+        return self._coordinator.preview(factor)
+
+    def invalidate(self, x=None, y=None):
+        """Drops the nodes, the edited board is distributed again at the next step."""
+        self._current = None
+
+    def close(self):
+        """Stops the nodes."""
+        if self._coordinator is not None:
+            self._coordinator.close()
+            self._coordinator = None
+        self._ahead = 0
+
+    def _distribute(self, state, age):
+        """Creates the coordinator and its nodes for a board, unless they already hold it."""
+        if self._coordinator is None or state is not self._current:
+            self.close()
+            self._coordinator = Coordinator(state, age, self.grid)
+            self._current = state
+
+    def report(self):
+        """Returns the slowest node throughput and the worst communication latency."""
+        if self._coordinator is None:
+            return None
+        stats = self._coordinator.stats()
+        throughput = min(node["cells_per_second"] for node in stats)
+        latency = max(node["max_latency"] for node in stats)
+        return (f"Nodes: {len(stats)} - Min Throughput: {throughput / 1e6:.1f} Mcells/s - "
+                f"Max Latency: {latency * 1e3:.2f} ms")
+
+
+def run_node(host, port, listen_host=None, advertise_host=None):
+    """
+    Runs a node: connects to the coordinator and serves its commands until told to stop.
+
+    Args:
+        host (str): The address of the coordinator.
+        port (int): The port of the coordinator.
+        listen_host (str): The address the node listens on for its neighbors, "" or "0.0.0.0" for
+            every interface (default the address the node reaches the coordinator from).
+        advertise_host (str): The address the neighbors connect to (default the listening address,
+            or the address the node reaches the coordinator from when listening on every interface).
+    """
+    control = socket.create_connection((host, port))
+    control.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # The interface used to reach the coordinator is the one the other nodes can reach too
+    local_host = control.getsockname()[0]
+    if listen_host is None:
+        listen_host = local_host
+    if advertise_host is None:
+        advertise_host = local_host if listen_host in ("", "0.0.0.0", "::") else listen_host
+    listener = socket.create_server((listen_host, 0))
+    _send(control, HELLO, {"host": advertise_host, "port": listener.getsockname()[1]})
+    _, setup, _ = _recv(control)
+    node = _Node(setup, listener)
+    listener.close()
+    _send(control, DATA)
+
+    while True:
+        kind, header, payload = _recv(control)
+        if kind == DATA:
+            node.state, node.age = _decode_domain(payload, node.shape)
+            _send(control, DATA)
+        elif kind == STEP:
+            _send(control, STATS, node.run(header["generations"]))
+        elif kind == GATHER:
+            _send(control, DATA, {}, _encode_domain(node.state, node.age))
+        elif kind == PREVIEW:
+            blocks = node.preview(header["factor"])
+            _send(control, DATA, {"shape": blocks.shape}, blocks.tobytes())
+        elif kind == STOP:
+            break
+    node.close()
+    control.close()
+
+
+class _Node:
+    """
+    This class represents the domain of the board owned by a node and the connections to its neighbors.
+
+    Args:
+        setup (dict): The setup sent by the coordinator: id, domain and neighbor addresses.
+        listener (socket.socket): The socket the node listens on for its north and west neighbors.
+
+    """
+
+    def __init__(self, setup, listener):
+        """
+        Initializes a new instance of _Node.
+        """
+        self.id = setup["id"]
+        y0, y1, x0, x1 = setup["domain"]
+        self.origin = (y0, x0)
+        self.shape = (y1 - y0, x1 - x0)
+        self.state = np.zeros(self.shape, dtype=STATE_DTYPE)
+        self.age = np.zeros(self.shape, dtype=AGE_DTYPE)
+        self.peers = {}
+
+        # Connect to the south and east neighbors, accept the north and west ones
+        for direction in ("south", "east"):
+            if direction in setup["neighbors"]:
+                _, host, port = setup["neighbors"][direction]
+                sock = socket.create_connection((host, port))
+                _send(sock, PEER, {"direction": _OPPOSITE[direction]})
+                self.peers[direction] = sock
+        for _ in [direction for direction in ("north", "west") if direction in setup["neighbors"]]:
+            sock, _ = listener.accept()
+            _, hello, _ = _recv(sock)
+            self.peers[hello["direction"]] = sock
+        for sock in self.peers.values():
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def run(self, generations):
+        """
+        Computes a number of generations, exchanging the halo with the neighbors before each one.
+
+        Args:
+            generations (int): The number of generations to compute.
+
+        Returns:
+            dict: The population statistics at the end of the run, with the births and deaths since its
+            start and the bounding box in board coordinates, and the timings of the run.
+        """
+        height, width = self.shape
+        start_state = self.state
+        report = {"generations": generations, "compute_time": 0.0, "exchange_time": 0.0,
+                  "max_latency": 0.0, "bytes_sent": 0}
+        padded = np.zeros((height + 2, width + 2), dtype=STATE_DTYPE)
+        for _ in range(generations):
+            start = time.perf_counter()
+            padded[1:-1, 1:-1] = self.state
+            # Columns first, then the rows including the ghost columns, so the corners come from the diagonal nodes
+            report["bytes_sent"] += self._exchange(padded, {"west": (slice(1, -1), 1), "east": (slice(1, -1), -2)},
+                                                   {"west": (slice(1, -1), 0), "east": (slice(1, -1), -1)})
+            report["bytes_sent"] += self._exchange(padded, {"north": (1, slice(None)), "south": (-2, slice(None))},
+                                                   {"north": (0, slice(None)), "south": (-1, slice(None))})
+            exchanged = time.perf_counter()
+            alive = next_region(padded, 1, height + 1, 1, width + 1)
+            self.state = alive.astype(STATE_DTYPE)
+            self.age = next_age(alive, self.age)
+            report["compute_time"] += time.perf_counter() - exchanged
+            report["exchange_time"] += exchanged - start
+            report["max_latency"] = max(report["max_latency"], exchanged - start)
+        report.update(self._population_stats(start_state))
+        return report
+
+    def preview(self, factor):
+        """
+        Counts the live cells of the domain in square blocks aligned to the whole board.
+
+        Args:
+            factor (int): The side of the blocks.
+
+        Returns:
+            numpy.ndarray: The number of live cells of every block touching the domain.
+        """
+        y0, x0 = self.origin
+        offset_y, offset_x = y0 % factor, x0 % factor
+        height, width = self.shape
+        blocks_y = -(-(offset_y + height) // factor)
+        blocks_x = -(-(offset_x + width) // factor)
+        padded = np.zeros((blocks_y * factor, blocks_x * factor), dtype=np.uint32)
+        padded[offset_y:offset_y + height, offset_x:offset_x + width] = self.state
+        return padded.reshape(blocks_y, factor, blocks_x, factor).sum(axis=(1, 3), dtype=np.uint32)
+
+    def _population_stats(self, old_state):
+        """
+        Computes the population statistics of the domain, as BoardStats.compute does for the whole board.
+
+        Args:
+            old_state (numpy.ndarray): The state matrix of the domain before the run.
+
+        Returns:
+            dict: The population, births, deaths, bounding box and age histogram of the domain.
+        """
+        alive = self.state != 0
+        population = int(np.count_nonzero(alive))
+        births = int(np.count_nonzero(self.state > old_state))
+        bounding_box = None
+        if population:
+            y0, x0 = self.origin
+            rows = np.flatnonzero(alive.any(axis=1)) + y0
+            columns = np.flatnonzero(alive.any(axis=0)) + x0
+            bounding_box = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+        # The binary exponent of an age is the index of its bucket (0, 1, 2-3, 4-7, ...)
+        histogram = np.bincount(np.frexp(self.age[alive])[1], minlength=len(AGE_BUCKETS))
+        return {"population": population, "births": births,
+                "deaths": int(np.count_nonzero(old_state)) + births - population,
+                "bounding_box": bounding_box, "age_histogram": histogram.tolist()}
+
+    def close(self):
+        """Closes the connections to the neighbors."""
+        for sock in self.peers.values():
+            sock.close()
+
+    def _exchange(self, padded, sources, targets):
+        """
+        Sends border lines to the neighbors and receives theirs in the ghost lines.
+
+        Args:
+            padded (numpy.ndarray): The domain with one ghost line on every side.
+            sources (dict): The index of the border line to send in every direction.
+            targets (dict): The index of the ghost line to fill from every direction.
+
+        Returns:
+            int: The number of bytes sent.
+        """
+        directions = [direction for direction in sources if direction in self.peers]
+        messages = {direction: np.packbits(padded[sources[direction]]).tobytes() for direction in directions}
+
+        def send_all():
+            for direction in directions:
+                _send(self.peers[direction], HALO, None, messages[direction])
+
+        # Send in the background so that two neighbors sending to each other never block
+        sender = threading.Thread(target=send_all)
+        sender.start()
+        for direction in directions:
+            line = padded[targets[direction]]
+            _, _, payload = _recv(self.peers[direction])
+            line[...] = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=line.size)
+        sender.join()
+        return sum(len(message) for message in messages.values())
+
+
+def _empty_stats():
+    """Returns the timings of a node before any step."""
+    return {"generations": 0, "compute_time": 0.0, "exchange_time": 0.0, "max_latency": 0.0, "bytes_sent": 0}
+
+
+def _encode_domain(state, age):
+    """Encodes the cells of a domain as bit-packed states followed by the ages."""
+    return np.packbits(state).tobytes() + np.ascontiguousarray(age, dtype=AGE_DTYPE).tobytes()
+
+
+def _decode_domain(payload, shape):
+    """Decodes the cells of a domain encoded by _encode_domain."""
+    cells = shape[0] * shape[1]
+    packed_size = -(-cells // 8)
+    packed = np.frombuffer(payload, dtype=np.uint8, count=packed_size)
+    state = np.unpackbits(packed, count=cells).reshape(shape).astype(STATE_DTYPE)
+    age = np.frombuffer(payload, dtype=AGE_DTYPE, offset=packed_size).reshape(shape).copy()
+    return state, age
+
+
+def _send(sock, kind, header=None, payload=b""):
+    """Sends a message made of a kind, a JSON header and a binary payload."""
+    meta = json.dumps(header or {}).encode()
+    sock.sendall(_FRAME.pack(kind, len(meta), len(payload)) + meta + payload)
+
+
+def _recv(sock):
+    """Receives a message, returning its kind, its JSON header and its binary payload."""
+    kind, meta_size, payload_size = _FRAME.unpack(_recv_exactly(sock, _FRAME.size))
+    header = json.loads(_recv_exactly(sock, meta_size))
+    return kind, header, _recv_exactly(sock, payload_size)
+
+
+def _recv_exactly(sock, size):
+    """Receives exactly a number of bytes from a socket."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Connection closed by the other side")
+        received += count
+    return bytes(buffer)
+
+
+if __name__ == "__main__":
+    # Start a node on this machine:
+    # python -m GameOfLifeFinal.model.distributed COORDINATOR_HOST PORT [LISTEN_HOST [ADVERTISE_HOST]]
+    run_node(sys.argv[1], int(sys.argv[2]), *sys.argv[3:5])
@@ -0,0 +1,319 @@
+import numpy as np
+
+# Data types of the state and age matrices
+STATE_DTYPE = np.uint8
+AGE_DTYPE = np.uint16
+# Ages saturate instead of wrapping around
+AGE_MAX = np.iinfo(AGE_DTYPE).max
+# Behaviors of the edges of the board: the cells outside are dead, or the board wraps around as a
+# torus, as a Klein bottle (the rows wrap around flipped left to right), or is mirrored at its edges
+TOPOLOGIES = ("dead", "torus", "klein", "mirror")
+# Topology used when none is specified
+DEFAULT_TOPOLOGY = "dead"
+
+
+class Engine:
+    """
+    This class is the base of the stepping engines used by the Board.
+
+    An engine receives the state and age matrices of the board and computes the next generation
+    following the rules of Conway's Game of Life (a dead cell with exactly 3 live neighbors is born,
+    a live cell with 2 or 3 live neighbors survives, every other cell dies or stays dead).
+
+    Attributes:
+        name (str): The name used to select the engine.
+        topologies (tuple): The topologies of the edges of the board supported by the engine.
+        topology (str): The topology of the edges of the board.
+        batch_generations (bool): Whether the simulation computes the generations between two frames
+            with a single advance, for engines paying more for every call than for every generation.
+
+    """
+
+    name = None
+    topologies = (DEFAULT_TOPOLOGY,)
+    topology = DEFAULT_TOPOLOGY
+    batch_generations = False
+
+    def set_topology(self, topology):
+        """
+        Sets the topology of the edges of the board.
+
+        Args:
+            topology (str): One of the topologies supported by the engine.
+
+        Raises:
+            ValueError: If the engine does not support the topology.
+        """
+        if topology not in self.topologies:
+            raise ValueError(f"The {self.name} engine does not support the '{topology}' topology, "
+                             f"supported topologies: {', '.join(self.topologies)}")
+        self.topology = topology
+        self.invalidate()
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        raise NotImplementedError
+
+    def advance(self, state, age, generations):
+        """
+        Computes the board after a number of generations.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        for _ in range(generations):
+            state, age = self.step(state, age)
+        return state, age
+
+    def invalidate(self, x=None, y=None):
+        """
+        Notifies the engine that cells were edited outside of it.
+
+        Args:
+            x (int): The x-coordinate of the edited cell, None for the whole board.
+            y (int): The y-coordinate of the edited cell, None for the whole board.
+
+        Engines keeping state between generations use it to drop what the edit made stale.
+        """
+
+    def close(self):
+        """
+        Releases the resources held by the engine (such as worker processes), if any.
+        """
+
+    def report(self):
+        """
+        Returns a short description of the work done in the last generation, if the engine tracks any.
+
+        Returns:
+            str: The description, or None.
+        """
+        return None
+
+
+class ClassicEngine(Engine):
+    """
+    This class represents the original cell by cell engine.
+
+    It iterates through each cell on the board and counts its live neighbors one at a time, in a
+    copy of the board padded with the cells past its edges. It is kept as a reference implementation
+    for the faster engines.
+    """
+
+    name = "classic"
+    topologies = TOPOLOGIES
+
+    def step(self, state, age):
+        """
+        Computes the next generation iterating through each cell of the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        # new auxiliary board on which safely perform updates
+        new_state = state.copy()
+        new_age = age.copy()
+        # board padded with the cells past its edges, so no neighbor needs a bounds check
+        padded = halo_block(state, 0, state.shape[0], 0, state.shape[1], self.topology)
+        for y in range(state.shape[0]):
+            for x in range(state.shape[1]):
+                live_neighbors = int(padded[y:y + 3, x:x + 3].sum()) - int(state[y, x])
+
+                # Apply the rules of Conway's Game of Life
+                if state[y, x] == 1 and (live_neighbors < 2 or live_neighbors > 3):
+                    new_state[y, x] = 0
+                elif state[y, x] == 0 and live_neighbors == 3:
+                    new_state[y, x] = 1
+
+                # If the state is 1 increment cell age
+                if new_state[y, x]:
+                    new_age[y, x] = min(int(age[y, x]) + 1, AGE_MAX)
+                else:
+                    new_age[y, x] = 0
+
+        return new_state, new_age
+
+
+class NumpyEngine(Engine):
+    """
+    This class represents the vectorized NumPy engine.
+
+    Neighbor counts of the whole board are computed at once as the sum of the eight shifted slices
+    of a padded copy of the state matrix, then the rules and the age update are applied
+    as boolean masks.
+    """
+
+    name = "numpy"
+    topologies = TOPOLOGIES
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the whole board in a single vectorized pass.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        neighbors = neighbor_counts(state, self.topology)
+        # Birth with 3 neighbors, survival with 2 or 3 neighbors
+        alive = (neighbors == 3) | ((state == 1) & (neighbors == 2))
+        new_state = alive.astype(state.dtype)
+        return new_state, next_age(alive, age)
+
+
+def neighbor_counts(state, topology=DEFAULT_TOPOLOGY):
+    """
+    Counts the live neighbors of every cell of the board.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+        topology (str): The topology of the edges of the board (default dead cells outside).
+
+    Returns:
+        numpy.ndarray: A matrix with the number of live neighbors of each cell.
+    """
+    return _halo_counts(halo_block(state, 0, state.shape[0], 0, state.shape[1], topology))
+
+
+def next_region(state, y0, y1, x0, x1, topology=DEFAULT_TOPOLOGY):
+    """
+    Computes the next generation of a rectangular region of the board.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+        y0 (int): The first row of the region.
+        y1 (int): The row after the last row of the region.
+        x0 (int): The first column of the region.
+        x1 (int): The column after the last column of the region.
+        topology (str): The topology of the edges of the board (default dead cells outside).
+
+    Returns:
+        numpy.ndarray: The boolean matrix of the cells of the region alive in the next generation.
+
+    The neighbor counts are computed on the region with a halo of one cell read from the board,
+    see halo_block.
+    """
+    counts = _halo_counts(halo_block(state, y0, y1, x0, x1, topology))
+    # Birth with 3 neighbors, survival with 2 or 3 neighbors
+    return (counts == 3) | ((state[y0:y1, x0:x1] == 1) & (counts == 2))
+
+
+def halo_block(state, y0, y1, x0, x1, topology=DEFAULT_TOPOLOGY):
+    """
+    Copies a rectangular region of the board with a halo of one cell around it.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+        y0 (int): The first row of the region.
+        y1 (int): The row after the last row of the region.
+        x0 (int): The first column of the region.
+        x1 (int): The column after the last column of the region.
+        topology (str): The topology of the edges of the board (default dead cells outside).
+
+    Returns:
+        numpy.ndarray: The uint8 matrix of the region with its halo.
+
+    The part of the halo inside the board is copied with the region. The part past the edges of
+    the board is dead, or read from the board with the wrapped or mirrored coordinates of the
+    topology, one whole side at a time, so the cost does not depend on the topology.
+
+    Raises:
+        ValueError: If the topology is unknown.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}', available topologies: {', '.join(TOPOLOGIES)}")
+    height, width = state.shape
+    block = np.zeros((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+    # Part of the region and its halo inside the board
+    inner_y0, inner_x0 = max(y0 - 1, 0), max(x0 - 1, 0)
+    inner_y1, inner_x1 = min(y1 + 1, height), min(x1 + 1, width)
+    block[inner_y0 - y0 + 1:inner_y1 - y0 + 1, inner_x0 - x0 + 1:inner_x1 - x0 + 1] = \
+        state[inner_y0:inner_y1, inner_x0:inner_x1]
+    if topology == "dead":
+        return block
+
+    # Sides of the halo past the edges of the board, as the coordinates of their cells
+    ys, xs = np.arange(y0 - 1, y1 + 1), np.arange(x0 - 1, x1 + 1)
+    sides = []
+    if y0 == 0:
+        sides.append((0, slice(None), np.full_like(xs, -1), xs))
+    if y1 == height:
+        sides.append((-1, slice(None), np.full_like(xs, height), xs))
+    if x0 == 0:
+        sides.append((slice(None), 0, ys, np.full_like(ys, -1)))
+    if x1 == width:
+        sides.append((slice(None), -1, ys, np.full_like(ys, width)))
+    for rows, columns, side_ys, side_xs in sides:
+        if topology == "mirror":
+            # The edges are mirrors between the cells, the cell past an edge is the edge cell
+            side_ys, side_xs = np.clip(side_ys, 0, height - 1), np.clip(side_xs, 0, width - 1)
+        elif topology == "klein":
+            # Crossing the top or bottom edge flips the board left to right
+            flipped = (side_ys < 0) | (side_ys >= height)
+            side_xs = np.where(flipped, width - 1 - side_xs, side_xs)
+        block[rows, columns] = state[side_ys % height, side_xs % width]
+    return block
+
+
+def _halo_counts(block):
+    """Returns the number of live neighbors of every cell of a block, without its halo."""
+    height, width = block.shape[0] - 2, block.shape[1] - 2
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            if dx == 1 and dy == 1:
+                continue  # Skip the current cell
+            counts += block[dy:dy + height, dx:dx + width]
+    return counts
+
+
+def next_age(alive, age):
+    """
+    Computes the ages of the cells in the next generation.
+
+    Args:
+        alive (numpy.ndarray): The matrix of the cells alive in the next generation.
+        age (numpy.ndarray): The matrix of cell ages in the current generation.
+
+    Returns:
+        numpy.ndarray: The new age matrix, where alive cells get one generation older
+        (saturating at AGE_MAX) and dead cells are reset to 0.
+    """
+    return np.where(alive, age + (age < AGE_MAX), 0).astype(age.dtype)
+
+
+def count_live_neighbors(state, x, y, topology=DEFAULT_TOPOLOGY):
+    """
+    Counts the number of live neighbors for a single cell.
+
+    Args:
+        state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+        x (int): The x-coordinate of the cell.
+        y (int): The y-coordinate of the cell.
+        topology (str): The topology of the edges of the board (default dead cells outside).
+
+    Returns:
+        int: The number of live neighbors.
+    """
+    return int(halo_block(state, y, y + 1, x, x + 1, topology).sum()) - int(state[y, x])
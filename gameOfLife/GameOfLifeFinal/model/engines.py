@@ -0,0 +1,42 @@
+from GameOfLifeFinal.model.bitpacked import BitPackedEngine
+from GameOfLifeFinal.model.distributed import DistributedEngine
+from GameOfLifeFinal.model.engine import ClassicEngine, Engine, NumpyEngine
+from GameOfLifeFinal.model.hashlife import HashLifeEngine
+from GameOfLifeFinal.model.parallel import ParallelEngine
+from GameOfLifeFinal.model.tiled import TiledEngine
+from GameOfLifeFinal.model.unbounded import UnboundedEngine
+
+# Available engines by name
+ENGINES = {
+    NumpyEngine.name: NumpyEngine,
+    TiledEngine.name: TiledEngine,
+    BitPackedEngine.name: BitPackedEngine,
+    ParallelEngine.name: ParallelEngine,
+    DistributedEngine.name: DistributedEngine,
+    HashLifeEngine.name: HashLifeEngine,
+    UnboundedEngine.name: UnboundedEngine,
+    ClassicEngine.name: ClassicEngine,
+}
+
+# Engine used when none is specified
+DEFAULT_ENGINE = NumpyEngine.name
+
+
+def create_engine(engine=DEFAULT_ENGINE):
+    """
+    Creates a stepping engine.
+
+    Args:
+        engine (str or Engine): The name of the engine or an engine instance.
+
+    Returns:
+        Engine: The engine instance.
+
+    Raises:
+        ValueError: If the name does not match any available engine.
+    """
+    if isinstance(engine, Engine):
+        return engine
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', available engines: {', '.join(ENGINES)}")
+    return ENGINES[engine]()
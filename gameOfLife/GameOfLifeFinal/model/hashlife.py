@@ -0,0 +1,661 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_MAX, STATE_DTYPE, Engine
+
+
+class Node:
+    """
+    This class represents a square region of the plane in the HashLife quadtree.
+
+    Nodes are canonical: two regions with the same content are always the same Node instance,
+    so they can be compared and hashed by identity. Besides the states of the cells, nodes can hold
+    a count for every cell (such as the length of a run of generations), whose leaves hold the count
+    as their population: the leaves of counts 0 and 1 are the dead and alive leaves.
+
+    Args:
+        level (int): The level of the node, the side of the region is 2 ** level.
+        nw (Node): The north-west quadrant (None for leaves).
+        ne (Node): The north-east quadrant (None for leaves).
+        sw (Node): The south-west quadrant (None for leaves).
+        se (Node): The south-east quadrant (None for leaves).
+        population (int): The number of live cells in the region (the sum of the counts of its cells).
+
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        """
+        Initializes a new instance of Node.
+        """
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+# The two leaves of every quadtree (a single dead or alive cell)
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+# The quadrants of the nine overlapping sub-squares of a node making up each quadrant of its central half
+_QUADRANTS = ((0, 1, 3, 4), (1, 2, 4, 5), (3, 4, 6, 7), (4, 5, 7, 8))
+
+
+class HashLife:
+    """
+    This class represents a HashLife universe, an unbounded plane stored as a memoized quadtree.
+
+    Every distinct region is stored once in a table of canonical nodes, and the future of every region
+    is memoized, so regular patterns can be advanced by huge powers of two in near-constant time.
+    How long the cells stay alive during a jump is memoized the same way, as quadtrees of the cells
+    alive through the whole jump and of the length of the last run of the other cells.
+
+    Args:
+        max_nodes (int): The number of canonical nodes above which unreachable nodes are collected,
+            checked whenever a node is created so that long jumps are bounded too.
+
+    Attributes:
+        _root (Node): The root node of the quadtree.
+        _origin_x (int): The x-coordinate of the north-west corner of the root.
+        _origin_y (int): The y-coordinate of the north-west corner of the root.
+        _generation (int): The number of generations computed since the creation of the universe.
+        _nodes (dict): The table of canonical nodes by their four quadrants.
+        _results (dict): The memoized futures of the nodes by (node, log2 of the generations).
+        _runs (dict): The memoized runs of alive cells of the nodes by (node, log2 of the generations).
+        _combined (dict): The memoized results of the operations combining nodes, by operation and nodes.
+        _leaves (dict): The canonical leaf of every count.
+        _empty (list): The canonical empty node of every level.
+        _collect_at (int): The number of canonical nodes above which the next collection happens.
+
+    """
+
+    def __init__(self, max_nodes=1_000_000):
+        """
+        Initializes a new instance of HashLife.
+        """
+        self.max_nodes = max_nodes
+        self._collect_at = max_nodes
+        self._nodes = {}
+        self._results = {}
+        self._runs = {}
+        self._combined = {}
+        self._leaves = {0: DEAD, 1: ALIVE}
+        self._empty = [DEAD]
+        # Lookup counters of the node table and of the result cache
+        self._node_hits = 0
+        self._node_misses = 0
+        self._result_hits = 0
+        self._result_misses = 0
+        self._collections = 0
+        self._root = self._empty_node(3)
+        self._origin_x = 0
+        self._origin_y = 0
+        self._generation = 0
+
+    @property
+    def generation(self):
+        """Returns the number of generations computed since the creation of the universe."""
+        return self._generation
+
+    @property
+    def population(self):
+        """Returns the number of live cells of the universe."""
+        return self._root.population
+
+    def set_cells(self, xs, ys):
+        """
+        Replaces the content of the universe with the given live cells.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates of the live cells.
+            ys (numpy.ndarray): The y-coordinates of the live cells.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if len(xs) == 0:
+            self._root = self._empty_node(3)
+            self._origin_x = self._origin_y = 0
+            return
+
+        # Smallest power of two square containing all the cells
+        self._origin_x = int(xs.min())
+        self._origin_y = int(ys.min())
+        side = max(int(xs.max()) - self._origin_x, int(ys.max()) - self._origin_y) + 1
+        level = max(3, (side - 1).bit_length())
+
+        # Build the tree bottom-up, keeping only the non empty nodes of every level
+        nodes = {(x, y): ALIVE for x, y in zip((xs - self._origin_x).tolist(), (ys - self._origin_y).tolist())}
+        for child_level in range(level):
+            empty = self._empty_node(child_level)
+            parents = {(x >> 1, y >> 1) for (x, y) in nodes}
+            nodes = {
+                (px, py): self._join(
+                    nodes.get((2 * px, 2 * py), empty), nodes.get((2 * px + 1, 2 * py), empty),
+                    nodes.get((2 * px, 2 * py + 1), empty), nodes.get((2 * px + 1, 2 * py + 1), empty))
+                for (px, py) in parents
+            }
+        self._root = nodes[(0, 0)]
+
+    def write_cells(self, xs, ys, states):
+        """
+        Sets the state of some cells of the universe, keeping the other cells.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates of the cells.
+            ys (numpy.ndarray): The y-coordinates of the cells.
+            states (numpy.ndarray): The new states of the cells (0 for dead, 1 for alive).
+        """
+        for x, y, state in zip(np.asarray(xs).tolist(), np.asarray(ys).tolist(), np.asarray(states).tolist()):
+            # The root is padded until it contains the cell
+            while not (0 <= x - self._origin_x < 1 << self._root.level
+                       and 0 <= y - self._origin_y < 1 << self._root.level):
+                self._pad()
+            self._root = self._set_cell(self._root, x - self._origin_x, y - self._origin_y, ALIVE if state else DEAD)
+
+    def get_cells(self, x0, y0, width, height, node=None):
+        """
+        Gets the live cells of a rectangular window of the universe.
+
+        Args:
+            x0 (int): The x-coordinate of the north-west corner of the window.
+            y0 (int): The y-coordinate of the north-west corner of the window.
+            width (int): The width of the window.
+            height (int): The height of the window.
+            node (Node): A node with the same north-west corner as the root to read instead of the root.
+
+        Returns:
+            tuple: The x and y coordinates of the live cells, relative to the window.
+        """
+        xs, ys, _ = self.get_counts(x0, y0, width, height, node)
+        return xs, ys
+
+    def get_counts(self, x0, y0, width, height, node):
+        """
+        Gets the cells of a rectangular window of a node holding counts whose count is not 0.
+
+        Args:
+            x0 (int): The x-coordinate of the north-west corner of the window.
+            y0 (int): The y-coordinate of the north-west corner of the window.
+            width (int): The width of the window.
+            height (int): The height of the window.
+            node (Node): A node with the same north-west corner as the root, None for the root.
+
+        Returns:
+            tuple: The x and y coordinates of the cells, relative to the window, and their counts.
+        """
+        xs = []
+        ys = []
+        counts = []
+        # Depth first visit skipping empty nodes and nodes outside the window
+        stack = [(self._root if node is None else node, self._origin_x - x0, self._origin_y - y0)]
+        while stack:
+            node, x, y = stack.pop()
+            side = 1 << node.level
+            if node.population == 0 or x >= width or y >= height or x + side <= 0 or y + side <= 0:
+                continue
+            if node.level == 0:
+                xs.append(x)
+                ys.append(y)
+                counts.append(node.population)
+                continue
+            half = side >> 1
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+        return np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+    def advance(self, generations, on_jump=None):
+        """
+        Advances the universe by a number of generations.
+
+        Args:
+            generations (int): The number of generations to compute.
+            on_jump (callable): Called after every jump with the number of generations of the jump,
+                the node of the cells alive through the whole jump and the node of the counts of
+                generations the other alive cells have been alive in a row at the end of the jump.
+                The nodes have the same north-west corner as the root.
+
+        The generations are decomposed in powers of two, and every power of two is computed
+        with a single memoized jump of the root node.
+        """
+        j = 0
+        while generations > 0:
+            if generations & 1:
+                self._jump(j, on_jump)
+            generations >>= 1
+            j += 1
+
+    def stats(self):
+        """
+        Returns the statistics of the node table and of the result cache.
+
+        Returns:
+            dict: The node count, the number of memoized results, the hit rates and the number of collections.
+        """
+        node_lookups = self._node_hits + self._node_misses
+        result_lookups = self._result_hits + self._result_misses
+        return {
+            "nodes": len(self._nodes),
+            "results": len(self._results) + len(self._runs),
+            "node_hit_rate": self._node_hits / node_lookups if node_lookups else 0.0,
+            "result_hit_rate": self._result_hits / result_lookups if result_lookups else 0.0,
+            "collections": self._collections,
+        }
+
+    def collect(self):
+        """
+        Removes the nodes not reachable from the root and the results referring to them.
+
+        The nodes still used by a jump in progress stay valid but are not canonical anymore, so
+        their results are computed again if needed.
+        """
+        reachable = set()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or node in reachable:
+                continue
+            reachable.add(node)
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+        # The empty nodes are kept, they are needed by every padding
+        reachable.update(self._empty)
+        self._nodes = {key: node for key, node in self._nodes.items() if node in reachable}
+        self._results = {
+            key: result for key, result in self._results.items()
+            if key[0] in reachable and result in reachable
+        }
+        self._runs = {}
+        self._combined = {}
+        self._leaves = {0: DEAD, 1: ALIVE}
+        self._collections += 1
+        # Collecting again before the table doubles would be quadratic if most nodes are reachable
+        self._collect_at = max(self.max_nodes, 2 * len(self._nodes))
+
+    def _jump(self, j, on_jump=None):
+        """
+        Advances the universe by 2 ** j generations.
+
+        Args:
+            j (int): The log2 of the number of generations.
+            on_jump (callable): Called after the jump, see advance.
+        """
+        # The root is padded until it can hold the pattern after the jump: the live cells must lie in
+        # the central quarter and the jump must not exceed 2 ** (level - 3) generations
+        while self._root.level < j + 3 or not self._is_padded(self._root):
+            self._pad()
+        quarter = 1 << (self._root.level - 2)
+        runs = self._alive_runs(self._root, j) if on_jump is not None else None
+        self._root = self._successor(self._root, j)
+        self._origin_x += quarter
+        self._origin_y += quarter
+        self._generation += 1 << j
+        if on_jump is not None:
+            on_jump(1 << j, *runs)
+
+    def _pad(self):
+        """Doubles the side of the root, keeping its content at the center."""
+        root = self._root
+        empty = self._empty_node(root.level - 1)
+        self._root = self._join(
+            self._join(empty, empty, empty, root.nw),
+            self._join(empty, empty, root.ne, empty),
+            self._join(empty, root.sw, empty, empty),
+            self._join(root.se, empty, empty, empty))
+        half = 1 << (root.level - 1)
+        self._origin_x -= half
+        self._origin_y -= half
+
+    @staticmethod
+    def _is_padded(node):
+        """Returns True if all the live cells of the node lie in its central quarter."""
+        return (node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    def _empty_node(self, level):
+        """Returns the canonical empty node of a level."""
+        while len(self._empty) <= level:
+            smaller = self._empty[-1]
+            self._empty.append(self._join(smaller, smaller, smaller, smaller))
+        return self._empty[level]
+
+    def _join(self, nw, ne, sw, se):
+        """Returns the canonical node with the given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is not None:
+            self._node_hits += 1
+            return node
+        self._node_misses += 1
+        if len(self._nodes) >= self._collect_at:
+            self.collect()
+        node = Node(nw.level + 1, nw, ne, sw, se, nw.population + ne.population + sw.population + se.population)
+        self._nodes[key] = node
+        return node
+
+    def _set_cell(self, node, x, y, leaf):
+        """Returns the node with the cell (x, y) relative to its north-west corner replaced by a leaf."""
+        if node.level == 0:
+            return leaf
+        half = 1 << (node.level - 1)
+        quadrants = [node.nw, node.ne, node.sw, node.se]
+        index = 2 * (y >= half) + (x >= half)
+        quadrants[index] = self._set_cell(quadrants[index], x % half, y % half, leaf)
+        return self._join(*quadrants)
+
+    def _leaf(self, count):
+        """Returns the canonical leaf of a count."""
+        leaf = self._leaves.get(count)
+        if leaf is None:
+            leaf = self._leaves[count] = Node(0, None, None, None, None, count)
+        return leaf
+
+    def _combine(self, operation, a, b):
+        """
+        Combines the cells of two nodes of the same level with a boolean operation.
+
+        Args:
+            operation (str): "and" or "and not" (the cells alive in a and dead in b).
+            a (Node): The first node.
+            b (Node): The second node.
+
+        Returns:
+            Node: The canonical node of the combined cells.
+        """
+        # Leaves always end up in one of these cases
+        if operation == "and":
+            if a.population == 0 or a is b:
+                return a
+            if b.population == 0:
+                return b
+        else:
+            if a.population == 0 or b.population == 0:
+                return a
+            if a is b:
+                return self._empty_node(a.level)
+        key = (operation, a, b)
+        result = self._combined.get(key)
+        if result is None:
+            result = self._join(self._combine(operation, a.nw, b.nw), self._combine(operation, a.ne, b.ne),
+                                self._combine(operation, a.sw, b.sw), self._combine(operation, a.se, b.se))
+            self._combined[key] = result
+        return result
+
+    def _extend_runs(self, always_second, always_first, first, second, generations):
+        """
+        Combines the runs of alive cells of two consecutive halves of a jump.
+
+        Args:
+            always_second (Node): The cells alive through the whole second half.
+            always_first (Node): The cells alive through the whole first half.
+            first (Node): The counts of the last runs of the other cells alive after the first half.
+            second (Node): The counts of the last runs of the other cells alive after the second half.
+            generations (int): The number of generations of a half.
+
+        Returns:
+            Node: The counts of the last runs of the cells alive after the jump but not through all of it.
+        """
+        if always_second.population == 0:
+            return second
+        if always_second.level == 0:
+            # Cells alive through the second half add its generations to their run of the first half
+            return self._leaf(0 if always_first.population else first.population + generations)
+        key = ("runs", always_second, always_first, first, second, generations)
+        result = self._combined.get(key)
+        if result is None:
+            result = self._join(
+                self._extend_runs(always_second.nw, always_first.nw, first.nw, second.nw, generations),
+                self._extend_runs(always_second.ne, always_first.ne, first.ne, second.ne, generations),
+                self._extend_runs(always_second.sw, always_first.sw, first.sw, second.sw, generations),
+                self._extend_runs(always_second.se, always_first.se, first.se, second.se, generations))
+            self._combined[key] = result
+        return result
+
+    def _center(self, node):
+        """Returns the central half of a node."""
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _successor(self, node, j):
+        """
+        Computes the central half of a node after 2 ** j generations.
+
+        Args:
+            node (Node): A node of level 2 or more.
+            j (int): The log2 of the number of generations, at most level - 2.
+
+        Returns:
+            Node: The central half of the node advanced by 2 ** j generations.
+        """
+        j = min(j, node.level - 2)
+        if node.population == 0:
+            return self._empty_node(node.level - 1)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            self._result_hits += 1
+            return result
+        self._result_misses += 1
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            subs = self._subs(node)
+            if j == node.level - 2:
+                # Full speed jump: both halves advance by 2 ** (level - 3) generations
+                j -= 1
+                c = [self._successor(sub, j) for sub in subs]
+            else:
+                # Shorter jump: the sub-squares are only cropped, the second half does all the work
+                c = [self._center(sub) for sub in subs]
+            result = self._join(*(self._successor(self._join(*(c[i] for i in quadrant)), j) for quadrant in _QUADRANTS))
+
+        self._results[key] = result
+        return result
+
+    def _alive_runs(self, node, j):
+        """
+        Computes how long the cells of the central half of a node stay alive over 2 ** j generations.
+
+        Args:
+            node (Node): A node of level 2 or more.
+            j (int): The log2 of the number of generations, at most level - 2.
+
+        Returns:
+            tuple: The node of the cells alive in every generation of the jump, the first one included,
+                and the node of the counts of generations the other cells alive after the jump have
+                been alive in a row (0 for the other cells).
+        """
+        j = min(j, node.level - 2)
+        if node.population == 0:
+            empty = self._empty_node(node.level - 1)
+            return empty, empty
+        key = (node, j)
+        result = self._runs.get(key)
+        if result is not None:
+            self._result_hits += 1
+            return result
+        self._result_misses += 1
+
+        if node.level == 2:
+            center, after = self._center(node), self._life_4x4(node)
+            result = self._combine("and", after, center), self._combine("and not", after, center)
+        else:
+            subs = self._subs(node)
+            if j == node.level - 2:
+                # Full speed jump: the runs of the second half extend those of the first half
+                j -= 1
+                firsts = [self._alive_runs(sub, j) for sub in subs]
+                c = [self._successor(sub, j) for sub in subs]
+                quadrants = []
+                for quadrant in _QUADRANTS:
+                    always_second, second = self._alive_runs(self._join(*(c[i] for i in quadrant)), j)
+                    always_first = self._center(self._join(*(firsts[i][0] for i in quadrant)))
+                    first = self._center(self._join(*(firsts[i][1] for i in quadrant)))
+                    quadrants.append((self._combine("and", always_second, always_first),
+                                      self._extend_runs(always_second, always_first, first, second, 1 << j)))
+            else:
+                c = [self._center(sub) for sub in subs]
+                quadrants = [self._alive_runs(self._join(*(c[i] for i in quadrant)), j) for quadrant in _QUADRANTS]
+            result = (self._join(*(always for always, _ in quadrants)), self._join(*(runs for _, runs in quadrants)))
+
+        self._runs[key] = result
+        return result
+
+    def _subs(self, node):
+        """Returns the nine overlapping sub-squares of half the side of a node of level 3 or more."""
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        return [
+            nw, self._join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+            self._join(nw.sw, nw.se, sw.nw, sw.ne), self._join(nw.se, ne.sw, sw.ne, se.nw),
+            self._join(ne.sw, ne.se, se.nw, se.ne),
+            sw, self._join(sw.ne, se.nw, sw.se, se.sw), se,
+        ]
+
+    def _life_4x4(self, node):
+        """Computes the central 2x2 cells of a 4x4 node after one generation."""
+        rows = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = [[leaf.population for leaf in row] for row in rows]
+        center = []
+        for y in (1, 2):
+            for x in (1, 2):
+                live_neighbors = sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+                # Apply the rules of Conway's Game of Life
+                alive = live_neighbors == 3 or (cells[y][x] == 1 and live_neighbors == 2)
+                center.append(ALIVE if alive else DEAD)
+        return self._join(*center)
+
+
+class HashLifeEngine(Engine):
+    """
+    This class represents the HashLife engine.
+
+    The board is a window onto the unbounded HashLife plane: cells leaving the board keep evolving
+    outside of it and come back if they return. The universe is kept between calls, and the edits
+    of the board are written back to it before the next jump, so the result does not depend on how
+    the generations are split between calls. Setting a new board replaces the whole universe with it.
+    The caches of the universe are kept too, so repeated runs reuse the memoized results.
+
+    Cycles are detected on the window only, so they may not be cycles of the whole plane.
+
+    Args:
+        max_nodes (int): The number of canonical nodes above which unreachable nodes are collected.
+
+    Attributes:
+        _universe (HashLife): The universe of the cells.
+        _current (numpy.ndarray): The state matrix of the board in sync with the universe, None if none.
+        _edited (bool): Whether cells of the board were edited since the last jump.
+
+    """
+
+    name = "hashlife"
+
+    def __init__(self, max_nodes=1_000_000):
+        """
+        Initializes a new instance of HashLifeEngine.
+        """
+        self._universe = HashLife(max_nodes)
+        self._current = None
+        self._edited = False
+
+    @property
+    def universe(self):
+        """Returns the HashLife universe of the engine."""
+        return self._universe
+
+    def stats(self):
+        """Returns the statistics of the node table and of the result cache."""
+        return self._universe.stats()
+
+    def invalidate(self, x=None, y=None):
+        """
+        Marks a cell, or the whole board, as edited outside the engine.
+
+        Args:
+            x (int): The x-coordinate of the edited cell, None for the whole board.
+            y (int): The y-coordinate of the edited cell, None for the whole board.
+        """
+        self._edited = True
+
+    def report(self):
+        """Returns the population of the universe and the statistics of its node table and result cache."""
+        stats = self._universe.stats()
+        return (f"Universe Population: {self._universe.population} - Nodes: {stats['nodes']} - "
+                f"Results: {stats['results']} - Node Hits: {stats['node_hit_rate']:.1%} - "
+                f"Result Hits: {stats['result_hit_rate']:.1%} - Collections: {stats['collections']}")
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        return self.advance(state, age, 1)
+
+    def advance(self, state, age, generations):
+        """
+        Computes the board after a number of generations with memoized power of two jumps.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+
+        After every jump, the cells of the board alive through the whole jump get older by its number
+        of generations and the other alive cells get the length of their last run in it, so the ages
+        are the same as when stepping one generation at a time.
+        """
+        self._sync(state)
+        shape = state.shape
+        new_state = state
+        new_age = age.astype(np.int64)
+
+        def on_jump(jump_generations, always_alive, runs):
+            nonlocal new_state, new_age
+            new_state = self._window(None, shape)
+            older = np.minimum(new_age + jump_generations, AGE_MAX)
+            new_age = np.where(self._window(always_alive, shape) == 1, older,
+                               np.minimum(self._window(runs, shape), AGE_MAX))
+
+        self._universe.advance(generations, on_jump)
+        new_state = new_state.copy() if new_state is state else new_state
+        self._current = new_state
+        return new_state, new_age.astype(age.dtype)
+
+    def _sync(self, state):
+        """Writes the board to the universe: the whole universe if the board was replaced, else its edits."""
+        if state is not self._current:
+            ys, xs = np.nonzero(state)
+            self._universe.set_cells(xs, ys)
+        elif self._edited:
+            ys, xs = np.nonzero(self._window(None, state.shape) != state)
+            self._universe.write_cells(xs, ys, state[ys, xs])
+        self._current = state
+        self._edited = False
+
+    def _window(self, node, shape):
+        """
+        Returns the cells of the board in the universe, or the counts of a node with the same corner as its root.
+        """
+        height, width = shape
+        xs, ys, counts = self._universe.get_counts(0, 0, width, height, node)
+        cells = np.zeros(shape, dtype=STATE_DTYPE if node is None else np.int64)
+        cells[ys, xs] = counts
+        return cells
@@ -1,22 +1,56 @@
-from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty
+from GameOfLifeFinal.model.timing import timings
 
 
-class Observable(QObject):
+class Observable:
+    """
+    This class represents a value that notifies its observers when it changes.
 
-    valueChanged = pyqtSignal(object)
+    It does not depend on Qt: the observers are plain callables, called in the thread setting the value.
+    The Qt views wrap it in a QtObservable (qt_observer.py) to receive the changes as a Qt signal.
+
+    Args:
+        val: The initial value.
+
+    """
 
     def __init__(self, val):
-        super().__init__()
         self._value = val
+        self._observers = []
+        self._blocked = False
 
     def register(self, slot):
-        self.valueChanged.connect(slot)
+        self._observers.append(slot)
+
+    def unregister(self, slot):
+        self._observers.remove(slot)
+
+    def block(self, blocked):
+        """
+        Blocks or unblocks the notifications of the changes.
+
+        Args:
+            blocked (bool): Whether the changes should not be notified.
+
+        Returns:
+            bool: Whether the notifications were blocked before.
+        """
+        previous, self._blocked = self._blocked, blocked
+        return previous
+
+    @property
+    def notifying(self):
+        """Returns whether a change of the value would be notified to any observer."""
+        return bool(self._observers) and not self._blocked
 
-    @pyqtProperty(object, notify=valueChanged)
+    @property
     def value(self):
         return self._value
 
     @value.setter
     def value(self, new_val):
         self._value = new_val
-        self.valueChanged.emit(self.value)
+        if not self._blocked:
+            # Includes the observers, such as the views, called in this thread
+            with timings.measure("emit"):
+                for slot in list(self._observers):
+                    slot(self._value)
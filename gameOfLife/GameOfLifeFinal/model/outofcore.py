@@ -0,0 +1,609 @@
+import collections
+import struct
+
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, DEFAULT_TOPOLOGY, STATE_DTYPE, neighbor_counts, next_age
+from GameOfLifeFinal.model.stats import AGE_BUCKETS, BoardStats
+from GameOfLifeFinal.model.timing import timings
+
+# Identifier at the beginning of every tile file
+MAGIC = b"GOLTILE\x00"
+# Version of the format written, files of later versions are refused
+VERSION = 1
+# Header: magic, version, front buffer, tile size, width, height and generation
+HEADER = struct.Struct("<8sHHqqqq")
+# Size of the header, padded so that the tile flags start aligned
+HEADER_SIZE = 64
+# Default side of the tiles, in cells
+DEFAULT_TILE_SIZE = 256
+# Default number of tiles kept in memory (about 200 MB with the default tile size)
+DEFAULT_CACHE_TILES = 1024
+# Data type of the ages in the file
+FILE_AGE_DTYPE = np.dtype("<u2")
+
+
+class TileCache:
+    """
+    This class represents the tiles of an out-of-core board resident in memory.
+
+    The most recently used tiles are kept, up to a capacity. Tiles are read from the file on a
+    miss, and written back when evicted or flushed only if they were modified.
+
+    Args:
+        read (callable): Reads the state and age matrices of a tile from the file, given its key.
+        write (callable): Writes the state and age matrices of a tile to the file, given its key.
+        capacity (int): The number of tiles kept in memory.
+
+    Attributes:
+        capacity (int): The number of tiles kept in memory.
+        hits (int): The number of tiles found in memory.
+        misses (int): The number of tiles read from the file.
+        _tiles (collections.OrderedDict): The [state, age, dirty] entry of each resident tile, least recently
+            used first.
+
+    """
+
+    def __init__(self, read, write, capacity=DEFAULT_CACHE_TILES):
+        """
+        Initializes a new instance of TileCache.
+        """
+        self._read = read
+        self._write = write
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._tiles = collections.OrderedDict()
+
+    def get(self, key):
+        """
+        Returns a tile, reading it from the file if not resident.
+
+        Args:
+            key (tuple): The buffer, row and column of the tile.
+
+        Returns:
+            list: The [state, age, dirty] entry of the tile, to mark it dirty when modified.
+        """
+        entry = self._tiles.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return entry
+        self.misses += 1
+        state, age = self._read(key)
+        return self._insert(key, [state, age, False])
+
+    def put(self, key, state, age):
+        """
+        Replaces the content of a tile, without reading it, and marks it dirty.
+
+        Args:
+            key (tuple): The buffer, row and column of the tile.
+            state (numpy.ndarray): The state matrix of the tile.
+            age (numpy.ndarray): The age matrix of the tile.
+        """
+        self._tiles.pop(key, None)
+        self._insert(key, [state, age, True])
+
+    def discard(self, key):
+        """Drops a tile from memory without writing it back, when its content is not needed anymore."""
+        self._tiles.pop(key, None)
+
+    def discard_buffer(self, buffer):
+        """Drops all the tiles of a buffer from memory without writing them back."""
+        for key in [key for key in self._tiles if key[0] == buffer]:
+            del self._tiles[key]
+
+    def flush(self):
+        """Writes back all the dirty tiles, keeping them in memory."""
+        for key, entry in self._tiles.items():
+            if entry[2]:
+                self._write(key, entry[0], entry[1])
+                entry[2] = False
+
+    def _insert(self, key, entry):
+        """Makes a tile resident, evicting the least recently used ones beyond the capacity."""
+        self._tiles[key] = entry
+        while len(self._tiles) > self.capacity:
+            evicted, (state, age, dirty) = self._tiles.popitem(last=False)
+            if dirty:
+                self._write(evicted, state, age)
+        return entry
+
+
+class TiledRows:
+    """
+    This class represents a read-only view over the rows of the state or age matrix of an
+    out-of-core board, read tile by tile when sliced (e.g. to save the board by bands of rows).
+
+    Args:
+        board (OutOfCoreBoard): The board.
+        index (int): 0 for the state matrix, 1 for the age matrix.
+
+    Attributes:
+        shape (tuple): The shape of the matrix.
+        dtype (numpy.dtype): The data type of the matrix.
+
+    """
+
+    def __init__(self, board, index):
+        """
+        Initializes a new instance of TiledRows.
+        """
+        self._board = board
+        self._index = index
+        self.shape = (board.height, board.width)
+        self.dtype = np.dtype(AGE_DTYPE if index else STATE_DTYPE)
+
+    def __getitem__(self, rows):
+        """Returns a band of rows, given as a slice."""
+        y0, y1, _ = rows.indices(self.shape[0])
+        return self._board.region(0, y0, self.shape[1], y1)[self._index]
+
+
+class OutOfCoreBoard:
+    """
+    This class represents a finite board stored in a file, for boards larger than the memory.
+
+    The board is split into square tiles, stored contiguously in a memory-mapped file holding two
+    buffers of tiles: the current generation and the previous one, overwritten by the next one.
+    Only the tiles of an LRU cache are resident in memory, and only modified tiles are written back.
+
+    A generation streams through the active tiles row by row: each tile is computed from its
+    cells and a halo of one cell read from the edges of its neighbor tiles, so with a cache
+    holding three rows of tiles every tile is read once per generation. Tiles whose neighborhood
+    holds no live cells are not read nor computed: a flag per tile marks the tiles holding live
+    cells, the other ones being all dead (and with ages 0) whatever the file holds.
+
+    The statistics of each generation (population, births, deaths, bounding box and age
+    histogram) are computed during the pass, and the throughput of the file access is counted.
+
+    Args:
+        path (str): The path of the tile file, created by OutOfCoreBoard.create.
+        cache_tiles (int): The number of tiles kept in memory.
+
+    Attributes:
+        path (str): The path of the tile file.
+        tile_size (int): The side of the tiles, in cells.
+        cache (TileCache): The tiles resident in memory.
+        computed_tiles (int): The number of tiles computed in the last generation.
+        total_tiles (int): The number of tiles of the board.
+        bytes_read (int): The number of bytes read from the file.
+        bytes_written (int): The number of bytes written to the file.
+        _front (int): The buffer holding the current generation.
+        _populated (numpy.ndarray): The flags of the tiles holding live cells, for each buffer.
+
+    Raises:
+        ValueError: If the file is not a tile file or of a later version.
+
+    """
+
+    def __init__(self, path, cache_tiles=DEFAULT_CACHE_TILES):
+        """
+        Initializes a new instance of OutOfCoreBoard.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+            raise ValueError(f"{path} is not a tile file")
+        fields = HEADER.unpack_from(header)
+        version, self._front, self.tile_size, self._width, self._height, self._generation = fields[1:]
+        if version > VERSION:
+            raise ValueError(f"{path} is a tile file of version {version}, only versions up to {VERSION} are supported")
+
+        size = self.tile_size
+        self._tiles_y, self._tiles_x = -(-self._height // size), -(-self._width // size)
+        self.total_tiles = self._tiles_y * self._tiles_x
+        flags_shape = (2, self._tiles_y, self._tiles_x)
+        tiles_shape = flags_shape + (size, size)
+        state_offset = _align(HEADER_SIZE + 2 * self.total_tiles)
+        age_offset = state_offset + 2 * self.total_tiles * size * size
+        self._flags = np.memmap(path, np.uint8, "r+", HEADER_SIZE, flags_shape)
+        self._states = np.memmap(path, STATE_DTYPE, "r+", state_offset, tiles_shape)
+        self._ages = np.memmap(path, FILE_AGE_DTYPE, "r+", age_offset, tiles_shape)
+        self._populated = self._flags.astype(bool)
+
+        self.cache = TileCache(self._read_tile, self._write_tile, cache_tiles)
+        self.computed_tiles = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._stats = None
+
+    @classmethod
+    def create(cls, path, width, height, tile_size=DEFAULT_TILE_SIZE, cache_tiles=DEFAULT_CACHE_TILES, generation=0):
+        """
+        Creates an empty board in a new tile file.
+
+        The file is created sparse where the file system allows it: disk space is only used by
+        the tiles written.
+
+        Args:
+            path (str): The path of the tile file.
+            width (int): The width of the board.
+            height (int): The height of the board.
+            tile_size (int): The side of the tiles, in cells.
+            cache_tiles (int): The number of tiles kept in memory.
+            generation (int): The generation of the board.
+
+        Returns:
+            OutOfCoreBoard: The board, with all cells dead.
+        """
+        tiles = -(-height // tile_size) * -(-width // tile_size)
+        state_offset = _align(HEADER_SIZE + 2 * tiles)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, tile_size, width, height, generation).ljust(HEADER_SIZE, b"\0"))
+            f.truncate(state_offset + 2 * tiles * tile_size * tile_size * (1 + FILE_AGE_DTYPE.itemsize))
+        return cls(path, cache_tiles)
+
+    @classmethod
+    def from_snapshot(cls, path, snapshot, tile_size=DEFAULT_TILE_SIZE, cache_tiles=DEFAULT_CACHE_TILES):
+        """
+        Creates a board in a new tile file from a snapshot, read one row of tiles at a time.
+
+        Args:
+            path (str): The path of the tile file.
+            snapshot (Snapshot): The snapshot.
+            tile_size (int): The side of the tiles, in cells.
+            cache_tiles (int): The number of tiles kept in memory.
+
+        Returns:
+            OutOfCoreBoard: The board saved in the snapshot.
+        """
+        game_board = cls.create(path, snapshot.width, snapshot.height, tile_size, cache_tiles, snapshot.generation)
+        for y in range(0, snapshot.height, tile_size):
+            age = snapshot.age[y:y + tile_size] if snapshot.has_age else None
+            game_board.write_rows(y, snapshot.rows(y, y + tile_size), age)
+        return game_board
+
+    @property
+    def width(self):
+        """Returns the width of the board."""
+        return self._width
+
+    @property
+    def height(self):
+        """Returns the height of the board."""
+        return self._height
+
+    @property
+    def generation(self):
+        """Returns the number of generations computed since the initial state."""
+        return self._generation
+
+    @property
+    def state(self):
+        """Returns a read-only view over the rows of the state matrix, read when sliced."""
+        return TiledRows(self, 0)
+
+    @property
+    def age(self):
+        """Returns a read-only view over the rows of the age matrix, read when sliced."""
+        return TiledRows(self, 1)
+
+    @property
+    def stats(self):
+        """Returns the population statistics of the current generation, reading the whole board after an edit."""
+        if self._stats is None:
+            totals = _StatsAccumulator(self.tile_size)
+            for ty, tx in np.argwhere(self._populated[self._front]).tolist():
+                state, age, _ = self.cache.get((self._front, ty, tx))
+                totals.add(ty, tx, state.view(bool), age)
+            self._stats = totals.stats(self._generation, 0, 0)
+        return self._stats
+
+    @property
+    def cycle(self):
+        """Returns None, out-of-core boards do not detect cycles."""
+        return None
+
+    @property
+    def topology(self):
+        """Returns the topology of the edges of the board, out-of-core boards have dead edges."""
+        return DEFAULT_TOPOLOGY
+
+    def detect_cycles(self, enabled=True):
+        """
+        Enables or disables the detection of cycles.
+
+        Raises:
+            ValueError: If enabled, out-of-core boards do not detect cycles.
+        """
+        if enabled:
+            raise ValueError("Out-of-core boards do not detect cycles")
+
+    def region(self, x0, y0, x1, y1):
+        """
+        Reads a rectangular region of the board.
+
+        Args:
+            x0 (int): The first column of the region.
+            y0 (int): The first row of the region.
+            x1 (int): The column after the last column of the region.
+            y1 (int): The row after the last row of the region.
+
+        Returns:
+            tuple: The state matrix and the age matrix of the region.
+        """
+        size = self.tile_size
+        state = np.zeros((y1 - y0, x1 - x0), dtype=STATE_DTYPE)
+        age = np.zeros((y1 - y0, x1 - x0), dtype=AGE_DTYPE)
+        for ty in range(y0 // size, -(-y1 // size)):
+            for tx in range(x0 // size, -(-x1 // size)):
+                if not self._populated[self._front, ty, tx]:
+                    continue
+                tile_state, tile_age, _ = self.cache.get((self._front, ty, tx))
+                # Overlap of the tile and the region, in board coordinates
+                top, bottom = max(y0, ty * size), min(y1, (ty + 1) * size)
+                left, right = max(x0, tx * size), min(x1, (tx + 1) * size)
+                tile_rows = slice(top - ty * size, bottom - ty * size)
+                tile_columns = slice(left - tx * size, right - tx * size)
+                state[top - y0:bottom - y0, left - x0:right - x0] = tile_state[tile_rows, tile_columns]
+                age[top - y0:bottom - y0, left - x0:right - x0] = tile_age[tile_rows, tile_columns]
+        return state, age
+
+    def write_rows(self, y0, state, age=None):
+        """
+        Writes a band of whole rows of the board, starting at a row multiple of the tile size.
+
+        Args:
+            y0 (int): The first row of the band.
+            state (numpy.ndarray): The state matrix of the band, at most tile size rows.
+            age (numpy.ndarray): The age matrix of the band, None for all zeros.
+        """
+        size = self.tile_size
+        ty = y0 // size
+        for tx in range(self._tiles_x):
+            tile_state = np.zeros((size, size), dtype=STATE_DTYPE)
+            tile_age = np.zeros((size, size), dtype=AGE_DTYPE)
+            columns = slice(tx * size, (tx + 1) * size)
+            band = state[:, columns]
+            tile_state[:band.shape[0], :band.shape[1]] = band != 0
+            if age is not None:
+                tile_age[:band.shape[0], :band.shape[1]] = age[:, columns]
+            self._set_tile(self._front, ty, tx, tile_state, tile_age)
+        self._stats = None
+
+    def place(self, cells, x, y):
+        """
+        Sets cells of a pattern alive, dropping the ones outside the board.
+
+        Args:
+            cells (numpy.ndarray): The (n, 2) array of [y, x] coordinates of the live cells of the pattern.
+            x (int): The x-coordinate of the top-left corner of the pattern.
+            y (int): The y-coordinate of the top-left corner of the pattern.
+        """
+        ys, xs = cells[:, 0] + y, cells[:, 1] + x
+        inside = (ys >= 0) & (ys < self._height) & (xs >= 0) & (xs < self._width)
+        for cell_y, cell_x in zip(ys[inside].tolist(), xs[inside].tolist()):
+            state, _ = self._editable_tile(cell_x, cell_y)
+            state[cell_y % self.tile_size, cell_x % self.tile_size] = 1
+        self._stats = None
+
+    def toggle_cell(self, x, y):
+        """
+        Toggles the state of a specific cell and sets the age to 1.
+
+        Args:
+            x (int): The x-coordinate of the cell.
+            y (int): The y-coordinate of the cell.
+        """
+        state, age = self._editable_tile(x, y)
+        state[y % self.tile_size, x % self.tile_size] ^= 1
+        age[y % self.tile_size, x % self.tile_size] = 1
+        self._stats = None
+
+    def update(self):
+        """
+        Computes the next generation, streaming through the active tiles row by row.
+        """
+        with timings.measure("update"):
+            size = self.tile_size
+            front, back = self._front, 1 - self._front
+            populated = self._populated[front]
+            # Only the tiles with live cells in their neighborhood are computed, the other ones stay dead
+            padded = np.pad(populated, 1)
+            active = np.zeros_like(populated)
+            for dy in (0, 1, 2):
+                for dx in (0, 1, 2):
+                    active |= padded[dy:dy + self._tiles_y, dx:dx + self._tiles_x]
+            # The back buffer holds the previous generation, replaced by the next one
+            self.cache.discard_buffer(back)
+            next_populated = np.zeros_like(populated)
+            totals = _StatsAccumulator(size)
+            births = deaths = 0
+            self.computed_tiles = 0
+            for ty, tx in np.argwhere(active).tolist():
+                self.computed_tiles += 1
+                block, age = self._halo_block(front, ty, tx)
+                state = block[1:-1, 1:-1]
+                counts = neighbor_counts(block)[1:-1, 1:-1]
+                # Birth with 3 neighbors, survival with 2 or 3 neighbors
+                alive = (counts == 3) | ((state == 1) & (counts == 2))
+                # Cells of the edge tiles beyond the board stay dead
+                alive[self._height - ty * size:, :] = False
+                alive[:, self._width - tx * size:] = False
+                population = totals.add(ty, tx, alive, next_age(alive, age))
+                born = int(np.count_nonzero(alive > state))
+                births += born
+                deaths += int(np.count_nonzero(state)) + born - population
+                if population:
+                    next_populated[ty, tx] = True
+                    self.cache.put((back, ty, tx), alive.astype(STATE_DTYPE), totals.last_age)
+            self._populated[back] = next_populated
+            self._front = back
+            self._generation += 1
+            self._stats = totals.stats(self._generation, births, deaths)
+
+    def advance(self, generations):
+        """
+        Advances the board by a number of generations.
+
+        The births and deaths of the statistics are their totals over the generations, as the
+        net ones would need the previous state of the whole board.
+
+        Args:
+            generations (int): The number of generations to compute.
+        """
+        births = deaths = 0
+        for _ in range(generations):
+            self.update()
+            births += self._stats.births
+            deaths += self._stats.deaths
+        if generations > 1:
+            self._stats.births, self._stats.deaths = births, deaths
+
+    def fast_forward(self, generations):
+        """Advances the board by a number of generations, as advance (cycles are not detected)."""
+        self.advance(generations)
+
+    def report(self):
+        """Returns a description of the tiles computed in the last generation and of the file access."""
+        accesses = self.cache.hits + self.cache.misses
+        hit_rate = self.cache.hits / accesses if accesses else 1.0
+        return (f"Active Tiles: {self.computed_tiles}/{self.total_tiles} - Cache Hits: {hit_rate:.1%} - "
+                f"Read: {self.bytes_read / 2 ** 20:.1f} MB - Written: {self.bytes_written / 2 ** 20:.1f} MB")
+
+    def flush(self):
+        """Writes the modified tiles, the flags of the tiles and the generation to the file."""
+        self.cache.flush()
+        self._flags[:] = self._populated
+        self._flags.flush()
+        self._states.flush()
+        self._ages.flush()
+        with open(self.path, "r+b") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self._front, self.tile_size, self._width, self._height,
+                                self._generation))
+
+    def close(self):
+        """Flushes the board to the file and releases the memory maps."""
+        self.flush()
+        # The counters of the cache are kept for the report
+        self.cache.discard_buffer(0)
+        self.cache.discard_buffer(1)
+        self._flags = self._states = self._ages = None
+
+    def _read_tile(self, key):
+        """Reads a tile from the file, or returns an empty tile for the tiles without live cells."""
+        buffer, ty, tx = key
+        if not self._populated[key]:
+            return (np.zeros((self.tile_size, self.tile_size), dtype=STATE_DTYPE),
+                    np.zeros((self.tile_size, self.tile_size), dtype=AGE_DTYPE))
+        state = np.array(self._states[buffer, ty, tx])
+        age = self._ages[buffer, ty, tx].astype(AGE_DTYPE)
+        self.bytes_read += state.nbytes + age.nbytes
+        return state, age
+
+    def _write_tile(self, key, state, age):
+        """Writes a tile back to the file."""
+        buffer, ty, tx = key
+        self._states[buffer, ty, tx] = state
+        self._ages[buffer, ty, tx] = age
+        self.bytes_written += state.nbytes + age.nbytes
+
+    def _set_tile(self, buffer, ty, tx, state, age):
+        """Replaces a tile, which holds live cells or not."""
+        if state.any():
+            self._populated[buffer, ty, tx] = True
+            self.cache.put((buffer, ty, tx), state, age)
+        else:
+            self._populated[buffer, ty, tx] = False
+            self.cache.discard((buffer, ty, tx))
+
+    def _editable_tile(self, x, y):
+        """Returns the state and age matrices of the tile of a cell, marked modified and holding live cells."""
+        key = (self._front, y // self.tile_size, x // self.tile_size)
+        entry = self.cache.get(key)
+        entry[2] = True
+        self._populated[key] = True
+        return entry[0], entry[1]
+
+    def _halo_block(self, buffer, ty, tx):
+        """
+        Reads the state of a tile with a halo of one cell from its neighbor tiles.
+
+        Args:
+            buffer (int): The buffer of the tiles.
+            ty (int): The row of the tile.
+            tx (int): The column of the tile.
+
+        Returns:
+            tuple: The (size + 2) x (size + 2) state matrix of the tile with its halo and the age matrix of the tile.
+        """
+        size = self.tile_size
+        block = np.zeros((size + 2, size + 2), dtype=STATE_DTYPE)
+        state, age, _ = self.cache.get((buffer, ty, tx))
+        block[1:-1, 1:-1] = state
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                y, x = ty + dy, tx + dx
+                if (dy or dx) and 0 <= y < self._tiles_y and 0 <= x < self._tiles_x and self._populated[buffer, y, x]:
+                    neighbor = self.cache.get((buffer, y, x))[0]
+                    # Rows and columns of the neighbor next to the tile, and where they go in the block
+                    rows = {-1: slice(size - 1, size), 0: slice(0, size), 1: slice(0, 1)}[dy]
+                    columns = {-1: slice(size - 1, size), 0: slice(0, size), 1: slice(0, 1)}[dx]
+                    block_rows = {-1: slice(0, 1), 0: slice(1, size + 1), 1: slice(size + 1, size + 2)}[dy]
+                    block_columns = {-1: slice(0, 1), 0: slice(1, size + 1), 1: slice(size + 1, size + 2)}[dx]
+                    block[block_rows, block_columns] = neighbor[rows, columns]
+        return block, age
+
+
+class _StatsAccumulator:
+    """
+    This class accumulates the statistics of a generation of an out-of-core board tile by tile.
+
+    Args:
+        tile_size (int): The side of the tiles, in cells.
+
+    Attributes:
+        last_age (numpy.ndarray): The age matrix of the last tile added.
+
+    """
+
+    def __init__(self, tile_size):
+        """
+        Initializes a new instance of _StatsAccumulator.
+        """
+        self._tile_size = tile_size
+        self._population = 0
+        self._bounds = None
+        self._age_histogram = np.zeros(len(AGE_BUCKETS), dtype=np.int64)
+        self.last_age = None
+
+    def add(self, ty, tx, alive, age):
+        """
+        Adds the cells of a tile.
+
+        Args:
+            ty (int): The row of the tile.
+            tx (int): The column of the tile.
+            alive (numpy.ndarray): The boolean matrix of the live cells of the tile.
+            age (numpy.ndarray): The age matrix of the tile.
+
+        Returns:
+            int: The number of live cells of the tile.
+        """
+        self.last_age = age
+        population = int(np.count_nonzero(alive))
+        if population:
+            self._population += population
+            rows = np.flatnonzero(alive.any(axis=1)) + ty * self._tile_size
+            columns = np.flatnonzero(alive.any(axis=0)) + tx * self._tile_size
+            bounds = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+            if self._bounds is not None:
+                bounds = (min(bounds[0], self._bounds[0]), min(bounds[1], self._bounds[1]),
+                          max(bounds[2], self._bounds[2]), max(bounds[3], self._bounds[3]))
+            self._bounds = bounds
+            # The binary exponent of an age is the index of its bucket (0, 1, 2-3, 4-7, ...)
+            self._age_histogram += np.bincount(np.frexp(age[alive])[1], minlength=len(AGE_BUCKETS))
+        return population
+
+    def stats(self, generation, births, deaths):
+        """Returns the statistics of the tiles added."""
+        return BoardStats(generation, self._population, births, deaths, self._bounds, None, None, self._age_histogram)
+
+
+def _align(offset):
+    """Returns the first multiple of 8 from an offset."""
+    return (offset + 7) // 8 * 8
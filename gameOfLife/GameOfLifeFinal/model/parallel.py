@@ -0,0 +1,167 @@
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, STATE_DTYPE, TOPOLOGIES, Engine, next_age, next_region
+
+# Shared buffers attached by each worker process: {"state": [front, back], "age": [front, back]}
+_worker_buffers = {}
+
+
+class ParallelEngine(Engine):
+    """
+    This class represents the multi-core engine.
+
+    The state and age matrices live in two pairs of shared memory buffers. At every generation the
+    board is split into horizontal bands stepped by a pool of worker processes: each worker reads its
+    band and the row above and below it (the halo) from one buffer and writes the next generation
+    of the band into the other one, then the buffers are swapped without copying. Every band is
+    computed with the same kernel of the NumPy engine, so the result is bit-identical to it and
+    does not depend on the number of workers.
+
+    The matrices returned by a step are views over the shared buffers, reused two steps later.
+
+    Args:
+        workers (int): The number of worker processes (default the number of CPU cores).
+
+    Attributes:
+        _pool (multiprocessing.pool.Pool): The pool of worker processes.
+        _memory (list): The shared memory blocks [state front, state back, age front, age back].
+        _views (dict): The NumPy views over the shared memory blocks.
+        _front (int): The index of the buffers holding the current generation.
+
+    """
+
+    name = "parallel"
+    topologies = TOPOLOGIES
+
+    def __init__(self, workers=None):
+        """
+        Initializes a new instance of ParallelEngine.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._memory = []
+        self._views = None
+        self._front = 0
+        self._finalizer = None
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the board with the worker pool.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        self._load(state, age)
+        height = state.shape[0]
+        bands = min(self.workers, height)
+        bounds = [height * band // bands for band in range(bands + 1)]
+        self._pool.map(_step_band, [(self._front, y0, y1, self.topology)
+                                    for y0, y1 in zip(bounds, bounds[1:]) if y1 > y0])
+        self._front = 1 - self._front
+        return self._views["state"][self._front], self._views["age"][self._front]
+
+    def close(self):
+        """Stops the worker processes and releases the shared memory."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._pool = None
+        self._memory = []
+        self._views = None
+        self._finalizer = None
+
+    def _load(self, state, age):
+        """
+        Makes sure the current generation is in the front shared buffers.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states.
+            age (numpy.ndarray): The matrix of cell ages.
+
+        The buffers and the pool are created again when the shape of the board changes, and the
+        matrices are copied in when they are not already the front buffers (e.g. after set_board).
+        """
+        if self._views is None or self._views["state"][0].shape != state.shape:
+            self.close()
+            self._allocate(state.shape)
+        if state is not self._views["state"][self._front]:
+            self._views["state"][self._front][...] = state
+        if age is not self._views["age"][self._front]:
+            self._views["age"][self._front][...] = age
+
+    def _allocate(self, shape):
+        """
+        Creates the shared buffers for a board shape and starts the worker pool attached to them.
+
+        Args:
+            shape (tuple): The shape of the board.
+        """
+        cells = max(int(np.prod(shape)), 1)
+        specs = [(STATE_DTYPE, cells), (STATE_DTYPE, cells), (AGE_DTYPE, cells), (AGE_DTYPE, cells)]
+        self._memory = [shared_memory.SharedMemory(create=True, size=count * np.dtype(dtype).itemsize)
+                        for dtype, count in specs]
+        names = [block.name for block in self._memory]
+        self._views = _attach(names, shape, self._memory)
+        self._front = 0
+        self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker, initargs=(names, shape))
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._memory)
+
+
+def _attach(names, shape, blocks=None):
+    """
+    Creates the NumPy views over the shared buffers.
+
+    Args:
+        names (list): The names of the shared memory blocks.
+        shape (tuple): The shape of the board.
+        blocks (list): The already opened blocks, None to attach to them by name.
+
+    Returns:
+        dict: The views {"state": [front, back], "age": [front, back]}.
+    """
+    if blocks is None:
+        blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    views = [np.ndarray(shape, dtype=dtype, buffer=block.buf)
+             for dtype, block in zip((STATE_DTYPE, STATE_DTYPE, AGE_DTYPE, AGE_DTYPE), blocks)]
+    return {"state": views[:2], "age": views[2:], "blocks": blocks}
+
+
+def _init_worker(names, shape):
+    """Attaches a worker process to the shared buffers."""
+    _worker_buffers.update(_attach(names, shape))
+
+
+def _step_band(task):
+    """
+    Computes the next generation of a band of rows in a worker process.
+
+    Args:
+        task (tuple): The index of the front buffers, the first row and the row after the last row of the band,
+            and the topology of the edges of the board.
+    """
+    front, y0, y1, topology = task
+    state = _worker_buffers["state"][front]
+    age = _worker_buffers["age"][front]
+    alive = next_region(state, y0, y1, 0, state.shape[1], topology)
+    _worker_buffers["state"][1 - front][y0:y1] = alive
+    _worker_buffers["age"][1 - front][y0:y1] = next_age(alive, age[y0:y1])
+
+
+def _release(pool, blocks):
+    """Stops a worker pool and releases its shared memory blocks."""
+    pool.terminate()
+    pool.join()
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            pass  # Matrices returned by the engine are still in use, the block is freed with them
+        block.unlink()
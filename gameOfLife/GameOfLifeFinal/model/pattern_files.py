@@ -0,0 +1,510 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from GameOfLifeFinal.model.patterns import place_pattern
+
+# Directory of the pattern files shipped with the game
+LIBRARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cells", "library")
+# Format of the pattern files, by extension
+PATTERN_FORMATS = {".rle": "rle", ".lif": "life106", ".life": "life106", ".cells": "plaintext"}
+# Name of the index of a pattern library, in its directory
+INDEX_FILE = ".index.json"
+# Version of the index written, indexes of other versions are rebuilt
+INDEX_VERSION = 1
+# Number of bytes of a pattern file parsed at once
+CHUNK_SIZE = 1 << 16
+# Header line of RLE files, with the size of the pattern
+RLE_HEADER = re.compile(rb"\s*x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)")
+# Characters of RLE files ending a row, and of the dead cells (other letters are live cells of any state)
+RLE_ROW_END, RLE_DEAD = ord("$"), (ord("b"), ord("."))
+# Characters of the live cells of plaintext files
+PLAINTEXT_ALIVE = (ord("O"), ord("*"))
+
+
+class PatternInfo:
+    """
+    This class represents a pattern file of a library, described without reading its cells.
+
+    Args:
+        name (str): The name of the pattern.
+        path (str): The path of the pattern file.
+        bounding_box (tuple): The (x0, y0, x1, y1) rectangle of the pattern in the coordinates of
+            the file, x1 and y1 excluded.
+
+    Attributes:
+        name (str): The name of the pattern.
+        path (str): The path of the pattern file.
+        bounding_box (tuple): The (x0, y0, x1, y1) rectangle of the pattern in the coordinates of
+            the file, x1 and y1 excluded.
+
+    """
+
+    __slots__ = ("name", "path", "bounding_box")
+
+    def __init__(self, name, path, bounding_box):
+        """
+        Initializes a new instance of PatternInfo.
+        """
+        self.name = name
+        self.path = path
+        self.bounding_box = tuple(bounding_box)
+
+    @property
+    def width(self):
+        """Returns the width of the pattern."""
+        return self.bounding_box[2] - self.bounding_box[0]
+
+    @property
+    def height(self):
+        """Returns the height of the pattern."""
+        return self.bounding_box[3] - self.bounding_box[1]
+
+    def cells(self):
+        """Returns the (n, 2) array of [y, x] coordinates of the live cells, read from the file."""
+        return read_pattern_cells(self.path)
+
+    def place(self, state, x, y):
+        """Sets alive the cells of the pattern in a state matrix, streamed from the file (see place_pattern_file)."""
+        place_pattern_file(state, self.path, x, y)
+
+    def __str__(self):
+        """Returns a string representation of the pattern."""
+        return f"{self.name} ({self.width}x{self.height})"
+
+
+class PatternLibrary:
+    """
+    This class represents a directory of pattern files, indexed by name, size and bounding box.
+
+    The directory and its subdirectories are indexed once, by reading the header of each pattern
+    file (the whole file for the formats without a size in their header). The index is saved in
+    the directory and reused, only the files added or modified since being read again, so large
+    libraries are listed without parsing their patterns. The cells of a pattern are read when placed.
+
+    Args:
+        directory (str): The directory of the pattern files.
+
+    Attributes:
+        directory (str): The directory of the pattern files.
+        _patterns (dict): The PatternInfo of each pattern, by name.
+
+    """
+
+    def __init__(self, directory=LIBRARY_DIR):
+        """
+        Initializes a new instance of PatternLibrary.
+        """
+        self.directory = directory
+        self._patterns = {}
+        self.refresh()
+
+    def refresh(self):
+        """
+        Indexes the files added or modified since the index was saved, and saves it if changed.
+
+        Unreadable pattern files are left out, and the index is only kept in memory if the
+        directory is read-only.
+        """
+        index_path = os.path.join(self.directory, INDEX_FILE)
+        cached = self._read_index(index_path)
+        entries = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs.sort()
+            for file in sorted(files):
+                if os.path.splitext(file)[1].lower() not in PATTERN_FORMATS:
+                    continue
+                path = os.path.join(root, file)
+                relative = os.path.relpath(path, self.directory)
+                status = os.stat(path)
+                entry = cached.get(relative)
+                if entry is None or entry["mtime"] != status.st_mtime_ns or entry["size"] != status.st_size:
+                    try:
+                        info = read_pattern_info(path)
+                    except (OSError, ValueError):
+                        continue
+                    entry = {"name": info.name, "bounding_box": list(info.bounding_box),
+                             "mtime": status.st_mtime_ns, "size": status.st_size}
+                entries[relative] = entry
+        if entries != cached:
+            try:
+                with open(index_path, "w") as f:
+                    json.dump({"version": INDEX_VERSION, "patterns": entries}, f)
+            except OSError:
+                pass
+
+        self._patterns = {}
+        for relative, entry in entries.items():
+            # Patterns with the same name are told apart by their file
+            name = entry["name"] if entry["name"] not in self._patterns else f"{entry['name']} [{relative}]"
+            self._patterns[name] = PatternInfo(name, os.path.join(self.directory, relative), entry["bounding_box"])
+
+    def __len__(self):
+        """Returns the number of patterns."""
+        return len(self._patterns)
+
+    def __iter__(self):
+        """Iterates over the PatternInfo of the patterns, in the order of their files."""
+        return iter(self._patterns.values())
+
+    def __contains__(self, name):
+        """Returns whether a pattern of the library has a name."""
+        return name in self._patterns
+
+    def __getitem__(self, name):
+        """Returns the PatternInfo of a pattern by name."""
+        return self._patterns[name]
+
+    @staticmethod
+    def _read_index(index_path):
+        """Returns the entries of a saved index by relative path, empty if missing or outdated."""
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("patterns", {})
+
+
+def pattern_format(path):
+    """
+    Returns the format of a pattern file from its extension.
+
+    Args:
+        path (str): The path of the pattern file.
+
+    Returns:
+        str: "rle", "life106" or "plaintext".
+
+    Raises:
+        ValueError: If the extension is not one of a pattern format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PATTERN_FORMATS:
+        raise ValueError(f"{path} is not a pattern file ({', '.join(PATTERN_FORMATS)})")
+    return PATTERN_FORMATS[extension]
+
+
+def read_pattern_info(path):
+    """
+    Reads the name and bounding box of a pattern file.
+
+    RLE files are described by their header only, Life 1.06 and plaintext files are scanned.
+
+    Args:
+        path (str): The path of the pattern file.
+
+    Returns:
+        PatternInfo: The description of the pattern.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid pattern file.
+    """
+    file_format = pattern_format(path)
+    with open(path, "rb") as f:
+        fields, header = _read_header(f, file_format)
+        if file_format == "rle":
+            # The size is in the header line, and the position of the top-left cell in a #P or #R line if any
+            width, height = (int(size) for size in RLE_HEADER.match(header).groups())
+            x0, y0 = _rle_position(fields)
+            bounding_box = (x0, y0, x0 + width, y0 + height)
+        elif file_format == "life106":
+            xs, ys = _life106_coordinates(f)
+            bounding_box = (0, 0, 0, 0)
+            if len(xs):
+                bounding_box = (int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1)
+        else:
+            lines = f.read().splitlines()
+            bounding_box = (0, 0, max((len(line.rstrip()) for line in lines), default=0), len(lines))
+    name = fields.get("name") or os.path.splitext(os.path.basename(path))[0]
+    return PatternInfo(name, path, bounding_box)
+
+
+def iter_pattern_cells(path, chunk_size=CHUNK_SIZE):
+    """
+    Reads the live cells of a pattern file chunk by chunk.
+
+    Each chunk of the file is parsed with whole-array operations: the runs of RLE files are
+    expanded at once, the coordinates of Life 1.06 files and the rows of plaintext files are
+    converted at once. Life 1.06 files are read entirely before their cells are yielded, as their
+    coordinates are shifted to start at 0.
+
+    Args:
+        path (str): The path of the pattern file.
+        chunk_size (int): The number of bytes parsed at once.
+
+    Yields:
+        numpy.ndarray: The (n, 2) arrays of [y, x] coordinates of the live cells, from the top-left
+        corner of the pattern.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid pattern file.
+    """
+    file_format = pattern_format(path)
+    with open(path, "rb") as f:
+        _read_header(f, file_format)
+        if file_format == "rle":
+            yield from _rle_cells(f, chunk_size)
+        elif file_format == "life106":
+            xs, ys = _life106_coordinates(f, chunk_size)
+            if len(xs):
+                yield np.column_stack((ys - ys.min(), xs - xs.min()))
+        else:
+            yield from _plaintext_cells(f, chunk_size)
+
+
+def read_pattern_cells(path):
+    """
+    Reads the live cells of a pattern file.
+
+    Args:
+        path (str): The path of the pattern file.
+
+    Returns:
+        numpy.ndarray: The (n, 2) array of [y, x] coordinates of the live cells, from the top-left
+        corner of the pattern.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid pattern file.
+    """
+    chunks = list(iter_pattern_cells(path))
+    return np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int64)
+
+
+def place_pattern_file(state, path, x, y):
+    """
+    Sets alive the cells of a pattern file in a state matrix, chunk by chunk as they are parsed.
+
+    Args:
+        state (numpy.ndarray): The state matrix to write into.
+        path (str): The path of the pattern file.
+        x (int): The x-coordinate of the top-left corner of the pattern on the board.
+        y (int): The y-coordinate of the top-left corner of the pattern on the board.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is not a valid pattern file.
+
+    The cells falling outside the board are dropped.
+    """
+    for cells in iter_pattern_cells(path):
+        place_pattern(state, cells, x, y)
+
+
+def _read_header(f, file_format):
+    """
+    Reads the header lines of a pattern file, leaving the file at the first line of cells.
+
+    Args:
+        f (file): The pattern file, opened in binary mode.
+        file_format (str): The format of the file.
+
+    Returns:
+        tuple: The fields of the header ("name", and "position" for RLE files) and the RLE header
+        line (empty for other formats).
+
+    Raises:
+        ValueError: If the header is not valid for the format.
+    """
+    fields = {}
+    comment = b"!" if file_format == "plaintext" else b"#"
+    first = True
+    while True:
+        position = f.tell()
+        line = f.readline()
+        stripped = line.strip()
+        if file_format == "life106" and first and not stripped.startswith(b"#Life 1.06"):
+            raise ValueError(f"{f.name} is not a Life 1.06 file")
+        first = False
+        # Blank lines are rows of dead cells in plaintext files
+        if not line or not (stripped.startswith(comment) or (not stripped and file_format != "plaintext")):
+            break
+        text = stripped[1:].decode("utf-8", "replace").strip()
+        if file_format == "plaintext" and text.lower().startswith("name:"):
+            fields["name"] = text[5:].strip()
+        elif file_format == "rle" and text[:1] == "N":
+            fields["name"] = text[1:].strip()
+        elif file_format == "rle" and text[:1] in ("P", "R"):
+            fields["position"] = text[1:].split()
+    if file_format != "rle":
+        f.seek(position)
+        return fields, b""
+    if RLE_HEADER.match(line) is None:
+        raise ValueError(f"{f.name} has no RLE header line (x = ..., y = ...)")
+    return fields, line
+
+
+def _rle_position(fields):
+    """Returns the (x, y) position of the top-left cell from the #P or #R line of an RLE file, (0, 0) without one."""
+    try:
+        x, y = fields.get("position", (0, 0))[:2]
+        return int(x), int(y)
+    except ValueError:
+        return 0, 0
+
+
+def _rle_cells(f, chunk_size):
+    """
+    Parses the cells of an RLE file chunk by chunk.
+
+    A chunk is cut after its last tag (a cell state or an end of row), the digits of a run count
+    after it being parsed with the next chunk. The row and column reached are carried over.
+
+    Args:
+        f (file): The RLE file, after its header line.
+        chunk_size (int): The number of bytes parsed at once.
+
+    Yields:
+        numpy.ndarray: The (n, 2) arrays of [y, x] coordinates of the live cells.
+    """
+    carry = b""
+    x = y = 0
+    done = False
+    while not done:
+        data = f.read(chunk_size)
+        done = not data
+        # Whitespace is allowed anywhere, "!" ends the pattern
+        data = (carry + data).translate(None, b" \t\r\n")
+        end = data.find(b"!")
+        if end >= 0:
+            data, done = data[:end], True
+        cut = len(data) if done else len(data.rstrip(b"0123456789"))
+        data, carry = data[:cut], data[cut:]
+        if data:
+            cells, x, y = _rle_runs(data, x, y)
+            if len(cells):
+                yield cells
+
+
+def _rle_runs(data, x, y):
+    """
+    Expands the runs of a chunk of an RLE file.
+
+    Args:
+        data (bytes): The runs, without whitespace, ending with a tag.
+        x (int): The column reached by the previous chunks.
+        y (int): The row reached by the previous chunks.
+
+    Returns:
+        tuple: The (n, 2) array of [y, x] coordinates of the live cells, and the column and row reached.
+
+    Raises:
+        ValueError: If the chunk holds characters other than run counts, letters, "." and "$".
+    """
+    codes = np.frombuffer(data, dtype=np.uint8)
+    digits = (codes >= ord("0")) & (codes <= ord("9"))
+    tags = np.flatnonzero(~digits)
+    tag_codes = codes[tags]
+    if not len(tags):
+        return np.zeros((0, 2), dtype=np.int64), x, y
+    letters = ((tag_codes | 0x20) >= ord("a")) & ((tag_codes | 0x20) <= ord("z"))
+    valid = letters | (tag_codes == RLE_ROW_END) | (tag_codes == ord("."))
+    if not valid.all():
+        raise ValueError(f"Unexpected character {chr(tag_codes[~valid][0])!r} in RLE data")
+
+    # Count of each run, from the digits before its tag (1 without digits)
+    lengths = tags - np.concatenate(([-1], tags[:-1])) - 1
+    if lengths.max(initial=0) > 18:
+        raise ValueError("Run count too large in RLE data")
+    counts = np.where(lengths == 0, 1, 0).astype(np.int64)
+    for k in range(1, lengths.max(initial=0) + 1):
+        has_digit = lengths >= k
+        counts[has_digit] += (codes[tags[has_digit] - k] - ord("0")).astype(np.int64) * 10 ** (k - 1)
+
+    # Column of each run: the cells before it since the last end of row, the carried column before any
+    row_end = tag_codes == RLE_ROW_END
+    advance = np.where(row_end, 0, counts)
+    end = np.cumsum(advance)
+    start = end - advance
+    row_start = np.maximum.accumulate(np.where(row_end, start, -x))
+    columns = start - row_start
+    rows = y + np.cumsum(np.where(row_end, counts, 0))
+
+    # Every cell of the runs of live cells
+    alive = ~row_end & ~np.isin(tag_codes, RLE_DEAD)
+    run_lengths = counts[alive]
+    offsets = np.cumsum(run_lengths) - run_lengths
+    cells = np.empty((int(run_lengths.sum()), 2), dtype=np.int64)
+    cells[:, 0] = np.repeat(rows[alive], run_lengths)
+    cells[:, 1] = np.repeat(columns[alive] - offsets, run_lengths) + np.arange(len(cells))
+    return cells, int(end[-1] - row_start[-1]), int(rows[-1])
+
+
+def _life106_coordinates(f, chunk_size=CHUNK_SIZE):
+    """
+    Parses the "x y" coordinates of the live cells of a Life 1.06 file chunk by chunk.
+
+    Args:
+        f (file): The Life 1.06 file, after its header lines.
+        chunk_size (int): The number of bytes parsed at once.
+
+    Returns:
+        tuple: The arrays of x and y coordinates.
+
+    Raises:
+        ValueError: If a line does not hold two integers.
+    """
+    chunks = []
+    carry = b""
+    while True:
+        data = f.read(chunk_size)
+        last = not data
+        data = carry + data
+        if not last:
+            # The last line of the chunk may go on in the next one
+            head, newline, carry = data.rpartition(b"\n")
+            data = head + newline
+        if data.strip():
+            try:
+                values = np.array(data.split(), dtype=np.int64)
+            except ValueError:
+                raise ValueError(f"{f.name} has invalid coordinates") from None
+            if len(values) % 2:
+                raise ValueError(f"{f.name} has a coordinate without its pair")
+            chunks.append(values.reshape(-1, 2))
+        if last:
+            break
+    coordinates = np.concatenate(chunks) if chunks else np.zeros((0, 2), dtype=np.int64)
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+def _plaintext_cells(f, chunk_size):
+    """
+    Parses the cells of a plaintext file chunk by chunk, each chunk being cut after its last line.
+
+    Args:
+        f (file): The plaintext file, after its comment lines.
+        chunk_size (int): The number of bytes parsed at once.
+
+    Yields:
+        numpy.ndarray: The (n, 2) arrays of [y, x] coordinates of the live cells.
+    """
+    y = 0
+    carry = b""
+    while True:
+        data = f.read(chunk_size)
+        last = not data
+        data = carry + data
+        if not last:
+            # The last line of the chunk may go on in the next one
+            head, newline, carry = data.rpartition(b"\n")
+            data = head + newline
+        if data:
+            codes = np.frombuffer(data, dtype=np.uint8)
+            newlines = np.flatnonzero(codes == ord("\n"))
+            alive = np.flatnonzero(np.isin(codes, PLAINTEXT_ALIVE))
+            # Row of each live cell, and its column from the start of its row
+            rows = np.searchsorted(newlines, alive)
+            line_starts = np.concatenate(([0], newlines + 1))
+            if len(alive):
+                yield np.column_stack((rows + y, alive - line_starts[rows]))
+            y += len(newlines)
+        if last:
+            break
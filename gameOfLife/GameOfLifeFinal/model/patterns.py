@@ -0,0 +1,53 @@
+import json
+import os
+
+import numpy as np
+
+# Library of classic patterns shipped with the game
+PATTERNS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cells", "patterns.json")
+
+
+def load_patterns(path=PATTERNS_FILE):
+    """
+    Loads a library of patterns.
+
+    Args:
+        path (str): The JSON file mapping each pattern name to its list of [y, x] live cells.
+
+    Returns:
+        dict: The list of [y, x] live cells of each pattern, by name.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def pattern_cells(pattern):
+    """
+    Converts a pattern to an array of coordinates.
+
+    Args:
+        pattern (list): The [y, x] coordinates of the live cells.
+
+    Returns:
+        numpy.ndarray: The (n, 2) array of [y, x] coordinates.
+    """
+    return np.array(pattern, dtype=np.int64).reshape(-1, 2)
+
+
+def place_pattern(state, pattern, x, y):
+    """
+    Sets alive the cells of a pattern in a state matrix.
+
+    Args:
+        state (numpy.ndarray): The state matrix to write into.
+        pattern (list or numpy.ndarray): The [y, x] coordinates of the live cells.
+        x (int): The x-coordinate of the origin of the pattern on the board.
+        y (int): The y-coordinate of the origin of the pattern on the board.
+
+    The cells falling outside the board are dropped.
+    """
+    cells = pattern_cells(pattern)
+    target_y = cells[:, 0] + y
+    target_x = cells[:, 1] + x
+    inside = (0 <= target_x) & (target_x < state.shape[1]) & (0 <= target_y) & (target_y < state.shape[0])
+    state[target_y[inside], target_x[inside]] = 1
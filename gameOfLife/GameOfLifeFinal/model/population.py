@@ -0,0 +1,145 @@
+import threading
+
+import numpy as np
+
+# Fields of a record of the population log
+RECORD_DTYPE = np.dtype([
+    ("generation", "<i8"),
+    ("alive", "<i8"),
+    ("births", "<i8"),
+    ("deaths", "<i8"),
+    ("step_time", "<f4"),
+])
+# Default number of records kept (about 36 MB, allocated by the system only when written)
+DEFAULT_CAPACITY = 1 << 20
+
+
+class PopulationLog:
+    """
+    This class represents the population history of a board.
+
+    Each generation is stored as a fixed size record (generation, alive cells, births, deaths and
+    time spent stepping) in a preallocated ring buffer: once full, the oldest records are
+    overwritten, so the memory used stays bounded however long the simulation runs.
+
+    Args:
+        capacity (int): The number of records kept.
+
+    Rewinding the log keeps the records of the later generations, so that it can be moved
+    forward again, until a new generation is appended from there.
+
+    Attributes:
+        total (int): The number of records appended since the log was created or cleared, up to the
+            current generation.
+        _kept (int): The number of records appended including those after the current generation,
+            kept after a rewind.
+        _first (int): The number of records appended before the oldest one still valid, whether
+            overwritten or dropped after a rewind.
+        _records (numpy.ndarray): The ring buffer of records.
+
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Initializes a new instance of PopulationLog.
+        """
+        self.capacity = capacity
+        self.total = 0
+        self._kept = 0
+        self._first = 0
+        self._records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of records kept."""
+        return self.total - max(self._first, self._kept - self.capacity)
+
+    def append(self, generation, alive, births, deaths, step_time):
+        """
+        Appends the record of a generation, overwriting the oldest one when the log is full.
+
+        The records after the current generation, kept by a rewind, are dropped.
+
+        Args:
+            generation (int): The generation.
+            alive (int): The number of alive cells.
+            births (int): The number of cells born since the previous record.
+            deaths (int): The number of cells died since the previous record.
+            step_time (float): The time spent computing the generation, in seconds.
+        """
+        with self._lock:
+            if self._kept > self.total:
+                # The records overwritten by the dropped ones are not valid anymore
+                self._first = max(self._first, self._kept - self.capacity)
+            self._records[self.total % self.capacity] = (generation, alive, births, deaths, step_time)
+            self.total += 1
+            self._kept = self.total
+
+    def clear(self):
+        """Removes all the records."""
+        with self._lock:
+            self.total = 0
+            self._kept = 0
+            self._first = 0
+
+    def rewind(self, generation):
+        """
+        Moves the log back (or forward) to a generation, when the board is rewound to it.
+
+        The records of the later generations are kept until a new generation is appended.
+
+        Args:
+            generation (int): The last generation of the records.
+        """
+        with self._lock:
+            start = max(self._first, self._kept - self.capacity)
+            kept = self._records[np.arange(start, self._kept) % self.capacity]
+            self.total = start + int(np.searchsorted(kept["generation"], generation, side="right"))
+
+    def last(self):
+        """
+        Returns the most recent record.
+
+        Returns:
+            numpy.void: The record, with the fields of RECORD_DTYPE, None if the log is empty.
+        """
+        with self._lock:
+            return self._records[(self.total - 1) % self.capacity].copy() if self.total else None
+
+    def records(self, count=None):
+        """
+        Returns the most recent records, oldest first.
+
+        Args:
+            count (int): The number of records, None for all the records kept.
+
+        Returns:
+            numpy.ndarray: A copy of the records, with the fields of RECORD_DTYPE.
+        """
+        with self._lock:
+            kept = self.total - max(self._first, self._kept - self.capacity)
+            count = kept if count is None else min(count, kept)
+            end = self.total % self.capacity
+            if count <= end:
+                return self._records[end - count:end].copy()
+            # The records wrap around the end of the buffer
+            return np.concatenate((self._records[self.capacity - (count - end):], self._records[:end]))
+
+    def export_csv(self, path):
+        """
+        Writes all the records kept to a CSV file at once.
+
+        Args:
+            path (str): The path of the file.
+        """
+        np.savetxt(path, self.records(), fmt=["%d", "%d", "%d", "%d", "%.9f"], delimiter=",",
+                   header=",".join(RECORD_DTYPE.names), comments="")
+
+    def export_binary(self, path):
+        """
+        Writes all the records kept to a NumPy .npy file at once, readable with numpy.load.
+
+        Args:
+            path (str): The path of the file.
+        """
+        np.save(path, self.records())
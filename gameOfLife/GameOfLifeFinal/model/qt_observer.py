@@ -0,0 +1,32 @@
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtProperty
+
+
+class QtObservable(QObject):
+    """
+    This class adapts an Observable to Qt, emitting its changes as the valueChanged signal.
+
+    Args:
+        observable (Observable): The observable to adapt.
+
+    Signals:
+        valueChanged: Signal emitted with the new value when the value of the observable changes.
+
+    """
+
+    valueChanged = pyqtSignal(object)
+
+    def __init__(self, observable):
+        super().__init__()
+        self._observable = observable
+        observable.register(self.valueChanged.emit)
+
+    def register(self, slot):
+        self.valueChanged.connect(slot)
+
+    @pyqtProperty(object, notify=valueChanged)
+    def value(self):
+        return self._observable.value
+
+    @value.setter
+    def value(self, new_val):
+        self._observable.value = new_val
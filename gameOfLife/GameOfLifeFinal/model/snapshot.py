@@ -0,0 +1,258 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, STATE_DTYPE
+
+# Identifier at the beginning of every snapshot file
+MAGIC = b"GOLSNAP\x00"
+# Version of the format written, files of later versions are refused
+VERSION = 1
+# Extension of the snapshot files
+EXTENSION = ".golsnap"
+# Header: magic, version, flags, width, height, generation, bytes of the state and bytes of the ages
+HEADER = struct.Struct("<8sHHqqqQQ")
+# Size of the header, padded so that the state starts aligned
+HEADER_SIZE = 64
+# Flags of the header
+FLAG_AGE = 1
+FLAG_COMPRESSED = 2
+# Data type of the ages in the file
+FILE_AGE_DTYPE = np.dtype("<u2")
+# Number of rows written at once, bounding the memory used to save large boards
+BAND_ROWS = 1024
+
+
+class Snapshot:
+    """
+    This class represents a board saved in a snapshot file.
+
+    Snapshot file format (version 1, little-endian):
+        header: the magic b"GOLSNAP\\0", the version (uint16), the flags (uint16, 1 if the ages are
+            saved, 2 if the data is compressed), the width, height and generation (int64), and the
+            number of bytes of the state and of the ages (uint64), padded to 64 bytes.
+        state: the rows of the state matrix, each packed 8 cells per byte (numpy.packbits).
+        ages: if saved, the age matrix as uint16, starting at the next multiple of 8 bytes.
+
+    Compressed files hold each of the state and the ages as a single zlib stream.
+
+    Uncompressed files are memory-mapped: opening one only reads the header, and the rows of the
+    state and the ages are read from the disk when used, so large boards open at once and regions
+    of them can be read without loading the whole board. Compressed files are decompressed on first use.
+
+    Args:
+        path (str): The path of the file.
+
+    Attributes:
+        path (str): The path of the file.
+        width (int): The width of the board.
+        height (int): The height of the board.
+        generation (int): The generation of the board.
+        has_age (bool): Whether the ages were saved.
+        compressed (bool): Whether the data is compressed.
+
+    Raises:
+        ValueError: If the file is not a snapshot, of a later version or truncated (compressed data
+            found corrupt is reported as ValueError when first used).
+
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a new instance of Snapshot.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+            f.seek(0, 2)
+            file_size = f.tell()
+        if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+            raise ValueError(f"{path} is not a snapshot file")
+        fields = HEADER.unpack_from(header)
+        version, flags, self.width, self.height, self.generation, state_bytes, age_bytes = fields[1:]
+        if version > VERSION:
+            raise ValueError(f"{path} is a snapshot of version {version}, only versions up to {VERSION} are supported")
+        if self.width < 1 or self.height < 1:
+            raise ValueError(f"{path} has an invalid board size {self.width}x{self.height}")
+        self.has_age = bool(flags & FLAG_AGE)
+        self.compressed = bool(flags & FLAG_COMPRESSED)
+        self._state_bytes = state_bytes
+        self._age_offset = _align(HEADER_SIZE + state_bytes)
+        if HEADER_SIZE + state_bytes > file_size or (age_bytes and self._age_offset + age_bytes > file_size):
+            raise ValueError(f"{path} is truncated")
+        if not self.compressed and (state_bytes != self.height * self.row_bytes or
+                                    age_bytes != (self.height * self.width * 2 if self.has_age else 0)):
+            raise ValueError(f"{path} does not match the size of a {self.width}x{self.height} board")
+        self._age_bytes = age_bytes
+        self._packed = None
+        self._age = None
+
+    @property
+    def row_bytes(self):
+        """Returns the number of bytes of a packed row of the state."""
+        return (self.width + 7) // 8
+
+    @property
+    def packed_state(self):
+        """Returns the matrix of the packed rows of the state, memory-mapped unless compressed."""
+        if self._packed is None:
+            shape = (self.height, self.row_bytes)
+            if self.compressed:
+                self._packed = np.frombuffer(self._decompress(HEADER_SIZE, self._state_bytes), np.uint8)
+                self._packed = self._packed.reshape(shape)
+            else:
+                self._packed = np.memmap(self.path, np.uint8, "r", HEADER_SIZE, shape)
+        return self._packed
+
+    @property
+    def state(self):
+        """Returns the state matrix of the board."""
+        return self.rows(0, self.height)
+
+    @property
+    def age(self):
+        """
+        Returns the age matrix of the board, None if the ages were not saved.
+
+        The matrix of an uncompressed file is memory-mapped copy-on-write: editing it does not change the file.
+        """
+        if self.has_age and self._age is None:
+            shape = (self.height, self.width)
+            if self.compressed:
+                ages = np.frombuffer(self._decompress(self._age_offset, self._age_bytes), FILE_AGE_DTYPE)
+                self._age = ages.astype(AGE_DTYPE).reshape(shape)
+            else:
+                self._age = np.memmap(self.path, FILE_AGE_DTYPE, "c", self._age_offset, shape)
+        return self._age
+
+    def _decompress(self, offset, size):
+        """
+        Reads and decompresses a zlib stream of the file.
+
+        Args:
+            offset (int): The offset of the stream in the file.
+            size (int): The number of bytes of the stream.
+
+        Returns:
+            bytes: The decompressed data.
+
+        Raises:
+            ValueError: If the stream is corrupt.
+        """
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(size)
+        try:
+            return zlib.decompress(data)
+        except zlib.error as error:
+            raise ValueError(f"{self.path} is corrupt: {error}") from error
+
+    def rows(self, y0, y1, x0=0, x1=None):
+        """
+        Returns a region of the state matrix, reading only its rows.
+
+        Args:
+            y0 (int): The first row of the region.
+            y1 (int): The row after the last row of the region.
+            x0 (int): The first column of the region.
+            x1 (int): The column after the last column of the region, None for the last column of the board.
+
+        Returns:
+            numpy.ndarray: The state matrix of the region.
+        """
+        x1 = self.width if x1 is None else x1
+        # Only the bytes holding the columns of the region are unpacked
+        packed = self.packed_state[y0:y1, x0 // 8:(x1 + 7) // 8]
+        unpacked = np.unpackbits(packed, axis=1)
+        return np.ascontiguousarray(unpacked[:, x0 % 8:x0 % 8 + x1 - x0], dtype=STATE_DTYPE)
+
+
+def save_snapshot(path, state, age=None, generation=0, compress=False):
+    """
+    Saves a board to a snapshot file.
+
+    The board is written in bands of rows, so saving does not need a packed copy of the whole board.
+    The file is written under a temporary name and then replaces the previous file at once, so
+    a board memory-mapped from the previous file (such as one loaded from it) stays valid.
+
+    Args:
+        path (str): The path of the file.
+        state (numpy.ndarray): The state matrix of the board.
+        age (numpy.ndarray): The age matrix of the board, None not to save the ages.
+        generation (int): The generation of the board.
+        compress (bool): Whether to compress the data with zlib.
+    """
+    flags = (FLAG_AGE if age is not None else 0) | (FLAG_COMPRESSED if compress else 0)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        _write_snapshot(temporary, state, age, generation, flags, compress)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _write_snapshot(path, state, age, generation, flags, compress):
+    """Writes a snapshot file, see save_snapshot."""
+    height, width = state.shape
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER_SIZE))
+        state_bytes = _write_bands(f, state, lambda band: np.packbits(band != 0, axis=1), compress)
+        age_bytes = 0
+        if age is not None:
+            f.write(bytes(_align(HEADER_SIZE + state_bytes) - HEADER_SIZE - state_bytes))
+            age_bytes = _write_bands(f, age, lambda band: band.astype(FILE_AGE_DTYPE), compress)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, flags, width, height, generation, state_bytes, age_bytes))
+
+
+def load_snapshot(path):
+    """
+    Opens a snapshot file.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Snapshot: The snapshot, whose matrices are read on first use.
+
+    Raises:
+        ValueError: If the file is not a snapshot, of a later version or truncated.
+    """
+    return Snapshot(path)
+
+
+def _write_bands(f, matrix, encode, compress):
+    """
+    Writes a matrix in bands of rows.
+
+    Args:
+        f (file): The file, positioned where the matrix starts.
+        matrix (numpy.ndarray): The matrix.
+        encode (callable): Converts a band of rows to the array written.
+        compress (bool): Whether to compress the bands into a single zlib stream.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    compressor = zlib.compressobj() if compress else None
+    written = 0
+    for y in range(0, matrix.shape[0], BAND_ROWS):
+        data = np.ascontiguousarray(encode(matrix[y:y + BAND_ROWS])).tobytes()
+        if compressor is not None:
+            data = compressor.compress(data)
+        f.write(data)
+        written += len(data)
+    if compressor is not None:
+        data = compressor.flush()
+        f.write(data)
+        written += len(data)
+    return written
+
+
+def _align(offset):
+    """Returns the first multiple of 8 from an offset."""
+    return (offset + 7) // 8 * 8
@@ -0,0 +1,124 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_MAX
+
+# First age of each bucket of the age histogram: 0, 1, 2-3, 4-7, ..., up to AGE_MAX
+AGE_BUCKETS = np.concatenate(([0], 1 << np.arange(int(AGE_MAX).bit_length())))
+
+
+class BoardStats:
+    """
+    This class represents the population statistics of a generation of the board.
+
+    The population, births, deaths and bounding box are computed by the board right after each
+    step, with a few whole-board reductions. The age histogram costs a pass over the age matrix,
+    so it is only computed on first use, from the matrices of the generation: it has to be read
+    before the board computes further generations, which may reuse them (frames shown by the view
+    hold stats over their own copies).
+
+    Args:
+        generation (int): The generation.
+        population (int): The number of alive cells.
+        births (int): The number of cells born since the previous generation.
+        deaths (int): The number of cells died since the previous generation.
+        bounding_box (tuple): The smallest rectangle holding the alive cells.
+        state (numpy.ndarray): The state matrix of the generation.
+        age (numpy.ndarray): The age matrix of the generation.
+        age_histogram (numpy.ndarray): The age histogram if already computed, None to compute it on first use.
+
+    Attributes:
+        generation (int): The generation.
+        population (int): The number of alive cells.
+        births (int): The number of cells born since the previous generation (0 after edits).
+        deaths (int): The number of cells died since the previous generation (0 after edits).
+        bounding_box (tuple): The (x0, y0, x1, y1) rectangle holding the alive cells, x1 and y1 excluded,
+            None if no cell is alive.
+
+    """
+
+    __slots__ = ("generation", "population", "births", "deaths", "bounding_box", "_state", "_age",
+                 "_age_histogram")
+
+    def __init__(self, generation, population, births, deaths, bounding_box, state, age, age_histogram=None):
+        """
+        Initializes a new instance of BoardStats.
+        """
+        self.generation = generation
+        self.population = population
+        self.births = births
+        self.deaths = deaths
+        self.bounding_box = bounding_box
+        self._state = state
+        self._age = age
+        self._age_histogram = age_histogram
+
+    @classmethod
+    def compute(cls, state, age, generation, old_state=None, flipped=None):
+        """
+        Computes the statistics of a generation.
+
+        Args:
+            state (numpy.ndarray): The state matrix of the generation.
+            age (numpy.ndarray): The age matrix of the generation.
+            generation (int): The generation.
+            old_state (numpy.ndarray): The state matrix of the previous generation, None after edits.
+            flipped (numpy.ndarray): The flat indices of the cells born or died since the previous
+                generation, if already known, None to compare the states.
+
+        Returns:
+            BoardStats: The statistics.
+        """
+        population = int(np.count_nonzero(state))
+        births = deaths = 0
+        if flipped is not None:
+            # The flipped cells alive now were born, the other ones died
+            births = int(np.count_nonzero(state.reshape(-1)[flipped]))
+            deaths = len(flipped) - births
+        elif old_state is not None:
+            births = int(np.count_nonzero(state > old_state))
+            # Every cell alive before either died or is still alive
+            deaths = int(np.count_nonzero(old_state)) + births - population
+        bounding_box = None
+        if population:
+            # Projections of the alive cells on the axes
+            rows = np.flatnonzero(state.any(axis=1))
+            columns = np.flatnonzero(state.any(axis=0))
+            bounding_box = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+        return cls(generation, population, births, deaths, bounding_box, state, age)
+
+    @property
+    def age_histogram(self):
+        """
+        Returns the number of alive cells in each age bucket.
+
+        Returns:
+            numpy.ndarray: The counts of the alive cells aged 0, 1, 2-3, 4-7, ... (see AGE_BUCKETS).
+        """
+        if self._age_histogram is None:
+            ages = np.bincount(self._age[self._state != 0], minlength=int(AGE_MAX) + 1)
+            self._age_histogram = np.add.reduceat(ages, AGE_BUCKETS)
+        return self._age_histogram
+
+    def copy(self, state, age):
+        """
+        Returns the same statistics over copies of the matrices of the generation.
+
+        Args:
+            state (numpy.ndarray): The copy of the state matrix.
+            age (numpy.ndarray): The copy of the age matrix.
+
+        Returns:
+            BoardStats: The statistics.
+        """
+        return BoardStats(self.generation, self.population, self.births, self.deaths, self.bounding_box, state, age,
+                          self._age_histogram)
+
+    def __str__(self):
+        """Returns a string representation of the statistics."""
+        text = f"Generation {self.generation} - Alive Cells: {self.population}"
+        if self.births or self.deaths:
+            text += f" - Births: {self.births} - Deaths: {self.deaths}"
+        if self.bounding_box is not None:
+            x0, y0, x1, y1 = self.bounding_box
+            text += f" - Bounds: {x1 - x0}x{y1 - y0} at ({x0}, {y0})"
+        return text
@@ -0,0 +1,166 @@
+import collections
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from GameOfLifeFinal.model.pattern_files import read_pattern_cells
+from GameOfLifeFinal.model.patterns import pattern_cells
+
+# Side of the thumbnails, in pixels
+THUMBNAIL_SIZE = 48
+# Directory of the thumbnails saved between runs
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                 "GameOfLifeFinal", "thumbnails")
+# Default number of thumbnails kept in memory (about 2 KB each)
+DEFAULT_CAPACITY = 1024
+# Shade of the pixels without live cells and of the pixels with only live cells
+EMPTY, FULL = 0, 255
+
+
+def render_thumbnail(cells, size=THUMBNAIL_SIZE):
+    """
+    Draws a pattern in a square thumbnail, centered.
+
+    Patterns smaller than the thumbnail are scaled up by a whole number of pixels per cell. In
+    larger patterns each block of cells is drawn as one pixel with a shade proportional to the
+    fraction of live cells in it, rounding up so that any live cell shows.
+
+    Args:
+        cells (numpy.ndarray): The (n, 2) array of [y, x] coordinates of the live cells, from the
+            top-left corner of the pattern.
+        size (int): The side of the thumbnail, in pixels.
+
+    Returns:
+        numpy.ndarray: The size x size matrix of shades, from EMPTY to FULL.
+    """
+    thumbnail = np.full((size, size), EMPTY, dtype=np.uint8)
+    if not len(cells):
+        return thumbnail
+    height, width = (cells.max(axis=0) + 1).tolist()
+    extent = max(height, width)
+    if extent <= size:
+        scale = size // extent
+        pattern = np.full((height, width), EMPTY, dtype=np.uint8)
+        pattern[cells[:, 0], cells[:, 1]] = FULL
+        pixels = pattern.repeat(scale, axis=0).repeat(scale, axis=1)
+    else:
+        factor = -(-extent // size)
+        rows, columns = -(-height // factor), -(-width // factor)
+        counts = np.bincount(cells[:, 0] // factor * columns + cells[:, 1] // factor, minlength=rows * columns)
+        pixels = ((counts * FULL + factor * factor - 1) // (factor * factor)).astype(np.uint8).reshape(rows, columns)
+    top, left = (size - pixels.shape[0]) // 2, (size - pixels.shape[1]) // 2
+    thumbnail[top:top + pixels.shape[0], left:left + pixels.shape[1]] = pixels
+    return thumbnail
+
+
+class ThumbnailCache:
+    """
+    This class represents the thumbnails of the patterns, rendered once and kept in memory and on disk.
+
+    The thumbnails are keyed by a hash of the content of the pattern (the bytes of its file, or
+    its list of cells), so a modified file gets a new thumbnail and identical patterns share
+    one. The most recently used thumbnails are kept in memory, up to a capacity, and every
+    thumbnail is saved in the cache directory to be reused by later runs.
+
+    The cache is not thread-safe: it is meant to be used by a single loading thread.
+
+    Args:
+        directory (str): The directory of the saved thumbnails.
+        capacity (int): The number of thumbnails kept in memory.
+        size (int): The side of the thumbnails, in pixels.
+
+    Attributes:
+        directory (str): The directory of the saved thumbnails.
+        capacity (int): The number of thumbnails kept in memory.
+        size (int): The side of the thumbnails, in pixels.
+        _thumbnails (collections.OrderedDict): The thumbnails in memory by key, least recently used first.
+        _file_keys (dict): The key of each pattern file already hashed, by path, modification time and size.
+
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, capacity=DEFAULT_CAPACITY, size=THUMBNAIL_SIZE):
+        """
+        Initializes a new instance of ThumbnailCache.
+        """
+        self.directory = directory
+        self.capacity = capacity
+        self.size = size
+        self._thumbnails = collections.OrderedDict()
+        self._file_keys = {}
+
+    def thumbnail(self, source):
+        """
+        Returns the thumbnail of a pattern, from memory, from disk or rendered.
+
+        Args:
+            source (list or str): The [y, x] coordinates of the live cells of the pattern, or the
+                path of its pattern file.
+
+        Returns:
+            numpy.ndarray: The thumbnail, see render_thumbnail.
+
+        Raises:
+            OSError: If the pattern file cannot be read.
+            ValueError: If the file is not a valid pattern file.
+        """
+        key = self.key(source)
+        thumbnail = self._thumbnails.get(key)
+        if thumbnail is not None:
+            self._thumbnails.move_to_end(key)
+            return thumbnail
+
+        path = os.path.join(self.directory, f"{key}.npy")
+        try:
+            thumbnail = np.load(path)
+        except (OSError, ValueError):
+            thumbnail = None
+        if thumbnail is None or thumbnail.shape != (self.size, self.size) or thumbnail.dtype != np.uint8:
+            cells = read_pattern_cells(source) if isinstance(source, str) else pattern_cells(source)
+            thumbnail = render_thumbnail(cells, self.size)
+            self._save(path, thumbnail)
+
+        self._thumbnails[key] = thumbnail
+        if len(self._thumbnails) > self.capacity:
+            self._thumbnails.popitem(last=False)
+        return thumbnail
+
+    def key(self, source):
+        """
+        Returns the key of the thumbnail of a pattern, a hash of its content and of the thumbnail size.
+
+        Args:
+            source (list or str): The [y, x] coordinates of the live cells of the pattern, or the
+                path of its pattern file.
+
+        Returns:
+            str: The key.
+
+        Raises:
+            OSError: If the pattern file cannot be read.
+        """
+        if not isinstance(source, str):
+            digest = hashlib.blake2b(json.dumps(source).encode(), digest_size=16).hexdigest()
+            return f"{digest}-{self.size}"
+        status = os.stat(source)
+        file_key = (source, status.st_mtime_ns, status.st_size)
+        if file_key not in self._file_keys:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(source, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._file_keys[file_key] = f"{digest.hexdigest()}-{self.size}"
+        return self._file_keys[file_key]
+
+    @staticmethod
+    def _save(path, thumbnail):
+        """Saves a thumbnail, replacing the file at once so readers never see a partial file, if possible."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.save(f, thumbnail)
+            os.replace(temporary, path)
+        except OSError:
+            pass
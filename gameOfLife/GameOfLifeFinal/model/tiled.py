@@ -0,0 +1,173 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_MAX, DEFAULT_TOPOLOGY, TOPOLOGIES, Engine, NumpyEngine, next_region
+
+
+class TiledEngine(Engine):
+    """
+    This class represents the active-region engine.
+
+    The board is split into square tiles and only the tiles that changed in the last generation,
+    together with their neighbor tiles, are recomputed: every other tile cannot change, so the cost
+    of a generation scales with the activity on the board instead of its area. When the board wraps
+    around, the tiles on an edge are neighbors of the tiles on the opposite edge.
+
+    The engine keeps two state buffers and writes the recomputed tiles into the older one, so the
+    state matrix returned by a step is reused two steps later. Ages are updated in place, and only
+    in the tiles that are recomputed or that hold live cells.
+
+    Args:
+        tile_size (int): The side of the tiles in cells (default 64).
+
+    Attributes:
+        _changed (numpy.ndarray): The tiles changed in the last generation or edited since.
+        _populated (numpy.ndarray): The tiles holding live cells.
+        _current (numpy.ndarray): The state matrix returned by the last step.
+        _spare (numpy.ndarray): The state matrix of the previous generation, reused by the next step.
+        active_tiles (int): The number of tiles recomputed in the last generation.
+        total_tiles (int): The number of tiles of the board.
+
+    """
+
+    name = "tiled"
+    topologies = TOPOLOGIES
+
+    def __init__(self, tile_size=64):
+        """
+        Initializes a new instance of TiledEngine.
+        """
+        self.tile_size = tile_size
+        self._changed = None
+        self._populated = None
+        self._current = None
+        self._spare = None
+        self.active_tiles = 0
+        self.total_tiles = 0
+
+    def invalidate(self, x=None, y=None):
+        """
+        Marks a cell, or the whole board, as edited outside the engine.
+
+        Args:
+            x (int): The x-coordinate of the edited cell, None for the whole board.
+            y (int): The y-coordinate of the edited cell, None for the whole board.
+        """
+        if x is None or self._changed is None:
+            self._current = None
+        else:
+            self._changed[y // self.tile_size, x // self.tile_size] = True
+            self._populated[y // self.tile_size, x // self.tile_size] = True
+
+    def report(self):
+        """Returns the number of tiles recomputed in the last generation."""
+        return f"Active Tiles: {self.active_tiles}/{self.total_tiles}"
+
+    def step(self, state, age):
+        """
+        Computes the next generation recomputing only the active tiles.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        size = self.tile_size
+        height, width = state.shape
+        tiles_y, tiles_x = -(-height // size), -(-width // size)
+        self.total_tiles = tiles_y * tiles_x
+
+        if state is not self._current:
+            # First step or board replaced: everything is recomputed
+            return self._step_all(state, age, tiles_y, tiles_x)
+
+        active = _dilate(self._changed, self.topology, size, width)
+        self.active_tiles = int(np.count_nonzero(active))
+        if self.active_tiles == self.total_tiles:
+            return self._step_all(state, age, tiles_y, tiles_x)
+
+        new_state = self._spare
+        changed = np.zeros_like(self._changed)
+        for tile_y, tile_x in zip(*np.nonzero(active)):
+            y0, x0 = tile_y * size, tile_x * size
+            y1, x1 = min(y0 + size, height), min(x0 + size, width)
+            alive = next_region(state, y0, y1, x0, x1, self.topology)
+            new_state[y0:y1, x0:x1] = alive
+            changed[tile_y, tile_x] = (alive != state[y0:y1, x0:x1]).any()
+            self._populated[tile_y, tile_x] = alive.any()
+
+        # Ages change in the recomputed tiles and in the still tiles holding live cells
+        for tile_y, tile_x in zip(*np.nonzero(active | self._populated)):
+            y0, x0 = tile_y * size, tile_x * size
+            tile_age = age[y0:y0 + size, x0:x0 + size]
+            tile_state = new_state[y0:y0 + size, x0:x0 + size]
+            tile_age += tile_state & (tile_age < AGE_MAX)
+            tile_age *= tile_state
+
+        self._changed = changed
+        self._spare = state
+        self._current = new_state
+        return new_state, age
+
+    def _step_all(self, state, age, tiles_y, tiles_x):
+        """
+        Computes the next generation of the whole board and the tiles that changed.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states.
+            age (numpy.ndarray): The matrix of cell ages.
+            tiles_y (int): The number of rows of tiles.
+            tiles_x (int): The number of columns of tiles.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        engine = NumpyEngine()
+        engine.set_topology(self.topology)
+        new_state, new_age = engine.step(state, age)
+        self._changed = _tile_any(new_state != state, self.tile_size, tiles_y, tiles_x)
+        self._populated = _tile_any(new_state == 1, self.tile_size, tiles_y, tiles_x)
+        self.active_tiles = self.total_tiles
+        self._spare = state.copy()
+        self._current = new_state
+        return new_state, new_age
+
+
+def _tile_any(mask, size, tiles_y, tiles_x):
+    """Returns for every tile whether any cell of the mask is set in it."""
+    padded = np.zeros((tiles_y * size, tiles_x * size), dtype=bool)
+    padded[:mask.shape[0], :mask.shape[1]] = mask
+    return padded.reshape(tiles_y, size, tiles_x, size).any(axis=(1, 3))
+
+
+def _dilate(tiles, topology=DEFAULT_TOPOLOGY, size=1, width=None):
+    """
+    Returns the tiles together with their eight neighbor tiles.
+
+    Args:
+        tiles (numpy.ndarray): The boolean matrix of the tiles.
+        topology (str): The topology of the edges of the board (default dead cells outside).
+        size (int): The side of the tiles in cells, needed by the Klein bottle.
+        width (int): The width of the board in cells, needed by the Klein bottle.
+
+    Returns:
+        numpy.ndarray: The boolean matrix of the dilated tiles.
+
+    The cells past a mirrored edge are the cells of the edge itself, so the tiles of a mirrored
+    edge have no more neighbors than the tiles of a dead edge.
+    """
+    padded = np.pad(tiles, 1, mode="wrap" if topology in ("torus", "klein") else "constant")
+    if topology == "klein":
+        # Past the top and bottom edges are the tiles of the opposite edge flipped left to right,
+        # which are not whole tiles unless the width is a multiple of the tile size
+        for row, opposite in ((0, tiles[-1]), (-1, tiles[0])):
+            flipped = np.repeat(opposite, size)[:width][::-1]
+            flipped = np.pad(flipped, (0, -width % size)).reshape(-1, size).any(axis=1)
+            padded[row] = np.concatenate((flipped[-1:], flipped, flipped[:1]))
+    height, width = tiles.shape
+    dilated = np.zeros_like(tiles)
+    for dy in (0, 1, 2):
+        for dx in (0, 1, 2):
+            dilated |= padded[dy:dy + height, dx:dx + width]
+    return dilated
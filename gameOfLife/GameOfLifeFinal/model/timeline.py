@@ -0,0 +1,235 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, STATE_DTYPE, next_age
+
+# Default memory budget of the timeline, in bytes
+DEFAULT_BUDGET = 64 * 1024 * 1024
+# Maximum number of generations stored as deltas after a keyframe, bounding the cost of a restore
+DEFAULT_INTERVAL = 32
+
+
+class Segment:
+    """
+    This class represents a keyframe of the timeline followed by the deltas of the next generations.
+
+    The keyframe holds the state packed 8 cells per byte and the ages of the alive cells only. Each
+    delta holds the cells born or died in a generation, as their flat indices when few cells
+    changed, otherwise as a bitmap packed 8 cells per byte.
+
+    Args:
+        state (numpy.ndarray): The state matrix of the keyframe.
+        age (numpy.ndarray): The age matrix of the keyframe.
+        generation (int): The generation of the keyframe.
+
+    Attributes:
+        start (int): The generation of the keyframe.
+        shape (tuple): The shape of the board.
+        deltas (list): The delta of each generation after the keyframe.
+        size (int): The number of bytes used by the keyframe and the deltas.
+
+    """
+
+    def __init__(self, state, age, generation):
+        """
+        Initializes a new instance of Segment.
+        """
+        self.start = generation
+        self.shape = state.shape
+        alive = state.reshape(-1) != 0
+        self._packed_state = np.packbits(alive)
+        self._alive_age = age.reshape(-1)[alive]
+        self.deltas = []
+        self.size = self._packed_state.nbytes + self._alive_age.nbytes
+
+    @property
+    def end(self):
+        """Returns the last generation of the segment."""
+        return self.start + len(self.deltas)
+
+    def append(self, flipped):
+        """
+        Appends the delta of the next generation.
+
+        Args:
+            flipped (numpy.ndarray): The flat indices of the cells born or died.
+        """
+        cells = self.shape[0] * self.shape[1]
+        if flipped.size * 4 < cells // 8:
+            delta = flipped.astype(np.uint32)
+        else:
+            mask = np.zeros(cells, dtype=bool)
+            mask[flipped] = True
+            delta = np.packbits(mask)
+        self.deltas.append(delta)
+        self.size += delta.nbytes
+
+    def truncate(self, generation):
+        """
+        Drops the deltas after a generation.
+
+        Args:
+            generation (int): The last generation kept.
+        """
+        dropped = self.deltas[generation - self.start:]
+        del self.deltas[generation - self.start:]
+        self.size -= sum(delta.nbytes for delta in dropped)
+
+    def restore(self, generation):
+        """
+        Rebuilds the board at a generation of the segment.
+
+        The keyframe is unpacked, then the deltas are applied up to the generation, the ages
+        following the rules of the engines (alive cells get one generation older).
+
+        Args:
+            generation (int): The generation.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        cells = self.shape[0] * self.shape[1]
+        alive = np.unpackbits(self._packed_state, count=cells).view(bool)
+        age = np.zeros(cells, dtype=AGE_DTYPE)
+        age[alive] = self._alive_age
+        for delta in self.deltas[:generation - self.start]:
+            if delta.dtype == np.uint32:
+                alive[delta] ^= True
+            else:
+                alive ^= np.unpackbits(delta, count=cells).view(bool)
+            age = next_age(alive, age)
+        return alive.astype(STATE_DTYPE).reshape(self.shape), age.reshape(self.shape)
+
+
+class Timeline:
+    """
+    This class represents the history of the generations of a board, to rewind it or scrub through it.
+
+    The history is a sequence of segments, each made of a keyframe and the deltas of up to
+    interval generations after it, so restoring a generation applies at most interval deltas.
+    A segment also ends when it uses half of the budget. When the history uses more memory than
+    the budget, the oldest segments are dropped, the current one being always kept.
+
+    Deltas only describe single generations: a multi-generation advance, or a generation
+    computed after the board was edited, starts a new keyframe. Computing a generation from
+    an earlier one drops the later history.
+
+    Args:
+        budget (int): The memory budget, in bytes.
+        interval (int): The maximum number of generations stored as deltas after a keyframe.
+
+    Attributes:
+        budget (int): The memory budget, in bytes.
+        interval (int): The maximum number of generations stored as deltas after a keyframe.
+        _segments (list): The segments, oldest first.
+        _synced (int): The generation of the timeline matching the board, None after an edit of the board.
+
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET, interval=DEFAULT_INTERVAL):
+        """
+        Initializes a new instance of Timeline.
+        """
+        self.budget = budget
+        self.interval = interval
+        self._segments = []
+        self._synced = None
+
+    @property
+    def first_generation(self):
+        """Returns the oldest generation retained, None if the timeline is empty."""
+        return self._segments[0].start if self._segments else None
+
+    @property
+    def last_generation(self):
+        """Returns the newest generation retained, None if the timeline is empty."""
+        return self._segments[-1].end if self._segments else None
+
+    @property
+    def size(self):
+        """Returns the number of bytes used by the timeline."""
+        return sum(segment.size for segment in self._segments)
+
+    def __contains__(self, generation):
+        """Returns whether a generation is retained."""
+        return bool(self._segments) and self.first_generation <= generation <= self.last_generation
+
+    def invalidate(self):
+        """Notifies the timeline that the board was edited, so it no longer matches its generation."""
+        self._synced = None
+
+    def seek(self, generation):
+        """
+        Notifies the timeline that the board was set back to a retained generation.
+
+        Args:
+            generation (int): The generation.
+        """
+        self._synced = generation
+
+    def clear(self):
+        """Removes all the generations."""
+        self._segments = []
+        self._synced = None
+
+    def record(self, old_state, old_age, state, age, generation, generations=1, flipped=None):
+        """
+        Records a generation computed by the board.
+
+        Args:
+            old_state (numpy.ndarray): The state matrix before the generations were computed.
+            old_age (numpy.ndarray): The age matrix before the generations were computed.
+            state (numpy.ndarray): The new state matrix.
+            age (numpy.ndarray): The new age matrix.
+            generation (int): The new generation.
+            generations (int): The number of generations computed.
+            flipped (numpy.ndarray): The flat indices of the cells born or died, None to compare the states.
+        """
+        base = generation - generations
+        if self._synced != base or base not in self:
+            # The board before the generations is not in the timeline as it is now
+            self._truncate(base - 1)
+            self._segments.append(Segment(old_state, old_age, base))
+        else:
+            # Generations after the base belong to the history the board was rewound from
+            self._truncate(base)
+
+        current = self._segments[-1]
+        if generations == 1 and len(current.deltas) < self.interval and current.size < self.budget // 2:
+            current.append(flipped if flipped is not None else np.flatnonzero(state != old_state))
+        else:
+            self._segments.append(Segment(state, age, generation))
+        self._synced = generation
+        self._evict()
+
+    def restore(self, generation):
+        """
+        Rebuilds the board at a retained generation.
+
+        Args:
+            generation (int): The generation.
+
+        Returns:
+            tuple: The state matrix and the age matrix of the generation.
+
+        Raises:
+            ValueError: If the generation is not retained.
+        """
+        if generation not in self:
+            raise ValueError(f"Generation {generation} is not in the history "
+                             f"({self.first_generation}-{self.last_generation})")
+        for segment in reversed(self._segments):
+            if segment.start <= generation:
+                return segment.restore(generation)
+
+    def _truncate(self, generation):
+        """Drops the generations after a generation."""
+        while self._segments and self._segments[-1].start > generation:
+            self._segments.pop()
+        if self._segments and self._segments[-1].end > generation:
+            self._segments[-1].truncate(generation)
+
+    def _evict(self):
+        """Drops the oldest segments until the timeline fits in the budget."""
+        size = self.size
+        while len(self._segments) > 1 and size > self.budget:
+            size -= self._segments.pop(0).size
@@ -0,0 +1,191 @@
+import contextlib
+import cProfile
+import csv
+import os
+import threading
+import time
+
+import numpy as np
+
+# Environment variable enabling the timings at startup when set to a non empty value other than "0"
+TIMINGS_VARIABLE = "GOL_TIMINGS"
+# Phase marking the end of a generation, used to count the generations profiled
+GENERATION_PHASE = "update"
+
+
+class Timings:
+    """
+    This class records how long each phase of a generation takes.
+
+    The durations of each phase (such as "update", "emit", "view" and "log") are stored in a ring
+    buffer holding the most recent samples, from which percentiles are computed. While disabled,
+    measuring a phase only costs a flag check.
+
+    The generations can also be profiled with cProfile: the profiler starts with the next
+    "update" phase and stops after a number of them, in the thread stepping the board.
+
+    Args:
+        capacity (int): The number of samples kept for each phase.
+        enabled (bool): Whether the durations are recorded.
+
+    Attributes:
+        enabled (bool): Whether the durations are recorded.
+        _samples (dict): The ring buffer of each phase, rows of (start time, duration) in seconds.
+        _counts (dict): The number of samples recorded for each phase.
+        _profile_request (tuple): The number of generations to profile and the output file, None if not requested.
+        _profiler (cProfile.Profile): The running profiler, None if not profiling.
+
+    """
+
+    def __init__(self, capacity=4096, enabled=False):
+        """
+        Initializes a new instance of Timings.
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._profile_request = None
+        self._profiler = None
+        self._profiler_thread = None
+        self._profiled_generations = 0
+
+    @classmethod
+    def from_environment(cls):
+        """Returns timings enabled when the GOL_TIMINGS environment variable is set."""
+        return cls(enabled=os.environ.get(TIMINGS_VARIABLE, "0") not in ("", "0"))
+
+    @contextlib.contextmanager
+    def measure(self, phase):
+        """
+        Measures the duration of the code run in the context.
+
+        Args:
+            phase (str): The name of the phase.
+        """
+        if not self.enabled and self._profile_request is None and self._profiler is None:
+            yield
+            return
+        if phase == GENERATION_PHASE:
+            self._start_profile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.record(phase, start, time.perf_counter() - start)
+            if phase == GENERATION_PHASE:
+                self._count_profiled_generation()
+
+    def record(self, phase, start, duration):
+        """
+        Records a sample of a phase, replacing the oldest one when the buffer is full.
+
+        Args:
+            phase (str): The name of the phase.
+            start (float): The time the phase started (time.perf_counter), in seconds.
+            duration (float): The duration of the phase, in seconds.
+        """
+        with self._lock:
+            if phase not in self._samples:
+                self._samples[phase] = np.zeros((self.capacity, 2))
+                self._counts[phase] = 0
+            self._samples[phase][self._counts[phase] % self.capacity] = (start, duration)
+            self._counts[phase] += 1
+
+    def clear(self):
+        """Removes all the samples."""
+        with self._lock:
+            self._samples = {}
+            self._counts = {}
+
+    def samples(self, phase):
+        """
+        Returns the samples of a phase still in the buffer, oldest first.
+
+        Args:
+            phase (str): The name of the phase.
+
+        Returns:
+            numpy.ndarray: The rows of (start time, duration) in seconds.
+        """
+        with self._lock:
+            if phase not in self._samples:
+                return np.zeros((0, 2))
+            count = self._counts[phase]
+            return np.roll(self._samples[phase], -count, axis=0)[-min(count, self.capacity):].copy()
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Returns statistics of the durations of each phase.
+
+        Args:
+            percentiles (tuple): The percentiles to compute.
+
+        Returns:
+            dict: For each phase, the number of samples, the mean, the maximum and the percentiles ("p50", ...),
+                in seconds.
+        """
+        summary = {}
+        for phase in list(self._samples):
+            durations = self.samples(phase)[:, 1]
+            if len(durations):
+                stats = {"count": self._counts[phase], "mean": float(durations.mean()), "max": float(durations.max())}
+                for percentile, value in zip(percentiles, np.percentile(durations, percentiles)):
+                    stats[f"p{percentile}"] = float(value)
+                summary[phase] = stats
+        return summary
+
+    def export_csv(self, path):
+        """
+        Writes the samples of every phase to a CSV file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase", "start", "seconds"])
+            for phase in list(self._samples):
+                for start, duration in self.samples(phase).tolist():
+                    writer.writerow([phase, f"{start:.6f}", f"{duration:.9f}"])
+
+    def profile(self, generations, path):
+        """
+        Requests profiling the next generations with cProfile.
+
+        Args:
+            generations (int): The number of generations to profile.
+            path (str): The file where the profile statistics are dumped (readable with pstats).
+        """
+        self._profile_request = (generations, path)
+
+    @property
+    def profiling(self):
+        """Returns whether a profile was requested and not dumped yet."""
+        return self._profile_request is not None
+
+    def _start_profile(self):
+        """Starts the requested profiler in the current thread, if not running yet."""
+        if self._profile_request is not None and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler_thread = threading.get_ident()
+            self._profiled_generations = 0
+            self._profiler.enable()
+
+    def _count_profiled_generation(self):
+        """Counts a profiled generation, stopping the profiler and dumping its statistics after the last one."""
+        if self._profiler is None or self._profiler_thread != threading.get_ident():
+            return
+        self._profiled_generations += 1
+        generations, path = self._profile_request
+        if self._profiled_generations >= generations:
+            self._profiler.disable()
+            self._profiler.dump_stats(path)
+            self._profiler = None
+            self._profile_request = None
+
+
+# Timings shared by the model and the views
+timings = Timings.from_environment()
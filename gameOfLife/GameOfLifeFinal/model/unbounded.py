@@ -0,0 +1,425 @@
+import numpy as np
+
+from GameOfLifeFinal.model.engine import AGE_DTYPE, AGE_MAX, STATE_DTYPE, Engine
+
+# Side of the chunks of the plane, in cells (a power of two)
+DEFAULT_CHUNK_SIZE = 16
+# Chunk coordinates are stored biased in the two 32 bit halves of a positive int64 code,
+# so the plane spans 2 ** 31 chunks in each direction
+CODE_BIAS = 1 << 30
+CODE_ROW = 1 << 32
+# Neighbor chunks as (dy, dx) offsets, in the order of the halo cells they provide
+NEIGHBORS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class SparsePlane:
+    """
+    This class represents an unbounded plane of cells stored as square chunks allocated on demand.
+
+    Only the chunks holding live cells are stored, in two stacked arrays (state and age) sorted by
+    the code of their chunk coordinates, followed by an empty chunk standing for every missing one.
+    A step computes the populated chunks, and the missing chunks next to live cells on their
+    edges, all at once: each chunk gets a halo of one cell gathered from the edges of its eight
+    neighbors, so the cost of a generation scales with the number of populated chunks. The chunks
+    left without live cells are dropped after each step.
+
+    Args:
+        chunk_size (int): The side of the chunks in cells, a power of two (default 16).
+
+    Attributes:
+        chunk_size (int): The side of the chunks in cells.
+        generation (int): The number of generations computed since the creation of the plane.
+        _codes (numpy.ndarray): The sorted codes of the stored chunks.
+        _state (numpy.ndarray): The uint8 states of the stored chunks, then the empty chunk.
+        _age (numpy.ndarray): The uint16 ages of the stored chunks, then the empty chunk.
+        active_chunks (int): The number of chunks computed in the last generation.
+
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initializes a new instance of SparsePlane.
+
+        Raises:
+            ValueError: If the chunk size is not a power of two.
+        """
+        if chunk_size < 1 or chunk_size & (chunk_size - 1):
+            raise ValueError(f"The chunk size must be a power of two, not {chunk_size}")
+        self.chunk_size = chunk_size
+        self._shift = chunk_size.bit_length() - 1
+        self.generation = 0
+        self.active_chunks = 0
+        self.clear()
+
+    @property
+    def chunks(self):
+        """Returns the number of stored chunks."""
+        return len(self._codes)
+
+    @property
+    def population(self):
+        """Returns the number of live cells of the plane."""
+        return int(np.count_nonzero(self._state))
+
+    def clear(self):
+        """Removes all the cells of the plane."""
+        size = self.chunk_size
+        self._codes = np.zeros(0, dtype=np.int64)
+        self._state = np.zeros((1, size, size), dtype=STATE_DTYPE)
+        self._age = np.zeros((1, size, size), dtype=AGE_DTYPE)
+
+    def bounding_box(self):
+        """
+        Returns the smallest rectangle holding the live cells.
+
+        Returns:
+            tuple: The (x0, y0, x1, y1) rectangle, x1 and y1 excluded, None if no cell is alive.
+        """
+        chunks = len(self._codes)
+        state = self._state[:chunks]
+        rows = state.any(axis=2)
+        columns = state.any(axis=1)
+        if not rows.any():
+            return None
+        cy, cx = self._decode(self._codes)
+        # Global coordinates of the occupied rows and columns of every chunk
+        ys = (cy[:, None] << self._shift) + np.arange(self.chunk_size)
+        xs = (cx[:, None] << self._shift) + np.arange(self.chunk_size)
+        return int(xs[columns].min()), int(ys[rows].min()), int(xs[columns].max()) + 1, int(ys[rows].max()) + 1
+
+    def cells(self):
+        """
+        Returns the live cells of the plane.
+
+        Returns:
+            tuple: The x-coordinates, y-coordinates and ages of the live cells.
+        """
+        slots, ys, xs = np.nonzero(self._state[:len(self._codes)])
+        cy, cx = self._decode(self._codes[slots])
+        return (cx << self._shift) + xs, (cy << self._shift) + ys, self._age[slots, ys, xs]
+
+    def region(self, x0, y0, width, height):
+        """
+        Copies a rectangular window of the plane.
+
+        Args:
+            x0 (int): The x-coordinate of the north-west corner of the window.
+            y0 (int): The y-coordinate of the north-west corner of the window.
+            width (int): The width of the window.
+            height (int): The height of the window.
+
+        Returns:
+            tuple: The state and age matrices of the window.
+        """
+        size, shift = self.chunk_size, self._shift
+        # Grid of the chunks covering the window, in which the window starts at (top, left)
+        first_y, first_x = y0 >> shift, x0 >> shift
+        rows = ((y0 + height - 1) >> shift) - first_y + 1
+        columns = ((x0 + width - 1) >> shift) - first_x + 1
+        top, left = y0 - (first_y << shift), x0 - (first_x << shift)
+        slots, tops, lefts = self._overlapping(x0, y0, x0 + width, y0 + height)
+        grid_y, grid_x = (tops >> shift) - first_y, (lefts >> shift) - first_x
+
+        matrices = []
+        for chunks in (self._state, self._age):
+            grid = np.zeros((rows, columns, size, size), dtype=chunks.dtype)
+            grid[grid_y, grid_x] = chunks[slots]
+            grid = grid.transpose(0, 2, 1, 3).reshape(rows * size, columns * size)
+            matrices.append(np.ascontiguousarray(grid[top:top + height, left:left + width]))
+        return tuple(matrices)
+
+    def write_region(self, x0, y0, state, age):
+        """
+        Replaces the cells of a rectangular window of the plane.
+
+        Args:
+            x0 (int): The x-coordinate of the north-west corner of the window.
+            y0 (int): The y-coordinate of the north-west corner of the window.
+            state (numpy.ndarray): The state matrix of the window.
+            age (numpy.ndarray): The age matrix of the window.
+        """
+        height, width = state.shape
+        slots, tops, lefts = self._overlapping(x0, y0, x0 + width, y0 + height)
+        if len(slots):
+            # Clear the parts of the chunks inside the window
+            offsets = np.arange(self.chunk_size)
+            rows = (tops[:, None] + offsets >= y0) & (tops[:, None] + offsets < y0 + height)
+            columns = (lefts[:, None] + offsets >= x0) & (lefts[:, None] + offsets < x0 + width)
+            inside = rows[:, :, None] & columns[:, None, :]
+            self._state[slots] = np.where(inside, 0, self._state[slots])
+            self._age[slots] = np.where(inside, 0, self._age[slots])
+        ys, xs = np.nonzero(state)
+        self.write_cells(xs + x0, ys + y0, state[ys, xs], age[ys, xs])
+
+    def write_cells(self, xs, ys, states, ages):
+        """
+        Sets the state and age of some cells, allocating the chunks of the new live cells.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates of the cells.
+            ys (numpy.ndarray): The y-coordinates of the cells.
+            states (numpy.ndarray): The new states of the cells.
+            ages (numpy.ndarray): The new ages of the cells.
+        """
+        xs, ys = np.asarray(xs, dtype=np.int64), np.asarray(ys, dtype=np.int64)
+        states, ages = np.asarray(states, dtype=STATE_DTYPE), np.asarray(ages, dtype=AGE_DTYPE)
+        codes = self._encode(ys >> self._shift, xs >> self._shift)
+        self._allocate(codes[states != 0])
+        slots = self._slots(codes)
+        # Dead cells of missing chunks are dead already, the empty chunk must stay empty
+        stored = slots < len(self._codes)
+        mask = self.chunk_size - 1
+        self._state[slots[stored], ys[stored] & mask, xs[stored] & mask] = states[stored]
+        self._age[slots[stored], ys[stored] & mask, xs[stored] & mask] = ages[stored]
+
+    def step(self):
+        """
+        Computes the next generation of the plane, dropping the chunks left empty.
+        """
+        size = self.chunk_size
+        state = self._state
+        chunks = len(self._codes)
+        if not chunks:
+            self.active_chunks = 0
+            self.generation += 1
+            return
+
+        # Missing chunks are only computed next to the live cells on the edges of their neighbors
+        stored = state[:chunks]
+        edges = {
+            (-1, 0): stored[:, 0, :].any(axis=1), (1, 0): stored[:, -1, :].any(axis=1),
+            (0, -1): stored[:, :, 0].any(axis=1), (0, 1): stored[:, :, -1].any(axis=1),
+        }
+        candidates = [self._codes]
+        for dy, dx in NEIGHBORS:
+            if dy and dx:
+                near = stored[:, 0 if dy < 0 else -1, 0 if dx < 0 else -1] != 0
+            else:
+                near = edges[(dy, dx)]
+            candidates.append(self._codes[near] + dy * CODE_ROW + dx)
+        active = np.unique(np.concatenate(candidates))
+        self.active_chunks = len(active)
+
+        # Each active chunk with its halo gathered from the edges of its neighbors
+        slots = self._slots(active)
+        padded = np.zeros((len(active), size + 2, size + 2), dtype=STATE_DTYPE)
+        padded[:, 1:-1, 1:-1] = state[slots]
+        for dy, dx in NEIGHBORS:
+            neighbor = self._slots(active + dy * CODE_ROW + dx)
+            rows = slice(1, -1) if not dy else (0 if dy < 0 else -1)
+            columns = slice(1, -1) if not dx else (0 if dx < 0 else -1)
+            source_rows = slice(None) if not dy else (-1 if dy < 0 else 0)
+            source_columns = slice(None) if not dx else (-1 if dx < 0 else 0)
+            padded[:, rows, columns] = state[neighbor, source_rows, source_columns]
+
+        # Neighbor counts as the sum of the eight shifted slices of the padded chunks
+        counts = np.zeros((len(active), size, size), dtype=np.uint8)
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                if dx == 1 and dy == 1:
+                    continue  # Skip the current cell
+                counts += padded[:, dy:dy + size, dx:dx + size]
+        # Birth with 3 neighbors, survival with 2 or 3 neighbors
+        alive = (counts == 3) | ((padded[:, 1:-1, 1:-1] == 1) & (counts == 2))
+        age = self._age[slots]
+        age = np.where(alive, age + (age < AGE_MAX), 0).astype(AGE_DTYPE)
+
+        # Only the chunks still holding live cells are kept, the codes stay sorted
+        kept = alive.reshape(len(active), -1).any(axis=1)
+        self._codes = active[kept]
+        self._state = np.concatenate((alive[kept].astype(STATE_DTYPE), np.zeros((1, size, size), STATE_DTYPE)))
+        self._age = np.concatenate((age[kept], np.zeros((1, size, size), AGE_DTYPE)))
+        self.generation += 1
+
+    def _allocate(self, codes):
+        """Adds empty chunks for the codes not stored yet, keeping the codes sorted."""
+        new = np.setdiff1d(codes, self._codes)
+        if not len(new):
+            return
+        size = self.chunk_size
+        chunks = len(self._codes)
+        codes = np.concatenate((self._codes, new))
+        order = np.argsort(codes, kind="stable")
+        empty = np.zeros((len(new) + 1, size, size), dtype=STATE_DTYPE)
+        self._codes = codes[order]
+        self._state = np.concatenate((self._state[:chunks], empty))[np.append(order, len(order))]
+        self._age = np.concatenate((self._age[:chunks], empty.astype(AGE_DTYPE)))[np.append(order, len(order))]
+
+    def _slots(self, codes):
+        """Returns the slots of the chunks with the given codes, the slot of the empty chunk for missing ones."""
+        chunks = len(self._codes)
+        slots = np.searchsorted(self._codes, codes)
+        found = slots < chunks
+        found[found] = self._codes[slots[found]] == codes[found]
+        return np.where(found, slots, chunks)
+
+    def _overlapping(self, x0, y0, x1, y1):
+        """Returns the slots and the top and left coordinates of the stored chunks overlapping a rectangle."""
+        cy, cx = self._decode(self._codes)
+        tops, lefts = cy << self._shift, cx << self._shift
+        overlap = (tops < y1) & (tops + self.chunk_size > y0) & (lefts < x1) & (lefts + self.chunk_size > x0)
+        slots = np.flatnonzero(overlap)
+        return slots, tops[slots], lefts[slots]
+
+    @staticmethod
+    def _encode(cy, cx):
+        """Returns the codes of chunk coordinates, ordered by row then column."""
+        return (cy + CODE_BIAS) * CODE_ROW + (cx + CODE_BIAS)
+
+    @staticmethod
+    def _decode(codes):
+        """Returns the chunk coordinates of codes."""
+        return (codes >> 32) - CODE_BIAS, (codes & (CODE_ROW - 1)) - CODE_BIAS
+
+
+class UnboundedEngine(Engine):
+    """
+    This class represents the unbounded engine.
+
+    The cells live on an unbounded sparse plane, and the board is a window onto it: cells crossing
+    the border of the board keep evolving outside of it and come back if they return. The plane is
+    kept between generations, and the edits of the board are written back to it before the next
+    step. Setting a new board replaces the whole plane with it, while the window can be moved over
+    the plane with move_window.
+
+    Cycles are detected on the window only, so they may not be cycles of the whole plane.
+
+    Args:
+        chunk_size (int): The side of the chunks of the plane in cells, a power of two (default 16).
+
+    Attributes:
+        window_x (int): The x-coordinate of the north-west corner of the board on the plane.
+        window_y (int): The y-coordinate of the north-west corner of the board on the plane.
+        _plane (SparsePlane): The plane of the cells.
+        _current (numpy.ndarray): The state matrix of the board in sync with the plane, None if none.
+        _edited (list): The (x, y) cells of the board edited since the last step.
+        _window_edited (bool): Whether the whole board was edited since the last step.
+
+    """
+
+    name = "unbounded"
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initializes a new instance of UnboundedEngine.
+        """
+        self._plane = SparsePlane(chunk_size)
+        self.window_x = 0
+        self.window_y = 0
+        self._current = None
+        self._edited = []
+        self._window_edited = False
+
+    @property
+    def plane(self):
+        """Returns the plane of the cells."""
+        return self._plane
+
+    def invalidate(self, x=None, y=None):
+        """
+        Marks a cell, or the whole board, as edited outside the engine.
+
+        Args:
+            x (int): The x-coordinate of the edited cell, None for the whole board.
+            y (int): The y-coordinate of the edited cell, None for the whole board.
+        """
+        if x is None:
+            self._window_edited = True
+        else:
+            self._edited.append((x, y))
+
+    def report(self):
+        """Returns the population and the bounding box of the plane, and the position of the board on it."""
+        box = self._plane.bounding_box()
+        extent = f"({box[0]}, {box[1]})-({box[2]}, {box[3]})" if box is not None else "empty"
+        return (f"Plane Population: {self._plane.population} - Live Box: {extent} - "
+                f"Window: ({self.window_x}, {self.window_y}) - Chunks: {self._plane.chunks}")
+
+    def step(self, state, age):
+        """
+        Computes the next generation of the plane and copies the window of the board.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        self._sync(state, age)
+        self._plane.step()
+        return self._window(state.shape)
+
+    def advance(self, state, age, generations):
+        """
+        Computes the board after a number of generations, copying the window of the board once.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states (0 for dead, 1 for alive).
+            age (numpy.ndarray): The matrix of cell ages.
+            generations (int): The number of generations to compute.
+
+        Returns:
+            tuple: The new state matrix and the new age matrix.
+        """
+        self._sync(state, age)
+        for _ in range(generations):
+            self._plane.step()
+        return self._window(state.shape)
+
+    def move_window(self, state, age, x, y):
+        """
+        Moves the board to another window of the plane.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states of the board.
+            age (numpy.ndarray): The matrix of cell ages of the board.
+            x (int): The x-coordinate of the new north-west corner of the board on the plane.
+            y (int): The y-coordinate of the new north-west corner of the board on the plane.
+
+        Returns:
+            tuple: The state and age matrices of the new window, to be set on the board.
+        """
+        self._sync(state, age)
+        self.window_x, self.window_y = x, y
+        return self._window(state.shape)
+
+    def center_window(self, state, age):
+        """
+        Moves the board to the window centered on the live cells of the plane, if any.
+
+        Args:
+            state (numpy.ndarray): The matrix of cell states of the board.
+            age (numpy.ndarray): The matrix of cell ages of the board.
+
+        Returns:
+            tuple: The state and age matrices of the new window, to be set on the board.
+        """
+        self._sync(state, age)
+        box = self._plane.bounding_box()
+        if box is None:
+            return state, age
+        height, width = state.shape
+        x0, y0, x1, y1 = box
+        return self.move_window(state, age, (x0 + x1 - width) // 2, (y0 + y1 - height) // 2)
+
+    def _sync(self, state, age):
+        """Writes the board to the plane: the whole plane if the board was replaced, else its edits."""
+        if state is not self._current:
+            self._plane.clear()
+            self._plane.write_region(self.window_x, self.window_y, state, age)
+        elif self._window_edited:
+            self._plane.write_region(self.window_x, self.window_y, state, age)
+        elif self._edited:
+            xs, ys = np.array(self._edited, dtype=np.int64).T
+            self._plane.write_cells(xs + self.window_x, ys + self.window_y, state[ys, xs], age[ys, xs])
+        self._current = state
+        self._edited = []
+        self._window_edited = False
+
+    def _window(self, shape):
+        """Returns the state and age matrices of the window of the board, now in sync with the plane."""
+        height, width = shape
+        state, age = self._plane.region(self.window_x, self.window_y, width, height)
+        self._current = state
+        return state, age
@@ -35,6 +35,9 @@ class Ui_MainWindow(object):
         self.startPauseButton = QtWidgets.QPushButton(self.centralwidget)
         self.startPauseButton.setObjectName("startPauseButton")
         self.buttonLayout.addWidget(self.startPauseButton)
+        self.previousGenButton = QtWidgets.QPushButton(self.centralwidget)
+        self.previousGenButton.setObjectName("previousGenButton")
+        self.buttonLayout.addWidget(self.previousGenButton)
         self.nextGenButton = QtWidgets.QPushButton(self.centralwidget)
         self.nextGenButton.setObjectName("nextGenButton")
         self.buttonLayout.addWidget(self.nextGenButton)
@@ -42,6 +45,17 @@ class Ui_MainWindow(object):
         self.clearButton.setObjectName("clearButton")
         self.buttonLayout.addWidget(self.clearButton)
         self.firstColumnLayout.addLayout(self.buttonLayout)
+        self.historyLayout = QtWidgets.QHBoxLayout()
+        self.historyLayout.setObjectName("historyLayout")
+        self.historyLabel = QtWidgets.QLabel(self.centralwidget)
+        self.historyLabel.setObjectName("historyLabel")
+        self.historyLayout.addWidget(self.historyLabel)
+        self.historySlider = QtWidgets.QSlider(self.centralwidget)
+        self.historySlider.setMaximum(0)
+        self.historySlider.setOrientation(QtCore.Qt.Horizontal)
+        self.historySlider.setObjectName("historySlider")
+        self.historyLayout.addWidget(self.historySlider)
+        self.firstColumnLayout.addLayout(self.historyLayout)
         self.framerateLayout = QtWidgets.QHBoxLayout()
         self.framerateLayout.setObjectName("framerateLayout")
         self.frameRateLabel = QtWidgets.QLabel(self.centralwidget)
@@ -51,11 +65,14 @@ class Ui_MainWindow(object):
         self.framerateLayout.addItem(spacerItem)
         self.frameRateSlider = QtWidgets.QSlider(self.centralwidget)
         self.frameRateSlider.setMinimum(1)
-        self.frameRateSlider.setMaximum(15)
+        self.frameRateSlider.setMaximum(60)
         self.frameRateSlider.setProperty("value", 5)
         self.frameRateSlider.setOrientation(QtCore.Qt.Horizontal)
         self.frameRateSlider.setObjectName("frameRateSlider")
         self.framerateLayout.addWidget(self.frameRateSlider)
+        self.speedLabel = QtWidgets.QLabel(self.centralwidget)
+        self.speedLabel.setObjectName("speedLabel")
+        self.framerateLayout.addWidget(self.speedLabel)
         self.firstColumnLayout.addLayout(self.framerateLayout)
         self.zoomLayout = QtWidgets.QHBoxLayout()
         self.zoomLayout.setObjectName("zoomLayout")
@@ -70,13 +87,42 @@ class Ui_MainWindow(object):
         spacerItem1 = QtWidgets.QSpacerItem(55, 20, QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Minimum)
         self.zoomLayout.addItem(spacerItem1)
         self.zoomSlider = QtWidgets.QSlider(self.centralwidget)
-        self.zoomSlider.setMinimum(5)
+        self.zoomSlider.setMinimum(-4)
         self.zoomSlider.setMaximum(25)
         self.zoomSlider.setProperty("value", 15)
         self.zoomSlider.setOrientation(QtCore.Qt.Horizontal)
         self.zoomSlider.setObjectName("zoomSlider")
         self.zoomLayout.addWidget(self.zoomSlider)
         self.firstColumnLayout.addLayout(self.zoomLayout)
+        self.engineLayout = QtWidgets.QHBoxLayout()
+        self.engineLayout.setObjectName("engineLayout")
+        self.engineLabel = QtWidgets.QLabel(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.engineLabel.sizePolicy().hasHeightForWidth())
+        self.engineLabel.setSizePolicy(sizePolicy)
+        self.engineLabel.setObjectName("engineLabel")
+        self.engineLayout.addWidget(self.engineLabel)
+        self.engineBox = QtWidgets.QComboBox(self.centralwidget)
+        self.engineBox.setObjectName("engineBox")
+        self.engineLayout.addWidget(self.engineBox)
+        self.centerButton = QtWidgets.QPushButton(self.centralwidget)
+        self.centerButton.setEnabled(False)
+        self.centerButton.setObjectName("centerButton")
+        self.engineLayout.addWidget(self.centerButton)
+        self.renderLabel = QtWidgets.QLabel(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.renderLabel.sizePolicy().hasHeightForWidth())
+        self.renderLabel.setSizePolicy(sizePolicy)
+        self.renderLabel.setObjectName("renderLabel")
+        self.engineLayout.addWidget(self.renderLabel)
+        self.renderBox = QtWidgets.QComboBox(self.centralwidget)
+        self.renderBox.setObjectName("renderBox")
+        self.engineLayout.addWidget(self.renderBox)
+        self.firstColumnLayout.addLayout(self.engineLayout)
         self.loadingLayout = QtWidgets.QHBoxLayout()
         self.loadingLayout.setObjectName("loadingLayout")
         self.sizeLabel = QtWidgets.QLabel(self.centralwidget)
@@ -93,11 +139,23 @@ class Ui_MainWindow(object):
         sizePolicy.setVerticalStretch(0)
         sizePolicy.setHeightForWidth(self.sizeBox.sizePolicy().hasHeightForWidth())
         self.sizeBox.setSizePolicy(sizePolicy)
+        self.sizeBox.setMaximum(8192)
         self.sizeBox.setObjectName("sizeBox")
         self.loadingLayout.addWidget(self.sizeBox)
         self.resizeButton = QtWidgets.QPushButton(self.centralwidget)
         self.resizeButton.setObjectName("resizeButton")
         self.loadingLayout.addWidget(self.resizeButton)
+        self.topologyLabel = QtWidgets.QLabel(self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.topologyLabel.sizePolicy().hasHeightForWidth())
+        self.topologyLabel.setSizePolicy(sizePolicy)
+        self.topologyLabel.setObjectName("topologyLabel")
+        self.loadingLayout.addWidget(self.topologyLabel)
+        self.topologyBox = QtWidgets.QComboBox(self.centralwidget)
+        self.topologyBox.setObjectName("topologyBox")
+        self.loadingLayout.addWidget(self.topologyBox)
         self.firstColumnLayout.addLayout(self.loadingLayout)
         self.loadPatternLayout = QtWidgets.QHBoxLayout()
         self.loadPatternLayout.setObjectName("loadPatternLayout")
@@ -136,6 +194,32 @@ class Ui_MainWindow(object):
         self.logBrowser.setSizePolicy(sizePolicy)
         self.logBrowser.setObjectName("logBrowser")
         self.secondColumnLayout.addWidget(self.logBrowser)
+        self.populationChart = PopulationChart(self.centralwidget)
+        self.populationChart.setMinimumSize(QtCore.QSize(0, 100))
+        self.populationChart.setObjectName("populationChart")
+        self.secondColumnLayout.addWidget(self.populationChart)
+        self.exportLogButton = QtWidgets.QPushButton(self.centralwidget)
+        self.exportLogButton.setObjectName("exportLogButton")
+        self.secondColumnLayout.addWidget(self.exportLogButton)
+        self.cycleCheckBox = QtWidgets.QCheckBox(self.centralwidget)
+        self.cycleCheckBox.setObjectName("cycleCheckBox")
+        self.secondColumnLayout.addWidget(self.cycleCheckBox)
+        self.timingsLayout = QtWidgets.QHBoxLayout()
+        self.timingsLayout.setObjectName("timingsLayout")
+        self.timingsCheckBox = QtWidgets.QCheckBox(self.centralwidget)
+        self.timingsCheckBox.setObjectName("timingsCheckBox")
+        self.timingsLayout.addWidget(self.timingsCheckBox)
+        self.exportTimingsButton = QtWidgets.QPushButton(self.centralwidget)
+        self.exportTimingsButton.setObjectName("exportTimingsButton")
+        self.timingsLayout.addWidget(self.exportTimingsButton)
+        self.profileButton = QtWidgets.QPushButton(self.centralwidget)
+        self.profileButton.setObjectName("profileButton")
+        self.timingsLayout.addWidget(self.profileButton)
+        self.secondColumnLayout.addLayout(self.timingsLayout)
+        self.timingsLabel = QtWidgets.QLabel(self.centralwidget)
+        self.timingsLabel.setText("")
+        self.timingsLabel.setObjectName("timingsLabel")
+        self.secondColumnLayout.addWidget(self.timingsLabel)
         spacerItem2 = QtWidgets.QSpacerItem(20, 30, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
         self.secondColumnLayout.addItem(spacerItem2)
         self.aboutLabel = QtWidgets.QLabel(self.centralwidget)
@@ -157,10 +241,17 @@ class Ui_MainWindow(object):
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
         self.statusbar.setObjectName("statusbar")
         MainWindow.setStatusBar(self.statusbar)
+        self.actionOpen = QtWidgets.QAction(MainWindow)
+        self.actionOpen.setObjectName("actionOpen")
+        self.actionSave = QtWidgets.QAction(MainWindow)
+        self.actionSave.setObjectName("actionSave")
         self.actionQuit = QtWidgets.QAction(MainWindow)
         self.actionQuit.setObjectName("actionQuit")
         self.actionAbout = QtWidgets.QAction(MainWindow)
         self.actionAbout.setObjectName("actionAbout")
+        self.menuFile.addAction(self.actionOpen)
+        self.menuFile.addAction(self.actionSave)
+        self.menuFile.addSeparator()
         self.menuFile.addAction(self.actionQuit)
         self.menuHelp.addAction(self.actionAbout)
         self.menubar.addAction(self.menuFile.menuAction())
@@ -174,21 +265,39 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(_translate("MainWindow", "Game Of Life"))
         self.startPauseButton.setStatusTip(_translate("MainWindow", "Start / Pause the game"))
         self.startPauseButton.setText(_translate("MainWindow", "Start Simulation"))
+        self.previousGenButton.setStatusTip(_translate("MainWindow", "Show Previous Generation"))
+        self.previousGenButton.setText(_translate("MainWindow", "Previous Generation"))
         self.nextGenButton.setStatusTip(_translate("MainWindow", "Show Next Generation"))
         self.nextGenButton.setText(_translate("MainWindow", "Next Generation"))
         self.clearButton.setStatusTip(_translate("MainWindow", "Clear the board"))
         self.clearButton.setText(_translate("MainWindow", "Clear Board"))
+        self.historyLabel.setStatusTip(_translate("MainWindow", "Rewind or scrub through the generations kept in the history"))
+        self.historyLabel.setText(_translate("MainWindow", "History: "))
+        self.historySlider.setStatusTip(_translate("MainWindow", "Rewind or scrub through the generations kept in the history"))
         self.frameRateLabel.setStatusTip(_translate("MainWindow", "Adjust Frame Rate"))
         self.frameRateLabel.setText(_translate("MainWindow", "Frame Rate: "))
         self.frameRateSlider.setStatusTip(_translate("MainWindow", "Adjust Frame Rate"))
+        self.speedLabel.setStatusTip(_translate("MainWindow", "Generations computed per second"))
+        self.speedLabel.setText(_translate("MainWindow", "0.0 gen/s"))
         self.zoomLabel.setStatusTip(_translate("MainWindow", "Zoom In / Zoom Out"))
         self.zoomLabel.setText(_translate("MainWindow", "Zoom: "))
         self.zoomSlider.setStatusTip(_translate("MainWindow", "Zoom In / Zoom Out"))
+        self.engineLabel.setStatusTip(_translate("MainWindow", "Choose the engine computing the next generations"))
+        self.engineLabel.setText(_translate("MainWindow", "Engine: "))
+        self.engineBox.setStatusTip(_translate("MainWindow", "Choose the engine computing the next generations"))
+        self.centerButton.setStatusTip(_translate("MainWindow", "Move the board over the live cells of the unbounded plane (drag past the edges of the board to pan it)"))
+        self.centerButton.setText(_translate("MainWindow", "Center"))
+        self.renderLabel.setStatusTip(_translate("MainWindow", "Choose how the board is drawn"))
+        self.renderLabel.setText(_translate("MainWindow", "Rendering: "))
+        self.renderBox.setStatusTip(_translate("MainWindow", "Choose how the board is drawn"))
         self.sizeLabel.setStatusTip(_translate("MainWindow", "Resize the board"))
         self.sizeLabel.setText(_translate("MainWindow", "Change Size (NxN): "))
         self.sizeBox.setStatusTip(_translate("MainWindow", "Resize the board"))
         self.resizeButton.setStatusTip(_translate("MainWindow", "Resize the board"))
         self.resizeButton.setText(_translate("MainWindow", "Resize"))
+        self.topologyLabel.setStatusTip(_translate("MainWindow", "Choose what lies past the edges of the board"))
+        self.topologyLabel.setText(_translate("MainWindow", "Edges: "))
+        self.topologyBox.setStatusTip(_translate("MainWindow", "Choose what lies past the edges of the board"))
         self.patternLabel_1.setStatusTip(_translate("MainWindow", "Load a predefined pattern starting from provided coordinates"))
         self.patternLabel_1.setText(_translate("MainWindow", "Load at X: "))
         self.startXSpinBox.setStatusTip(_translate("MainWindow", "Load a predefined pattern starting from provided coordinates"))
@@ -197,8 +306,27 @@ class Ui_MainWindow(object):
         self.patternButton.setStatusTip(_translate("MainWindow", "Load a predefined pattern starting from provided coordinates"))
         self.patternButton.setText(_translate("MainWindow", "Choose a Pattern"))
         self.logLabel.setText(_translate("MainWindow", "Log Generation: # / Alive Cells: #"))
+        self.populationChart.setStatusTip(_translate("MainWindow", "Alive cells of the most recent generations"))
+        self.exportLogButton.setStatusTip(_translate("MainWindow", "Export the population of every logged generation to a CSV or binary file"))
+        self.exportLogButton.setText(_translate("MainWindow", "Export Log"))
+        self.cycleCheckBox.setStatusTip(_translate("MainWindow", "Detect still lifes and oscillators, pausing the simulation when the board enters one"))
+        self.cycleCheckBox.setText(_translate("MainWindow", "Pause on Cycles"))
+        self.timingsCheckBox.setStatusTip(_translate("MainWindow", "Record how long each phase of a generation takes"))
+        self.timingsCheckBox.setText(_translate("MainWindow", "Timings"))
+        self.exportTimingsButton.setStatusTip(_translate("MainWindow", "Export the recorded timings to a CSV file"))
+        self.exportTimingsButton.setText(_translate("MainWindow", "Export Timings"))
+        self.profileButton.setStatusTip(_translate("MainWindow", "Profile the next 100 generations with cProfile"))
+        self.profileButton.setText(_translate("MainWindow", "Profile"))
+        self.timingsLabel.setStatusTip(_translate("MainWindow", "Median and 99th percentile of the duration of each phase"))
         self.aboutLabel.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-weight:600;\">Game Of Life Project</span></p><p align=\"center\"><br/>Created for Human Computer Interaction Exam </p><p align=\"center\"><br/>Author: Lorenzo Giannella</p></body></html>"))
         self.menuFile.setTitle(_translate("MainWindow", "&File"))
         self.menuHelp.setTitle(_translate("MainWindow", "&Help"))
+        self.actionOpen.setText(_translate("MainWindow", "&Open Snapshot..."))
+        self.actionOpen.setStatusTip(_translate("MainWindow", "Load a board saved in a snapshot file"))
+        self.actionOpen.setShortcut(_translate("MainWindow", "Ctrl+O"))
+        self.actionSave.setText(_translate("MainWindow", "&Save Snapshot..."))
+        self.actionSave.setStatusTip(_translate("MainWindow", "Save the board, with its generation and the age of its cells, to a snapshot file"))
+        self.actionSave.setShortcut(_translate("MainWindow", "Ctrl+S"))
         self.actionQuit.setText(_translate("MainWindow", "&Quit"))
         self.actionAbout.setText(_translate("MainWindow", "&About"))
+from GameOfLifeFinal.view.population_chart import PopulationChart
@@ -17,9 +17,20 @@ class Ui_LoadPatternDialog(object):
         LoadPatternDialog.resize(400, 300)
         self.verticalLayout = QtWidgets.QVBoxLayout(LoadPatternDialog)
         self.verticalLayout.setObjectName("verticalLayout")
+        self.filterLineEdit = QtWidgets.QLineEdit(LoadPatternDialog)
+        self.filterLineEdit.setClearButtonEnabled(True)
+        self.filterLineEdit.setObjectName("filterLineEdit")
+        self.verticalLayout.addWidget(self.filterLineEdit)
         self.patternsListWidget = QtWidgets.QListWidget(LoadPatternDialog)
         self.patternsListWidget.setObjectName("patternsListWidget")
         self.verticalLayout.addWidget(self.patternsListWidget)
+        self.buttonsLayout = QtWidgets.QHBoxLayout()
+        self.buttonsLayout.setObjectName("buttonsLayout")
+        self.importButton = QtWidgets.QPushButton(LoadPatternDialog)
+        self.importButton.setObjectName("importButton")
+        self.buttonsLayout.addWidget(self.importButton)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.buttonsLayout.addItem(spacerItem)
         self.loadButton = QtWidgets.QPushButton(LoadPatternDialog)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -28,7 +39,8 @@ class Ui_LoadPatternDialog(object):
         self.loadButton.setSizePolicy(sizePolicy)
         self.loadButton.setLayoutDirection(QtCore.Qt.RightToLeft)
         self.loadButton.setObjectName("loadButton")
-        self.verticalLayout.addWidget(self.loadButton)
+        self.buttonsLayout.addWidget(self.loadButton)
+        self.verticalLayout.addLayout(self.buttonsLayout)
 
         self.retranslateUi(LoadPatternDialog)
         QtCore.QMetaObject.connectSlotsByName(LoadPatternDialog)
@@ -36,4 +48,6 @@ class Ui_LoadPatternDialog(object):
     def retranslateUi(self, LoadPatternDialog):
         _translate = QtCore.QCoreApplication.translate
         LoadPatternDialog.setWindowTitle(_translate("LoadPatternDialog", "Dialog"))
+        self.filterLineEdit.setPlaceholderText(_translate("LoadPatternDialog", "Filter patterns"))
+        self.importButton.setText(_translate("LoadPatternDialog", "Import File..."))
         self.loadButton.setText(_translate("LoadPatternDialog", "Load Pattern"))
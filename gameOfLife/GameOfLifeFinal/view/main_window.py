@@ -1,14 +1,26 @@
-import json
-import os
+import collections
 import sys
+import time
 import numpy as np
 
-from PyQt5.QtWidgets import QApplication, QMainWindow, QGraphicsScene, QGraphicsRectItem, QDialog, QMessageBox
-from PyQt5.QtGui import QBrush, QColor
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QGraphicsScene, QGraphicsView, QDialog, QMessageBox,
+                             QFileDialog, QListWidgetItem)
+from PyQt5.QtCore import Qt, QPoint, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon
 
 from GameOfLifeFinal.model.board import Board
-from GameOfLifeFinal.model.cell import Cell
+from GameOfLifeFinal.model.engine import TOPOLOGIES
+from GameOfLifeFinal.model.engines import ENGINES
+from GameOfLifeFinal.model.pattern_files import PATTERN_FORMATS, PatternLibrary, place_pattern_file
+from GameOfLifeFinal.model.patterns import load_patterns, place_pattern
+from GameOfLifeFinal.model.qt_observer import QtObservable
+from GameOfLifeFinal.model.snapshot import EXTENSION, load_snapshot, save_snapshot
+from GameOfLifeFinal.model.thumbnails import THUMBNAIL_SIZE, ThumbnailCache
+from GameOfLifeFinal.model.timing import timings
+from GameOfLifeFinal.model.unbounded import UnboundedEngine
+from GameOfLifeFinal.view.renderers import RENDERERS
+from GameOfLifeFinal.view.simulation import SimulationThread
+from GameOfLifeFinal.view.thumbnails import ThumbnailLoader, thumbnail_icon
 from Ui_GameOfLife import Ui_MainWindow
 from Ui_AboutDialog import Ui_Dialog
 from Ui_LoadPatternDialog import Ui_LoadPatternDialog
@@ -18,6 +30,9 @@ class MainWindow(QMainWindow):
     """
     This class represents the main window (Controller) of the Game of Life application.
 
+    While the simulation runs, the board is stepped by a SimulationThread at the selected rate, and
+    the view draws the latest generation available up to DISPLAY_RATE times per second.
+
     Args:
         game_board (Board): The game board model.
 
@@ -25,14 +40,19 @@ class MainWindow(QMainWindow):
         explained in detail in the init method
     """
 
+    # Maximum number of times per second the view is refreshed while the simulation runs
+    DISPLAY_RATE = 30
+    # Number of generations profiled by the profile button
+    PROFILE_GENERATIONS = 100
+    # Number of most recent lines kept in the log browser, the full history is in the population log
+    LOG_LINES = 500
+
     def __init__(self, game_board):
         """Initializes a new instance of MainWindow."""
         super().__init__()
 
         # Reference to the game board model.
         self._game_board = game_board
-        # Reference to the current state of the game board.
-        self._game_board_grid = game_board.value
 
         # Load the UI from the .ui file
         self.ui = Ui_MainWindow()
@@ -43,6 +63,8 @@ class MainWindow(QMainWindow):
         self._loadPatternDialog = LoadPatternDialog()
         self.ui.actionAbout.triggered.connect(self._aboutDialog.exec_)
         self.ui.actionQuit.triggered.connect(QApplication.exit)
+        self.ui.actionOpen.triggered.connect(lambda: self.load_board())
+        self.ui.actionSave.triggered.connect(lambda: self.save_board())
         self.ui.patternButton.clicked.connect(self._loadPatternDialog.exec_)
 
         # Set up the scene for the game board
@@ -59,28 +81,69 @@ class MainWindow(QMainWindow):
         self._frameRateLabel = self.ui.frameRateLabel
         # set initial text of the frame rate label
         self._frameRateLabel.setText(f"Frame Rate: {self._frameRateSlider.value()}")
+        # Fill the engine box with the available engines and select the one of the board
+        self.ui.engineBox.addItems(list(ENGINES))
+        self.ui.engineBox.setCurrentText(game_board.engine.name)
+        # The board can only be moved over the plane of the unbounded engine
+        self.ui.centerButton.setEnabled(isinstance(game_board.engine, UnboundedEngine))
+        # Fill the topology box with the available topologies and select the one of the board
+        self.ui.topologyBox.addItems(list(TOPOLOGIES))
+        self.ui.topologyBox.setCurrentText(game_board.topology)
+        # Fill the render box with the available rendering modes
+        self.ui.renderBox.addItems(list(RENDERERS))
+        # Keep only the most recent lines in the log browser and chart the population log of the board
+        self.ui.logBrowser.document().setMaximumBlockCount(self.LOG_LINES)
+        self.ui.populationChart.set_population_log(game_board.population_log)
+        # Record the history of the board to rewind it
+        game_board.record_history()
+        # Check the timings box if the timings are enabled by the environment
+        self.ui.timingsCheckBox.setChecked(timings.enabled)
 
         """Connect signals to their respective slots."""
         self.ui.startPauseButton.clicked.connect(lambda: self.start_pause_simulation())
         self.ui.nextGenButton.clicked.connect(lambda: self.next_generation())
+        self.ui.previousGenButton.clicked.connect(lambda: self.previous_generation())
+        # Signal to rewind method
+        self.ui.historySlider.valueChanged.connect(self.rewind)
         self.ui.clearButton.clicked.connect(lambda: self.clear_board())
         # Connect mouse events to handle panning
         self.ui.boardView.mousePressEvent = self.mouse_press_event
         self.ui.boardView.mouseMoveEvent = self.mouse_move_event
         self.ui.boardView.mouseReleaseEvent = self.mouse_release_event
+        # Connect view resizing and scrolling to keep the renderer aware of the visible area
+        self.ui.boardView.resizeEvent = self.board_view_resize_event
+        self.ui.boardView.horizontalScrollBar().valueChanged.connect(lambda: self.update_viewport())
+        self.ui.boardView.verticalScrollBar().valueChanged.connect(lambda: self.update_viewport())
         # Connect the slider valueChanged signal to the updateFrameRateLabel method
         self._frameRateSlider.valueChanged.connect(self.update_frame_rate_label)
         # Signal to update_frame_rate method
         self.ui.frameRateSlider.valueChanged.connect(lambda: self.update_frame_rate(self._frameRateSlider.value()))
         # Signal to update_cell_size method
         self.ui.zoomSlider.valueChanged.connect(lambda: self.update_cell_size(self.ui.zoomSlider.value()))
+        # Signal to change_engine method
+        self.ui.engineBox.currentTextChanged.connect(self.change_engine)
+        # Signal to change_topology method
+        self.ui.topologyBox.currentTextChanged.connect(self.change_topology)
+        # Signal to center_window method
+        self.ui.centerButton.clicked.connect(lambda: self.center_window())
+        # Signal to change_render_mode method
+        self.ui.renderBox.currentTextChanged.connect(self.change_render_mode)
+        # Signal to export_log method
+        self.ui.exportLogButton.clicked.connect(lambda: self.export_log())
+        # Signal to toggle_cycle_detection method
+        self.ui.cycleCheckBox.toggled.connect(self.toggle_cycle_detection)
+        # Signals to the timing methods
+        self.ui.timingsCheckBox.toggled.connect(self.toggle_timings)
+        self.ui.exportTimingsButton.clicked.connect(lambda: self.export_timings())
+        self.ui.profileButton.clicked.connect(lambda: self.profile_generations())
         # Signal to resize_grid method
         self.ui.resizeButton.clicked.connect(lambda: self.resize_grid(self.ui.sizeBox.value()))
         # Signal from load pattern dialog to call the load pattern method
         self._loadPatternDialog.patternSelected.connect(self.load_pattern)
 
         """ Observe board for changes """
-        game_board.register(self.update_view)
+        self._board_observer = QtObservable(game_board)
+        self._board_observer.register(self.update_view)
 
         """ Logic Variables """
         # Flag indicating whether the simulation is paused.
@@ -89,16 +152,29 @@ class MainWindow(QMainWindow):
         self._drag_in_progress = False
         # Last recorded mouse position.
         self._last_mouse_pos = None
-        # Timer for simulation updates.
+        # Pixels dragged past the edges of the board and not moved over the unbounded plane yet.
+        self._window_drag = [0.0, 0.0]
+        # Thread stepping the board while the simulation runs.
+        self._simulation = None
+        # Timer asking the simulation thread for frames to show.
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_simulation)
+        self.timer.timeout.connect(lambda: self._simulation.request_frame())
+        # Time and generation from which the achieved simulation speed is measured.
+        self._speed_mark = None
+        # Board or frame shown in the view.
+        self._shown = game_board
         # Current generation count.
         self._current_generation = 0
-        # Count of alive cells in the current generation.
-        self._alive_cells = 0
+        # Last cycle of the board reported in the log.
+        self._reported_cycle = None
+        # Stop the simulation thread before quitting
+        QApplication.instance().aboutToQuit.connect(self.stop_simulation)
+        # Renderer drawing the board on the scene.
+        self._renderer = RENDERERS[self.ui.renderBox.currentText()](self.scene, self._cell_size)
 
         """ First load of ui with initialized board """
-        self.update_view(game_board.value)
+        self.update_viewport()
+        self.update_view(game_board)
 
     def clear_board(self):
         """
@@ -109,49 +185,51 @@ class MainWindow(QMainWindow):
 
         """
         if self._paused:
-            # Reset generation count
-            self._current_generation = 0
             # Clear the log browser
             self.ui.logBrowser.clear()
             # Create a new empty board
-            new_board = np.array([[Cell(x, y, 0, 0) for x in range(self._game_board_grid.shape[1])]
-                                  for y in range(self._game_board_grid.shape[0])], dtype=object)
-            # Set the new board to the game board model
-            self._game_board.set_board(new_board)
+            new_state = np.zeros_like(self._game_board.state)
+            # Set the new board to the game board model, resetting the generation count
+            self._game_board.set_board(new_state, generation=0)
 
-    def update_view(self, game_board_grid):
+    def update_view(self, game_board):
         """
         Updates the graphical representation of the game board in the UI.
 
-        This method is called when the game board model changes. It updates the internal reference to the game board,
-        initializes the count of alive cells, clears the graphical scene, and draws the new state of the game board.
+        This method is called when the game board model changes. It lets the current renderer
+        draw the new state of the game board, the statistics of the generation being computed by the model.
 
         Args:
-            game_board_grid (numpy.ndarray): The current state of the game board.
+            game_board (BoardChange, Board or Frame): The change notified by the game board model,
+                the model itself, or a frame of it while the simulation runs.
 
         """
-        # update the reference to the model
-        self._game_board_grid = game_board_grid
-        # initialize alive_cells count
-        self._alive_cells = 0
-        # clear the scene
-        self.scene.clear()
-        # Draw the board
-        for y in range(game_board_grid.shape[0]):
-            for x in range(game_board_grid.shape[1]):
-                cell = QGraphicsRectItem(x * self._cell_size, y * self._cell_size, self._cell_size, self._cell_size)
-                # Get the age of the cell (age color will vary in the range [0, 10])
-                age = min(game_board_grid[y, x].age, 10)
-                # Adjusted starting hue
-                hue = (0.5 + age / 20.0) % 1.0
-                # Calculate color based on age (light blue to bright red gradient)
-                color = QColor.fromHslF(hue, 1.0, 0.5)
-                if game_board_grid[y, x].state:
-                    cell.setBrush(QBrush(color))
-                    self._alive_cells += 1
-                else:
-                    QBrush(Qt.white)
-                self.scene.addItem(cell)
+        with timings.measure("view"):
+            self._shown = game_board
+            self._current_generation = game_board.generation
+            self._renderer.render(game_board)
+            # The history is only read while the board is not stepped by the simulation thread
+            if self._paused:
+                self.update_history_slider()
+
+    def log_generation(self, stats, report=None):
+        """
+        Appends a generation to the log browser in the UI.
+
+        The message holds the statistics of the generation (count, alive cells, births, deaths
+        and bounding box) and, when the engine tracks it, a description of the work done by the engine.
+
+        Args:
+            stats (BoardStats): The statistics of the generation, computed by the model.
+            report (str): The description of the work done by the engine, None if not tracked.
+        """
+        message = str(stats)
+        if report:
+            message += f" - {report}"
+        self.update_log(message + "\n")
+        self.ui.populationChart.update()
+        if timings.enabled:
+            self.update_timings_label()
 
     def update_log(self, message):
         """
@@ -163,7 +241,138 @@ class MainWindow(QMainWindow):
             message (str): The message to append to the log.
 
         """
-        self.ui.logBrowser.append(message)
+        with timings.measure("log"):
+            self.ui.logBrowser.append(message)
+
+    def toggle_cycle_detection(self, enabled):
+        """
+        Enables or disables the detection of cycles of the board.
+
+        Args:
+            enabled (bool): Whether cycles are detected.
+
+        This method is connected to the cycle box's toggled signal. While enabled, the simulation
+        pauses when the board enters a still life or an oscillator, and the cycle is logged.
+        """
+        self._game_board.detect_cycles(enabled)
+        self._reported_cycle = None
+
+    def cycle_found(self, cycle):
+        """
+        Pauses the simulation when the board entered a cycle.
+
+        Args:
+            cycle (Cycle): The cycle found.
+
+        This method is connected to the cycleFound signal of the simulation thread.
+        """
+        if not self._paused:
+            self.start_pause_simulation()
+        self.report_cycle()
+
+    def report_cycle(self):
+        """
+        Appends the cycle of the board to the log browser, if one was detected and not reported yet.
+        """
+        cycle = self._game_board.cycle
+        if cycle is not None and cycle is not self._reported_cycle:
+            self._reported_cycle = cycle
+            self.update_log(f"{cycle}\n")
+
+    def load_board(self):
+        """
+        Loads a board saved in a snapshot file chosen by the user, when the game is paused.
+
+        The board replaces the current one with its generation and the age of its cells, starting
+        a new log and history.
+        """
+        if not self._paused:
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Open Snapshot", "", f"Snapshots (*{EXTENSION})")
+        if path:
+            try:
+                snapshot = load_snapshot(path)
+                state, age = snapshot.state, snapshot.age
+            except (OSError, ValueError) as error:
+                QMessageBox.warning(self, "Invalid Snapshot", str(error))
+                return
+            self.ui.logBrowser.clear()
+            self._game_board.set_board(state, age, generation=snapshot.generation)
+            self.log_generation(self._game_board.stats)
+
+    def save_board(self):
+        """
+        Saves the board, with its generation and the age of its cells, to a snapshot file chosen by the user.
+        """
+        if not self._paused:
+            return
+        path, file_filter = QFileDialog.getSaveFileName(self, "Save Snapshot", f"board{EXTENSION}",
+                                                        f"Snapshots (*{EXTENSION});;"
+                                                        f"Compressed snapshots (*{EXTENSION})")
+        if path:
+            try:
+                save_snapshot(path, self._game_board.state, self._game_board.age, self._game_board.generation,
+                              compress=file_filter.startswith("Compressed"))
+            except OSError as error:
+                QMessageBox.warning(self, "Cannot Save Snapshot", str(error))
+
+    def export_log(self):
+        """
+        Exports the population log of the board to a CSV or binary file chosen by the user.
+
+        The binary format is a NumPy .npy file of the records, readable with numpy.load.
+        """
+        path, file_filter = QFileDialog.getSaveFileName(self, "Export Log", "population.csv",
+                                                        "CSV files (*.csv);;NumPy files (*.npy)")
+        if path:
+            if file_filter.startswith("NumPy") or path.endswith(".npy"):
+                self._game_board.population_log.export_binary(path)
+            else:
+                self._game_board.population_log.export_csv(path)
+
+    def toggle_timings(self, enabled):
+        """
+        Enables or disables the recording of the duration of each phase of a generation.
+
+        Args:
+            enabled (bool): Whether the timings are recorded.
+
+        This method is connected to the timings box's toggled signal. Enabling the timings
+        discards the samples recorded before.
+        """
+        if enabled:
+            timings.clear()
+        timings.enabled = enabled
+        self.ui.timingsLabel.clear()
+
+    def update_timings_label(self):
+        """
+        Shows the median and the 99th percentile of the duration of each phase of a generation.
+        """
+        summary = timings.summary(percentiles=(50, 99))
+        text = " | ".join(f"{phase}: {stats['p50'] * 1000:.2f}/{stats['p99'] * 1000:.2f} ms"
+                          for phase, stats in summary.items())
+        self.ui.timingsLabel.setText(text)
+
+    def export_timings(self):
+        """
+        Exports the recorded timings to a CSV file chosen by the user.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", "timings.csv", "CSV files (*.csv)")
+        if path:
+            timings.export_csv(path)
+
+    def profile_generations(self):
+        """
+        Profiles the next generations with cProfile, saving the statistics to a file chosen by the user.
+
+        The profile covers the thread stepping the board, which is the simulation thread while the
+        simulation runs. The statistics can be read with the pstats module or tools such as snakeviz.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Save Profile", "generations.prof", "Profiles (*.prof)")
+        if path:
+            timings.profile(self.PROFILE_GENERATIONS, path)
+            self.update_log(f"Profiling the next {self.PROFILE_GENERATIONS} generations to {path}\n")
 
     def mouse_press_event(self, event):
         """
@@ -182,7 +391,8 @@ class MainWindow(QMainWindow):
         Handles the mouse move event.
 
         Calculates the difference in mouse position from the initial press, checks if it exceeds a threshold, and
-        switches to drag mode if necessary. Handles panning if in drag mode.
+        switches to drag mode if necessary. Handles panning if in drag mode: with the unbounded engine, dragging
+        past the edges of the board moves the board over the plane.
 
         Args:
             event (QMouseEvent): The mouse move event.
@@ -202,10 +412,19 @@ class MainWindow(QMainWindow):
         if self._drag_in_progress:
             # Handle panning
             delta = event.pos() - self._last_mouse_pos
-            self.ui.boardView.verticalScrollBar().setValue(self.ui.boardView.verticalScrollBar().value() - delta.y())
-            self.ui.boardView.horizontalScrollBar().setValue(
-                self.ui.boardView.horizontalScrollBar().value() - delta.x())
+            wanted_y = self.ui.boardView.verticalScrollBar().value() - delta.y()
+            wanted_x = self.ui.boardView.horizontalScrollBar().value() - delta.x()
+            self.ui.boardView.verticalScrollBar().setValue(wanted_y)
+            self.ui.boardView.horizontalScrollBar().setValue(wanted_x)
             self._last_mouse_pos = event.pos()
+            # Pixels the scroll bars could not follow, past the edges of the board
+            self._window_drag[0] += wanted_x - self.ui.boardView.horizontalScrollBar().value()
+            self._window_drag[1] += wanted_y - self.ui.boardView.verticalScrollBar().value()
+            cells_x, cells_y = (int(pixels / self._cell_size) for pixels in self._window_drag)
+            if cells_x or cells_y:
+                self._window_drag[0] -= cells_x * self._cell_size
+                self._window_drag[1] -= cells_y * self._cell_size
+                self.move_window(cells_x, cells_y)
 
     def mouse_release_event(self, event):
         """
@@ -220,6 +439,7 @@ class MainWindow(QMainWindow):
         # Reset drag mode
         if self._drag_in_progress:
             self._drag_in_progress = False
+            self._window_drag = [0.0, 0.0]
             self.setCursor(Qt.ArrowCursor)  # Change cursor back to the arrow
         # Perform click action
         else:
@@ -229,9 +449,57 @@ class MainWindow(QMainWindow):
             cell_x = int(view_pos.x() // self._cell_size)
             cell_y = int(view_pos.y() // self._cell_size)
             # Check if coordinates are in the board
-            if 0 <= cell_x < self._game_board_grid.shape[1] and 0 <= cell_y < self._game_board_grid.shape[0]:
+            if 0 <= cell_x < self._game_board.width and 0 <= cell_y < self._game_board.height:
                 self.cell_clicked(cell_x, cell_y)
 
+    def move_window(self, dx, dy):
+        """
+        Moves the board over the plane of the unbounded engine by a number of cells, if the game is paused.
+
+        Args:
+            dx (int): The number of cells to move the board right (left if negative).
+            dy (int): The number of cells to move the board down (up if negative).
+        """
+        engine = self._game_board.engine
+        if self._paused and isinstance(engine, UnboundedEngine):
+            state, age = engine.move_window(self._game_board.state, self._game_board.age,
+                                            engine.window_x + dx, engine.window_y + dy)
+            self._game_board.set_board(state, age)
+
+    def center_window(self):
+        """
+        Moves the board over the live cells of the plane of the unbounded engine, if the game is paused,
+        and logs the position of the board and the bounding box of the live cells.
+        """
+        engine = self._game_board.engine
+        if self._paused and isinstance(engine, UnboundedEngine):
+            state, age = engine.center_window(self._game_board.state, self._game_board.age)
+            self._game_board.set_board(state, age)
+            self.update_log(engine.report() + "\n")
+
+    def board_view_resize_event(self, event):
+        """
+        Handles the resize event of the board view.
+
+        Resizes the view as usual and updates the visible area of the board.
+
+        Args:
+            event (QResizeEvent): The resize event.
+
+        """
+        QGraphicsView.resizeEvent(self.ui.boardView, event)
+        self.update_viewport()
+
+    def update_viewport(self):
+        """
+        Tells the renderer which part of the scene is visible in the board view.
+
+        This method is called when the board view is scrolled, panned or resized,
+        so that the renderer can draw the newly exposed cells.
+        """
+        view = self.ui.boardView
+        self._renderer.set_viewport(view.mapToScene(view.viewport().rect()).boundingRect())
+
     def cell_clicked(self, x, y):
         """
         Handles the click on a cell in the game board.
@@ -253,9 +521,9 @@ class MainWindow(QMainWindow):
         """
         Start or pause the simulation based on the current state.
 
-        If the simulation is paused, this method starts it, updates button states,
+        If the simulation is paused, this method starts the simulation thread, updates button states,
         and changes the button text to "Pause".
-        If the simulation is running, it pauses it, updates button states,
+        If the simulation is running, it stops the thread, shows the last generation, updates button states,
         and changes the button text to "Start".
         """
         if self._paused:
@@ -264,46 +532,118 @@ class MainWindow(QMainWindow):
             # Disable buttons that work if paused
             self.ui.clearButton.setEnabled(False)
             self.ui.nextGenButton.setEnabled(False)
+            self.ui.previousGenButton.setEnabled(False)
+            self.ui.historySlider.setEnabled(False)
             self.ui.resizeButton.setEnabled(False)
             self.ui.patternButton.setEnabled(False)
-            self.timer.start(1000 // self._frameRateSlider.value())  # Set your desired interval in milliseconds
+            self.ui.engineBox.setEnabled(False)
+            self.ui.topologyBox.setEnabled(False)
+            self.ui.centerButton.setEnabled(False)
+            # Step the board in the simulation thread and refresh the view independently
+            self._simulation = SimulationThread(self._game_board, self._frameRateSlider.value(),
+                                                stop_on_cycle=self.ui.cycleCheckBox.isChecked())
+            self._simulation.preview_factor = self._renderer.preview_factor()
+            self._simulation.frameReady.connect(self.update_simulation)
+            self._simulation.cycleFound.connect(self.cycle_found)
+            self._speed_mark = (time.perf_counter(), self._current_generation)
+            self._simulation.start()
+            self.timer.start(1000 // self.DISPLAY_RATE)
             self._startPauseButton.setText("Pause")
         else:
             # Stopping simulation
             self._paused = True
+            self.stop_simulation()
             # Enable buttons that work if paused
             self.ui.clearButton.setEnabled(True)
             self.ui.nextGenButton.setEnabled(True)
+            self.ui.previousGenButton.setEnabled(True)
             self.ui.resizeButton.setEnabled(True)
             self.ui.patternButton.setEnabled(True)
-            self.timer.stop()
+            self.ui.engineBox.setEnabled(True)
+            self.ui.topologyBox.setEnabled(True)
+            self.ui.centerButton.setEnabled(isinstance(self._game_board.engine, UnboundedEngine))
             self._startPauseButton.setText("Start")
 
+    def stop_simulation(self):
+        """
+        Stops the simulation thread, if running, and shows the last generation it computed.
+        """
+        if self._simulation is not None:
+            self.timer.stop()
+            self._simulation.stop()
+            self._simulation = None
+            self.update_view(self._game_board)
+            self.log_generation(self._game_board.stats, self._game_board.engine.report())
+
     def next_generation(self):
         """
         Progresses the simulation by one generation.
 
         This method is called when the user manually triggers the progression to the next generation. It updates
-        the game board, increments the generation count, and logs the information.
+        the game board, which counts the generations, and logs the information.
         """
         # Single generation progression permitted only when game is paused
         if self._paused:
             self._game_board.update()
-            self._current_generation += 1
-            self.update_log(f"Generation {self._current_generation} - Alive Cells: {self._alive_cells}\n")
+            self.log_generation(self._game_board.stats, self._game_board.engine.report())
+            self.report_cycle()
+
+    def previous_generation(self):
+        """
+        Rewinds the board by one generation, if the game is paused and the generation is still in the history.
+        """
+        self.rewind(self._game_board.generation - 1)
+
+    def rewind(self, generation):
+        """
+        Sets the board back or forward to a generation of its history and logs it.
+
+        Args:
+            generation (int): The generation.
+
+        This method is connected to the history slider's valueChanged signal. Only the generations
+        still in the history are shown, and only while the game is paused.
+        """
+        timeline = self._game_board.timeline
+        if self._paused and generation != self._game_board.generation and generation in timeline:
+            self._game_board.rewind(generation)
+            self.log_generation(self._game_board.stats)
+
+    def update_history_slider(self):
+        """
+        Updates the range of the history slider to the generations in the history, and its position to the current one.
+        """
+        timeline = self._game_board.timeline
+        generation = self._game_board.generation
+        first, last = (timeline.first_generation, timeline.last_generation) if generation in timeline else (0, 0)
+        # Moving the slider here must not rewind the board
+        blocked = self.ui.historySlider.blockSignals(True)
+        self.ui.historySlider.setRange(first, last)
+        self.ui.historySlider.setValue(generation if generation in timeline else 0)
+        self.ui.historySlider.blockSignals(blocked)
+        self.ui.historySlider.setEnabled(self._paused and first < last)
 
     def update_simulation(self):
         """
-        Update the simulation based on the timer interval.
+        Show the latest generation computed by the simulation thread.
 
-        This method is connected to the timer and is called at each interval when the simulation is running.
-        It updates the game board, increments the generation count, and logs the information.
+        This method is connected to the frameReady signal of the simulation thread. It takes the latest frame,
+        shows it, logs the information and updates the achieved simulation speed about once per second.
+        Generations computed while the view was busy are skipped.
         """
-        # Permitted when game is not paused
-        if not self._paused:
-            self._game_board.update()
-            self._current_generation += 1
-            self.update_log(f"Generation {self._current_generation} - Alive Cells: {self._alive_cells}\n")
+        # Frames signaled just before the simulation stopped are ignored
+        frame = self._simulation.take_frame() if self._simulation is not None else None
+        if frame is not None:
+            self.update_view(frame)
+            self.log_generation(frame.stats, frame.report)
+
+            # Achieved generations per second
+            now = time.perf_counter()
+            mark_time, mark_generation = self._speed_mark
+            if now - mark_time >= 1:
+                speed = (frame.generation - mark_generation) / (now - mark_time)
+                self.ui.speedLabel.setText(f"{speed:.1f} gen/s")
+                self._speed_mark = (now, frame.generation)
 
     def update_frame_rate_label(self, value):
         """
@@ -325,10 +665,10 @@ class MainWindow(QMainWindow):
             value (int): The selected frame rate value from the slider.
 
         This method is connected to the frame rate slider's valueChanged signal
-        and updates the frame rate value if the timer is active.
+        and updates the number of generations per second of the running simulation.
         """
-        if self.timer.isActive():
-            self.timer.start(1000 // value)
+        if self._simulation is not None:
+            self._simulation.rate = value
 
     def update_cell_size(self, value):
         """
@@ -338,10 +678,72 @@ class MainWindow(QMainWindow):
             value (int): The selected cell size value from the zoom slider.
 
         This method is connected to the zoom slider's valueChanged signal and updates the cell size,
-        refreshing the board representation.
+        refreshing the board representation. Values below 1 zoom out further, halving the cell size
+        at each step, so that cells become smaller than a pixel.
         """
-        self._cell_size = value
-        self.update_view(self._game_board_grid)
+        self._cell_size = value if value >= 1 else 2.0 ** (value - 1)
+        self._renderer.set_cell_size(self._cell_size)
+        self.update_viewport()
+        if self._simulation is not None:
+            self._simulation.preview_factor = self._renderer.preview_factor()
+
+    def change_engine(self, name):
+        """
+        Change the engine used to compute the next generations.
+
+        Args:
+            name (str): The name of the selected engine.
+
+        This method is connected to the engine box's currentTextChanged signal
+        and sets the selected engine on the game board model. Engines not supporting
+        the topology of the board are refused and the engine box is reset.
+        """
+        try:
+            self._game_board.engine = name
+        except ValueError as error:
+            QMessageBox.warning(self, "Unsupported Topology", str(error))
+            # Resetting the box must not change the engine again
+            blocked = self.ui.engineBox.blockSignals(True)
+            self.ui.engineBox.setCurrentText(self._game_board.engine.name)
+            self.ui.engineBox.blockSignals(blocked)
+        self.ui.centerButton.setEnabled(isinstance(self._game_board.engine, UnboundedEngine))
+
+    def change_topology(self, name):
+        """
+        Change the topology of the edges of the board.
+
+        Args:
+            name (str): The name of the selected topology.
+
+        This method is connected to the topology box's currentTextChanged signal and sets the
+        selected topology on the game board model. Topologies not supported by the engine are
+        refused and the topology box is reset.
+        """
+        try:
+            self._game_board.topology = name
+        except ValueError as error:
+            QMessageBox.warning(self, "Unsupported Topology", str(error))
+            # Resetting the box must not change the topology again
+            blocked = self.ui.topologyBox.blockSignals(True)
+            self.ui.topologyBox.setCurrentText(self._game_board.topology)
+            self.ui.topologyBox.blockSignals(blocked)
+
+    def change_render_mode(self, name):
+        """
+        Change the way the board is drawn.
+
+        Args:
+            name (str): The name of the selected rendering mode.
+
+        This method is connected to the render box's currentTextChanged signal,
+        replaces the renderer and draws the whole board with it.
+        """
+        self.scene.clear()
+        self._renderer = RENDERERS[name](self.scene, self._cell_size)
+        self.update_viewport()
+        self._renderer.render(self._shown)
+        if self._simulation is not None:
+            self._simulation.preview_factor = self._renderer.preview_factor()
 
     def resize_grid(self, value):
         """
@@ -355,35 +757,38 @@ class MainWindow(QMainWindow):
         """
         if self._paused:
             # Creating a new blank board with the new size
-            new_board = np.array([[Cell(x, y, 0, 0) for x in range(value)]
-                                  for y in range(value)], dtype=object)
-            self._game_board.set_board(new_board)
+            new_state = np.zeros((value, value), dtype=np.uint8)
+            self._game_board.set_board(new_state)
 
     def load_pattern(self, pattern):
         """
         Load a pattern onto the game board when the game is paused.
 
         Args:
-            pattern (list): A list of (x, y) coordinates representing the pattern.
+            pattern (list or str): A list of (x, y) coordinates representing the pattern, or the path
+                of a pattern file (RLE, Life 1.06 or plaintext).
 
         This method is connected to the patternSelected signal from the load pattern dialog
         and loads the selected pattern onto the game board if the game is paused.
         """
         if self._paused:
             # Create e new board
-            new_board = np.array([[Cell(x, y, 0, 0) for x in range(self._game_board_grid.shape[1])]
-                                  for y in range(self._game_board_grid.shape[0])], dtype=object)
+            new_state = np.zeros_like(self._game_board.state)
             # Get starting coordinates
             start_x = self.ui.startXSpinBox.value()
             start_y = self.ui.startYSpinBox.value()
-            for cell_y, cell_x in pattern:
-                target_x = cell_x + start_x
-                target_y = cell_y + start_y
-                # Set states starting from provided coordinates
-                if 0 <= target_x < self._game_board_grid.shape[1] and 0 <= target_y < self._game_board_grid.shape[0]:
-                    new_board[target_y, target_x].state = 1
-
-            self._game_board.set_board(new_board)
+            # Set states starting from provided coordinates, dropping cells outside the board
+            if isinstance(pattern, str):
+                try:
+                    # Pattern files are parsed straight into the new board
+                    place_pattern_file(new_state, pattern, start_x, start_y)
+                except (OSError, ValueError) as error:
+                    QMessageBox.warning(self, "Invalid Pattern", str(error))
+                    return
+            else:
+                place_pattern(new_state, pattern, start_x, start_y)
+
+            self._game_board.set_board(new_state)
         # Close the dialog
         self._loadPatternDialog.accept()
 
@@ -399,8 +804,18 @@ class AboutDialog(QDialog):
 
 
 class LoadPatternDialog(QDialog):
-    # Custom signal to emit the selected pattern
-    patternSelected = pyqtSignal(list)
+    """
+    This class represents the dialog choosing a pattern to load, from the library or a file.
+
+    The thumbnails of the patterns are loaded lazily, in a background thread, for the rows scrolled
+    into view only, so the dialog opens at once with large libraries. The icons of the rows scrolled
+    away the longest are dropped beyond ICON_CAPACITY, their thumbnails staying in the cache.
+    """
+
+    # Custom signal to emit the selected pattern, its list of cells or the path of its file
+    patternSelected = pyqtSignal(object)
+    # Maximum number of rows showing their thumbnail
+    ICON_CAPACITY = 256
 
     def __init__(self, **kwargs):
         """Initialize the LoadPatternDialog."""
@@ -410,20 +825,114 @@ class LoadPatternDialog(QDialog):
         self.ui = Ui_LoadPatternDialog()
         self.ui.setupUi(self)
 
-        # Get GameOfLifeFinal folder
-        parent_folder = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+        # Find the patterns shipped with the game
+        self.patterns = load_patterns()
 
-        # Open the folder and find patterns
-        with open(os.path.join(parent_folder, "cells/patterns.json"), "r") as f:
-            self.patterns = json.load(f)
+        # Find the pattern files of the library, from its index
+        self.library = PatternLibrary()
 
-        # Add patterns to list widget
+        # Add patterns to list widget, the pattern files with their size and path, and keep the source of each row
+        self._sources = []
         for pattern_name in self.patterns:
             self.ui.patternsListWidget.addItem(pattern_name)
-
-        # Connect load pattern button to method
+            self._sources.append(self.patterns[pattern_name])
+        for info in self.library:
+            item = QListWidgetItem(str(info))
+            item.setData(Qt.UserRole, info.path)
+            self.ui.patternsListWidget.addItem(item)
+            self._sources.append(info.path)
+
+        # Thumbnails are loaded while the dialog is shown, the rows showing one are kept in use order
+        self._thumbnail_cache = ThumbnailCache()
+        self._thumbnail_loader = None
+        self._icon_rows = collections.OrderedDict()
+        self.ui.patternsListWidget.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.ui.patternsListWidget.verticalScrollBar().valueChanged.connect(self.request_thumbnails)
+
+        # Connect filter, import and load pattern buttons to methods
+        self.ui.filterLineEdit.textChanged.connect(self.filter_patterns)
+        self.ui.importButton.clicked.connect(self.import_pattern)
         self.ui.loadButton.clicked.connect(lambda: self.load_pattern(self.patterns))
 
+    def showEvent(self, event):
+        """Starts loading the thumbnails when the dialog is shown, once its list is laid out."""
+        super().showEvent(event)
+        self._thumbnail_loader = ThumbnailLoader(self._thumbnail_cache)
+        self._thumbnail_loader.thumbnailReady.connect(self.show_thumbnail)
+        self._thumbnail_loader.start()
+        QTimer.singleShot(0, self.request_thumbnails)
+
+    def hideEvent(self, event):
+        """Stops loading the thumbnails when the dialog is hidden."""
+        if self._thumbnail_loader is not None:
+            self._thumbnail_loader.stop()
+            self._thumbnail_loader = None
+        super().hideEvent(event)
+
+    def resizeEvent(self, event):
+        """Loads the thumbnails of the rows shown by a larger dialog."""
+        super().resizeEvent(event)
+        self.request_thumbnails()
+
+    def request_thumbnails(self):
+        """
+        Asks the loader for the thumbnails of the rows in view that do not show one yet.
+
+        The request replaces the previous one, so the rows scrolled past quickly are skipped.
+        """
+        if self._thumbnail_loader is None:
+            return
+        list_widget = self.ui.patternsListWidget
+        height = list_widget.viewport().height()
+        first = list_widget.indexAt(QPoint(0, 0))
+        requests = []
+        for row in range(first.row() if first.isValid() else 0, list_widget.count()):
+            item = list_widget.item(row)
+            if item.isHidden():
+                continue
+            if list_widget.visualItemRect(item).top() >= height:
+                break
+            if row not in self._icon_rows:
+                requests.append((row, self._sources[row]))
+        self._thumbnail_loader.request(requests)
+
+    def show_thumbnail(self, row, thumbnail):
+        """
+        Shows the thumbnail of a row, dropping the icon of the row shown the longest beyond ICON_CAPACITY.
+
+        Args:
+            row (int): The row of the pattern.
+            thumbnail (numpy.ndarray): The thumbnail of the pattern.
+        """
+        self.ui.patternsListWidget.item(row).setIcon(thumbnail_icon(thumbnail))
+        self._icon_rows[row] = None
+        self._icon_rows.move_to_end(row)
+        if len(self._icon_rows) > self.ICON_CAPACITY:
+            dropped, _ = self._icon_rows.popitem(last=False)
+            self.ui.patternsListWidget.item(dropped).setIcon(QIcon())
+
+    def filter_patterns(self, text):
+        """
+        Shows only the patterns whose name contains a text, ignoring case.
+
+        Args:
+            text (str): The text typed in the filter box.
+        """
+        text = text.lower()
+        for row in range(self.ui.patternsListWidget.count()):
+            item = self.ui.patternsListWidget.item(row)
+            item.setHidden(text not in item.text().lower())
+        self.request_thumbnails()
+
+    def import_pattern(self):
+        """
+        Emits the patternSelected signal with a pattern file chosen by the user.
+        """
+        extensions = " ".join(f"*{extension}" for extension in PATTERN_FORMATS)
+        path, _ = QFileDialog.getOpenFileName(self, "Import Pattern", "", f"Patterns ({extensions})")
+        if path:
+            self.patternSelected.emit(path)
+
     def load_pattern(self, patterns):
         """
         Load the selected pattern and emit the patternSelected signal.
@@ -432,8 +941,14 @@ class LoadPatternDialog(QDialog):
             patterns (dict): Dictionary containing available patterns.
         """
         # Select pattern name in the list
-        selected_pattern = self.ui.patternsListWidget.currentItem().text()
-        if selected_pattern in patterns:
+        item = self.ui.patternsListWidget.currentItem()
+        if item is None:
+            return
+        selected_pattern = item.text()
+        if item.data(Qt.UserRole) is not None:
+            # Pattern files are read when placed
+            self.patternSelected.emit(item.data(Qt.UserRole))
+        elif selected_pattern in patterns:
             # Select pattern data and emit to MainWindow
             pattern = patterns[selected_pattern]
             self.patternSelected.emit(pattern)
@@ -445,7 +960,7 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     width = 30
     height = 30
-    board = Board(np.array([[Cell(x, y, 0, 0) for x in range(width)] for y in range(height)], dtype=object))
+    board = Board(np.zeros((height, width), dtype=np.uint8))
     window = MainWindow(board)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,84 @@
+import numpy as np
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtCore import QLineF, QPointF, Qt
+
+
+class PopulationChart(QWidget):
+    """
+    This class draws a live chart of the alive cells of the most recent generations in a population log.
+
+    The generations are reduced to one column per pixel, drawn from the minimum to the maximum
+    population of the generations it covers, so the cost of drawing does not depend on the number
+    of generations shown.
+
+    Args:
+        parent (QWidget): The parent widget.
+
+    Attributes:
+        _population_log (PopulationLog): The log drawn, None if not set yet.
+
+    """
+
+    # Number of most recent generations shown
+    GENERATIONS = 2000
+    # Margin around the chart, in pixels
+    MARGIN = 4
+
+    def __init__(self, parent=None):
+        """
+        Initializes a new instance of PopulationChart.
+        """
+        super().__init__(parent)
+        self._population_log = None
+
+    def set_population_log(self, population_log):
+        """
+        Sets the population log to draw and redraws the chart.
+
+        Args:
+            population_log (PopulationLog): The population log.
+        """
+        self._population_log = population_log
+        self.update()
+
+    def paintEvent(self, event):
+        """
+        Draws the chart.
+
+        Args:
+            event (QPaintEvent): The paint event.
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.white)
+        painter.setPen(QColor(Qt.lightGray))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        records = self._population_log.records(self.GENERATIONS) if self._population_log is not None else []
+        if len(records) == 0:
+            painter.setPen(QColor(Qt.gray))
+            painter.drawText(self.rect(), Qt.AlignCenter, "No generations yet")
+            return
+
+        alive = records["alive"]
+        width = self.width() - 2 * self.MARGIN
+        height = self.height() - 2 * self.MARGIN
+        # Minimum and maximum population of the generations covered by each column
+        columns = max(1, min(width, len(alive)))
+        starts = np.linspace(0, len(alive), columns + 1).astype(np.intp)[:-1]
+        maxima = np.maximum.reduceat(alive, starts)
+        minima = np.minimum.reduceat(alive, starts)
+        top = max(int(alive.max()), 1)
+        xs = self.MARGIN + np.arange(columns) * width / columns
+        y_max = self.MARGIN + height * (1 - maxima / top)
+        y_min = self.MARGIN + height * (1 - minima / top)
+
+        painter.setPen(QColor(Qt.darkCyan))
+        painter.drawLines([QLineF(QPointF(x, y0), QPointF(x, y1)) for x, y0, y1 in zip(xs.tolist(), y_min.tolist(),
+                                                                                        y_max.tolist())])
+        painter.drawLines([QLineF(QPointF(x0, y0), QPointF(x1, y1)) for x0, y0, x1, y1 in
+                           zip(xs.tolist(), y_max.tolist(), xs[1:].tolist(), y_max[1:].tolist())])
+        painter.setPen(QColor(Qt.black))
+        painter.drawText(self.rect().adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN),
+                         Qt.AlignTop | Qt.AlignRight,
+                         f"Generations {records['generation'][0]}-{records['generation'][-1]} - Max Alive: {top}")
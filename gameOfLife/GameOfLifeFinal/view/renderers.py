@@ -0,0 +1,399 @@
+import numpy as np
+
+from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsRectItem
+from PyQt5.QtGui import QBrush, QColor, QImage, QPixmap
+from PyQt5.QtCore import Qt
+
+# Ages above this value are drawn with the same color
+MAX_COLOR_AGE = 10
+
+
+def age_color(age):
+    """
+    Returns the color of an alive cell of a given age.
+
+    Args:
+        age (int): The age of the cell, in the range [0, MAX_COLOR_AGE].
+
+    Returns:
+        QColor: The color of the cell (light blue to bright red gradient).
+    """
+    # Adjusted starting hue
+    return QColor.fromHslF((0.5 + age / 20.0) % 1.0, 1.0, 0.5)
+
+
+class ItemRenderer:
+    """
+    This class draws the board with one graphics item for each cell.
+
+    The items are created once for each board size, and at every update only the brushes of the
+    cells in the changed mask of the model whose color changed are replaced.
+
+    Args:
+        scene (QGraphicsScene): The scene on which to draw the board.
+        cell_size (float): The side of a cell in pixels.
+
+    Attributes:
+        _cell_items (list): The graphics items of the cells, row by row.
+        _drawn_colors (numpy.ndarray): The color index drawn for each cell (-1 for dead cells, the age for alive cells).
+        _age_brushes (list): The brushes of the alive cells for each age, the last one for dead cells.
+
+    """
+
+    name = "Cells"
+
+    def __init__(self, scene, cell_size):
+        """
+        Initializes a new instance of ItemRenderer.
+        """
+        self._scene = scene
+        self._cell_size = cell_size
+        self._cell_items = None
+        self._drawn_colors = None
+        self._age_brushes = [QBrush(age_color(age)) for age in range(MAX_COLOR_AGE + 1)]
+        self._age_brushes.append(QBrush(Qt.NoBrush))
+
+    def render(self, game_board):
+        """
+        Updates the cell items whose color changed.
+
+        Args:
+            game_board (Board): The game board model.
+        """
+        state = game_board.state
+        if state is None:
+            # Previews cannot be drawn cell by cell, the next frame holds the cells again
+            return
+        changed = game_board.changed
+        if self._cell_items is None or self._drawn_colors.shape != state.shape:
+            self._create_cell_items(state.shape)
+            changed = None
+
+        # Cells to check, all of them when the model does not tell what changed
+        if changed is None:
+            indices = np.arange(state.size)
+        else:
+            indices = np.flatnonzero(changed)
+        ages = np.minimum(game_board.age.flat[indices], MAX_COLOR_AGE).astype(np.int8)
+        colors = np.where(state.flat[indices] == 1, ages, -1)
+        redraw = colors != self._drawn_colors.flat[indices]
+        for index, color in zip(indices[redraw].tolist(), colors[redraw].tolist()):
+            self._cell_items[index].setBrush(self._age_brushes[color])
+        self._drawn_colors.flat[indices[redraw]] = colors[redraw]
+
+    def preview_factor(self):
+        """Returns the side of the blocks of cells of the previews the renderer can draw, None if it needs the cells."""
+        return None
+
+    def set_viewport(self, rect):
+        """
+        Sets the visible rectangle of the scene.
+
+        Nothing needs to be done: the scene already skips painting the items outside of it.
+
+        Args:
+            rect (QRectF): The visible rectangle in scene coordinates.
+        """
+
+    def set_cell_size(self, cell_size):
+        """
+        Moves the existing cell items to a new cell size.
+
+        Args:
+            cell_size (float): The side of a cell in pixels.
+        """
+        self._cell_size = cell_size
+        if self._cell_items is not None:
+            width = self._drawn_colors.shape[1]
+            for index, cell in enumerate(self._cell_items):
+                y, x = divmod(index, width)
+                cell.setRect(x * cell_size, y * cell_size, cell_size, cell_size)
+            self._scene.setSceneRect(self._scene.itemsBoundingRect())
+
+    def _create_cell_items(self, shape):
+        """
+        Creates the graphics items of the cells for a board size, all drawn as dead cells.
+
+        Args:
+            shape (tuple): The shape of the board.
+        """
+        self._scene.clear()
+        height, width = shape
+        size = self._cell_size
+        self._cell_items = []
+        for y in range(height):
+            for x in range(width):
+                cell = QGraphicsRectItem(x * size, y * size, size, size)
+                self._scene.addItem(cell)
+                self._cell_items.append(cell)
+        self._scene.setSceneRect(self._scene.itemsBoundingRect())
+        self._drawn_colors = np.full(shape, -1, dtype=np.int8)
+
+
+class RasterRenderer:
+    """
+    This class draws the visible part of the board as a single image.
+
+    Only the cells inside the viewport, plus a margin around it, are drawn: the state and age
+    matrices of that window are mapped through a precomputed color lookup table into an ARGB
+    pixel buffer, one pixel per cell, which is wrapped without copying in a QImage and shown as
+    one pixmap item scaled to the cell size. Panning redraws the window only when the viewport
+    leaves the part already drawn.
+
+    When cells are smaller than a pixel, blocks of cells are reduced to one pixel showing the
+    oldest live cell of the block, so the cost of drawing is bounded by the size of the screen
+    instead of the size of the board.
+
+    Args:
+        scene (QGraphicsScene): The scene on which to draw the board.
+        cell_size (float): The side of a cell in pixels.
+
+    Attributes:
+        _lut (numpy.ndarray): The ARGB color of each color index.
+        _board (Board): The last board drawn.
+        _viewport (tuple): The visible rectangle of the scene (left, top, right, bottom).
+        _window (tuple): The cells drawn in the image (y0, y1, x0, x1).
+        _factor (int): The side of the blocks of cells drawn as one pixel.
+        _pixels (numpy.ndarray): The buffer of the ARGB color of each pixel.
+        _item (QGraphicsPixmapItem): The item showing the image.
+
+    """
+
+    name = "Raster"
+
+    # Fraction of the viewport drawn beyond each of its edges
+    MARGIN = 0.5
+
+    def __init__(self, scene, cell_size):
+        """
+        Initializes a new instance of RasterRenderer.
+        """
+        self._scene = scene
+        self._cell_size = cell_size
+        self._lut = self._create_lut()
+        self._board = None
+        self._shape = None
+        self._viewport = None
+        self._window = None
+        self._factor = 1
+        self._pixels = None
+        self._image = None
+        self._item = None
+
+    def render(self, game_board):
+        """
+        Draws the cells around the viewport and shows them.
+
+        Args:
+            game_board (Board): The game board model.
+        """
+        self._board = game_board
+        shape = (game_board.height, game_board.width)
+        if shape != self._shape:
+            self._create_item(shape)
+        self._draw()
+
+    def preview_factor(self):
+        """Returns the side of the blocks of cells of the previews the renderer can draw, None if it needs the cells."""
+        return None
+
+    def set_viewport(self, rect):
+        """
+        Sets the visible rectangle of the scene, drawing the cells exposed by it if needed.
+
+        Args:
+            rect (QRectF): The visible rectangle in scene coordinates.
+        """
+        self._viewport = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        if self._board is not None and not self._is_drawn(self._visible_cells()):
+            self._draw()
+
+    def set_cell_size(self, cell_size):
+        """
+        Draws the board with a new cell size.
+
+        Args:
+            cell_size (float): The side of a cell in pixels.
+        """
+        self._cell_size = cell_size
+        if self._board is not None:
+            height, width = self._shape
+            self._scene.setSceneRect(0, 0, width * cell_size, height * cell_size)
+            self._draw()
+
+    def _create_lut(self):
+        """Returns the colors of index 0 (dead cells) and 1 + age (alive cells)."""
+        colors = [QColor(Qt.white).rgba()] + [age_color(age).rgba() for age in range(MAX_COLOR_AGE + 1)]
+        return np.array(colors, dtype=np.uint32)
+
+    def _color_indices(self, state, age, factor):
+        """
+        Returns the color index of each pixel for a window of the board.
+
+        Args:
+            state (numpy.ndarray): The state matrix of the window.
+            age (numpy.ndarray): The age matrix of the window.
+            factor (int): The side of the blocks of cells drawn as one pixel.
+
+        Returns:
+            numpy.ndarray: The color index of each pixel, the oldest live cell of each block.
+        """
+        indices = np.minimum(age, MAX_COLOR_AGE).astype(np.uint8)
+        indices += 1
+        indices *= state
+        if factor > 1:
+            indices = _blocks(indices, factor).max(axis=(1, 3))
+        return indices
+
+    def _count_indices(self, counts, factor):
+        """
+        Returns the color index of each pixel from the number of live cells of each block.
+
+        Args:
+            counts (numpy.ndarray): The number of live cells of each block of the window.
+            factor (int): The side of the blocks of cells drawn as one pixel.
+
+        Raises:
+            NotImplementedError: If the renderer does not draw previews.
+        """
+        raise NotImplementedError(f"The {self.name} renderer does not draw previews")
+
+    def _visible_cells(self):
+        """Returns the cells inside the viewport (y0, y1, x0, x1), all of them when it is not known."""
+        height, width = self._shape
+        if self._viewport is None:
+            return 0, height, 0, width
+        left, top, right, bottom = (int(np.floor(value / self._cell_size)) for value in self._viewport)
+        return (min(max(top, 0), height), min(max(bottom + 1, 0), height),
+                min(max(left, 0), width), min(max(right + 1, 0), width))
+
+    def _is_drawn(self, cells):
+        """Returns whether the given cells are already drawn with the current level of detail."""
+        if self._window is None or self._factor != _reduction_factor(self._cell_size):
+            return False
+        y0, y1, x0, x1 = cells
+        drawn_y0, drawn_y1, drawn_x0, drawn_x1 = self._window
+        return drawn_y0 <= y0 and y1 <= drawn_y1 and drawn_x0 <= x0 and x1 <= drawn_x1
+
+    def _draw(self):
+        """Draws the visible cells and a margin around them in the pixel buffer and shows them."""
+        height, width = self._shape
+        factor = _reduction_factor(self._cell_size)
+        y0, y1, x0, x1 = self._visible_cells()
+        # Extend the window by the margin and align it to the blocks
+        margin_y, margin_x = int((y1 - y0) * self.MARGIN), int((x1 - x0) * self.MARGIN)
+        y0, x0 = max(y0 - margin_y, 0) // factor * factor, max(x0 - margin_x, 0) // factor * factor
+        y1, x1 = min(y1 + margin_y, height), min(x1 + margin_x, width)
+
+        board = self._board
+        if board.state is None:
+            if board.factor != self.preview_factor():
+                # The preview was reduced for another level of detail, the next frame matches it
+                return
+            indices = self._count_indices(board.preview[y0 // factor:-(-y1 // factor), x0 // factor:-(-x1 // factor)],
+                                          factor)
+        else:
+            indices = self._color_indices(board.state[y0:y1, x0:x1], board.age[y0:y1, x0:x1], factor)
+        # The indices are always in range, "wrap" only selects NumPy's fast unchecked path
+        self._pixels = np.take(self._lut, indices, mode="wrap")
+        rows, columns = self._pixels.shape
+        # The image shares the memory of the pixel buffer
+        self._image = QImage(self._pixels.data, columns, rows, columns * 4, QImage.Format_ARGB32)
+        self._item.setPixmap(QPixmap.fromImage(self._image))
+        self._item.setPos(x0 * self._cell_size, y0 * self._cell_size)
+        self._item.setScale(self._cell_size * factor)
+        self._window = (y0, y1, x0, x1)
+        self._factor = factor
+
+    def _create_item(self, shape):
+        """
+        Creates the pixmap item for a board size.
+
+        Args:
+            shape (tuple): The shape of the board.
+        """
+        self._scene.clear()
+        height, width = shape
+        self._shape = shape
+        self._window = None
+        self._item = QGraphicsPixmapItem()
+        self._item.setTransformationMode(Qt.FastTransformation)
+        self._scene.addItem(self._item)
+        self._scene.setSceneRect(0, 0, width * self._cell_size, height * self._cell_size)
+
+
+class DensityRenderer(RasterRenderer):
+    """
+    This class draws the visible part of the board as a single image shaded by density.
+
+    It works like RasterRenderer, but when cells are smaller than a pixel each block of cells is
+    drawn with a shade of gray proportional to the fraction of live cells in it. The number of live
+    cells of each block is then all it needs, so it can draw the previews reduced by the nodes of the
+    distributed engine without gathering the board.
+
+    """
+
+    name = "Density"
+
+    # Number of shades of gray besides white
+    LEVELS = 255
+
+    def _create_lut(self):
+        """Returns the colors from white (no live cells) to black (only live cells)."""
+        shades = 255 - np.arange(self.LEVELS + 1) * 255 // self.LEVELS
+        return (0xFF000000 | shades << 16 | shades << 8 | shades).astype(np.uint32)
+
+    def _color_indices(self, state, age, factor):
+        """
+        Returns the color index of each pixel for a window of the board.
+
+        Args:
+            state (numpy.ndarray): The state matrix of the window.
+            age (numpy.ndarray): The age matrix of the window.
+            factor (int): The side of the blocks of cells drawn as one pixel.
+
+        Returns:
+            numpy.ndarray: The color index of each pixel, rounding up so that any live cell shows.
+        """
+        if factor == 1:
+            return state * np.uint8(self.LEVELS)
+        return self._count_indices(_blocks(state, factor).sum(axis=(1, 3), dtype=np.uint32), factor)
+
+    def preview_factor(self):
+        """Returns the side of the blocks of cells of the previews the renderer can draw, None if it needs the cells."""
+        factor = _reduction_factor(self._cell_size)
+        return factor if factor > 1 else None
+
+    def _count_indices(self, counts, factor):
+        """
+        Returns the color index of each pixel from the number of live cells of each block.
+
+        Args:
+            counts (numpy.ndarray): The number of live cells of each block of the window.
+            factor (int): The side of the blocks of cells drawn as one pixel.
+
+        Returns:
+            numpy.ndarray: The color index of each pixel, rounding up so that any live cell shows.
+        """
+        cells = factor * factor
+        return (counts * self.LEVELS + cells - 1) // cells
+
+
+def _reduction_factor(cell_size):
+    """Returns the side of the blocks of cells drawn as one pixel for a cell size."""
+    return max(1, int(1 / cell_size))
+
+
+def _blocks(matrix, factor):
+    """Returns a view of a matrix as blocks of factor x factor cells, padding the last ones with zeros."""
+    height, width = matrix.shape
+    matrix = np.pad(matrix, ((0, -height % factor), (0, -width % factor)))
+    return matrix.reshape(matrix.shape[0] // factor, factor, matrix.shape[1] // factor, factor)
+
+
+# Available rendering modes by name
+RENDERERS = {
+    ItemRenderer.name: ItemRenderer,
+    RasterRenderer.name: RasterRenderer,
+    DensityRenderer.name: DensityRenderer,
+}
@@ -0,0 +1,226 @@
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from GameOfLifeFinal.model.distributed import DistributedEngine
+
+
+class Frame:
+    """
+    This class represents a snapshot of the board shown by the view.
+
+    It holds copies of the matrices of the board, so it can be drawn while the simulation
+    thread keeps stepping the board. The notifications of the board are blocked meanwhile, so the
+    changed cells are found by comparing the copies with those of the previous frame.
+
+    A frame of a board whose engine ran ahead of it (see DistributedEngine.run_ahead) holds no
+    matrices, only the statistics and a preview counting the live cells of blocks of cells.
+
+    Args:
+        game_board (Board): The board to copy.
+        previous (Frame): The previous frame, None if unknown.
+        preview (numpy.ndarray): The number of live cells of every block, None to copy the board.
+        factor (int): The side of the blocks of the preview.
+        stats (BoardStats): The population statistics of the preview.
+
+    Attributes:
+        state (numpy.ndarray): The matrix of cell states, None for a preview.
+        age (numpy.ndarray): The matrix of cell ages, None for a preview.
+        preview (numpy.ndarray): The number of live cells of every block, None if not a preview.
+        factor (int): The side of the blocks of the preview.
+        shape (tuple): The shape of the board.
+        changed (numpy.ndarray): The mask of the cells changed since the previous frame, None if unknown.
+        generation (int): The generation of the board.
+        stats (BoardStats): The population statistics of the generation.
+        report (str): The description of the work done by the engine, None if not tracked.
+
+    """
+
+    __slots__ = ("state", "age", "preview", "factor", "shape", "changed", "generation", "stats", "report")
+
+    def __init__(self, game_board, previous=None, preview=None, factor=1, stats=None):
+        """
+        Initializes a new instance of Frame.
+        """
+        self.preview = preview
+        self.factor = factor
+        self.shape = game_board.state.shape
+        self.changed = None
+        if preview is not None:
+            self.state = self.age = None
+            self.generation = stats.generation
+            self.stats = stats
+        else:
+            self.state = game_board.state.copy()
+            self.age = game_board.age.copy()
+            if previous is not None and previous.state is not None and previous.shape == self.shape:
+                self.changed = (self.state != previous.state) | (self.age != previous.age)
+            self.generation = game_board.generation
+            self.stats = game_board.stats.copy(self.state, self.age)
+        self.report = game_board.engine.report()
+
+    @property
+    def width(self):
+        """Returns the width of the board."""
+        return self.shape[1]
+
+    @property
+    def height(self):
+        """Returns the height of the board."""
+        return self.shape[0]
+
+
+class SimulationThread(QThread):
+    """
+    This class represents the thread stepping the board while the simulation runs.
+
+    The thread computes generations at the requested rate, independently of the view. The view asks
+    for a frame when it is ready to draw one, and the thread copies the first generation computed
+    after the request into a latest-wins slot: the generations computed while the view is busy are
+    never copied nor drawn.
+
+    The board must not be used by other threads while this thread runs, and its notifications are
+    blocked, so that the observers are not notified of every generation.
+
+    When the board detects cycles, the thread can stop as soon as it enters one, leaving a frame
+    of the first repeated generation in the slot. Otherwise, with engines batching generations
+    (such as the distributed engine, which gathers the board at the end of every call), the
+    generations due are only computed, with a single advance, when a frame is wanted.
+
+    When the view draws the board from a preview (see preview_factor), the distributed engine runs
+    ahead of the board without gathering it, and the frames hold the preview reduced by the nodes.
+    The board is only gathered when the view needs its cells again, and when the thread stops.
+
+    Args:
+        game_board (Board): The board to step.
+        rate (int): The number of generations to compute per second.
+        stop_on_cycle (bool): Whether to stop when the board enters a cycle.
+
+    Attributes:
+        preview_factor (int): The side of the blocks of cells of the previews the view can draw, None if
+            it needs the cells.
+        _stop (threading.Event): Set to stop the simulation.
+        _frame_wanted (threading.Event): Set when the view is ready to draw a frame.
+        _frame (Frame): The latest frame not taken by the view yet.
+
+    Signals:
+        frameReady: Signal emitted when a new frame can be taken from the slot.
+        cycleFound: Signal emitted with the Cycle when the thread stopped because the board entered it.
+
+    """
+
+    frameReady = pyqtSignal()
+    cycleFound = pyqtSignal(object)
+
+    def __init__(self, game_board, rate, stop_on_cycle=False):
+        """
+        Initializes a new instance of SimulationThread.
+        """
+        super().__init__()
+        self._game_board = game_board
+        self.rate = rate
+        self.stop_on_cycle = stop_on_cycle
+        self.preview_factor = None
+        self._stop = threading.Event()
+        self._frame_wanted = threading.Event()
+        self._frame_lock = threading.Lock()
+        self._frame = None
+
+    def request_frame(self):
+        """Asks for a frame of the next generation computed."""
+        self._frame_wanted.set()
+
+    def take_frame(self):
+        """
+        Takes the latest frame from the slot.
+
+        Returns:
+            Frame: The latest frame, None if no new frame was computed.
+        """
+        with self._frame_lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+    def stop(self):
+        """Stops the simulation and waits for the thread to finish the current generation."""
+        self._stop.set()
+        self.wait()
+
+    def run(self):
+        """
+        Steps the board at the requested rate until the simulation is stopped.
+
+        When stepping takes longer than the requested interval, the next generation starts
+        right away without trying to catch up. A cycle already detected when the thread starts
+        does not stop it again. The batched generations still due when the thread stops are computed,
+        and the board run ahead by the engine is gathered.
+        """
+        was_blocked = self._game_board.block(True)
+        known_cycle = self._game_board.cycle
+        engine = self._game_board.engine
+        batch = engine.batch_generations and not self.stop_on_cycle
+        previews = batch and isinstance(engine, DistributedEngine)
+        due = 0
+        # Generations run ahead by the engine, not gathered in the board yet
+        ahead = 0
+        # The board as shown by the view when the thread starts
+        previous = Frame(self._game_board)
+        try:
+            next_time = time.perf_counter()
+            while not self._stop.is_set():
+                wanted = self._frame_wanted.is_set()
+                factor = self.preview_factor if previews else None
+                stats = None
+                due += 1
+                if not batch:
+                    self._game_board.update()
+                    due = 0
+                elif wanted and factor is not None:
+                    # The view only needs a preview, the board stays on the nodes
+                    start = time.perf_counter()
+                    ahead += due
+                    stats = engine.run_ahead(self._game_board.state, self._game_board.age, due,
+                                             self._game_board.generation + ahead)
+                    self._game_board.population_log.append(stats.generation, stats.population, stats.births,
+                                                           stats.deaths, time.perf_counter() - start)
+                    due = 0
+                elif wanted:
+                    # The batched generations are only computed when the view can draw them
+                    self._game_board.advance(ahead + due)
+                    due = ahead = 0
+                cycle = self._game_board.cycle if self.stop_on_cycle else None
+                if cycle is known_cycle:
+                    cycle = None
+
+                # Fill the slot only when the view can draw the frame, or with the last one
+                if wanted or cycle is not None:
+                    self._frame_wanted.clear()
+                    if stats is not None:
+                        frame = Frame(self._game_board, preview=engine.preview(factor), factor=factor, stats=stats)
+                    else:
+                        frame = Frame(self._game_board, previous)
+                    previous = frame
+                    with self._frame_lock:
+                        # A frame not taken yet is replaced by the newer one, which then has its changes too
+                        if self._frame is not None:
+                            if self._frame.changed is None or frame.changed is None:
+                                frame.changed = None
+                            else:
+                                frame.changed = frame.changed | self._frame.changed
+                        self._frame = frame
+                    self.frameReady.emit()
+                if cycle is not None:
+                    self.cycleFound.emit(cycle)
+                    break
+
+                # Wait for the next generation, or the stop request
+                next_time = max(next_time + 1 / self.rate, time.perf_counter())
+                self._stop.wait(next_time - time.perf_counter())
+            if ahead and not due:
+                # The gathered generation replaces its record from the preview
+                self._game_board.population_log.rewind(self._game_board.generation + ahead - 1)
+            if ahead or due:
+                self._game_board.advance(ahead + due)
+        finally:
+            self._game_board.block(was_blocked)
@@ -0,0 +1,99 @@
+import threading
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QIcon, QImage, QPixmap
+
+from GameOfLifeFinal.model.thumbnails import FULL
+
+# Colors of the shades of the thumbnails, from white (no live cells) to black (only live cells)
+SHADES = (0xFF000000 | (255 - np.arange(FULL + 1) * 255 // FULL) * 0x010101).astype(np.uint32)
+
+
+def thumbnail_icon(thumbnail):
+    """
+    Converts a thumbnail to an icon.
+
+    Args:
+        thumbnail (numpy.ndarray): The matrix of shades of the thumbnail.
+
+    Returns:
+        QIcon: The icon.
+    """
+    pixels = SHADES[thumbnail]
+    height, width = pixels.shape
+    # The image is copied so that it does not share the memory of the pixels
+    image = QImage(pixels.data, width, height, width * 4, QImage.Format_ARGB32).copy()
+    return QIcon(QPixmap.fromImage(image))
+
+
+class ThumbnailLoader(QThread):
+    """
+    This class represents the thread loading the thumbnails of patterns in the background.
+
+    The view asks for the thumbnails it shows, and the thread takes them from the cache or renders
+    them in order. A new request replaces the pending one, so thumbnails scrolled out of view
+    before being loaded are not loaded.
+
+    Args:
+        cache (ThumbnailCache): The cache of the thumbnails, used by this thread only.
+
+    Attributes:
+        _pending (list): The (key, source) pairs not loaded yet, first served first.
+        _condition (threading.Condition): Notified when requests are pending or the thread is stopped.
+
+    Signals:
+        thumbnailReady: Signal emitted with the key and the thumbnail of each pattern loaded.
+
+    """
+
+    thumbnailReady = pyqtSignal(object, object)
+
+    def __init__(self, cache):
+        """
+        Initializes a new instance of ThumbnailLoader.
+        """
+        super().__init__()
+        self._cache = cache
+        self._pending = []
+        self._stopped = False
+        self._condition = threading.Condition()
+
+    def request(self, requests):
+        """
+        Replaces the pending requests.
+
+        Args:
+            requests (list): The (key, source) pairs of the patterns, the key identifying the pattern
+                to the view and the source being its list of cells or the path of its file.
+        """
+        with self._condition:
+            self._pending = list(requests)
+            self._condition.notify()
+
+    def stop(self):
+        """Drops the pending requests and waits for the thread to finish the current thumbnail."""
+        with self._condition:
+            self._stopped = True
+            self._pending = []
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        """
+        Loads the requested thumbnails until the thread is stopped.
+
+        Patterns which cannot be read get no thumbnail.
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                key, source = self._pending.pop(0)
+            try:
+                thumbnail = self._cache.thumbnail(source)
+            except (OSError, ValueError):
+                continue
+            self.thumbnailReady.emit(key, thumbnail)
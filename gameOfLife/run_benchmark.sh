@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Avvia i benchmark
+python GameOfLifeFinal/benchmark.py "$@"
\ No newline at end of file
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Avvia la simulazione senza interfaccia grafica
+python GameOfLifeFinal/headless.py "$@"
\ No newline at end of file